@@ -0,0 +1,170 @@
+"""Minimal OpenAI-compatible chat completions server for benchmarks and tests.
+
+The scripted model asks for the configured tools on the first round of a turn
+and answers with text once tool results are in the history, which exercises a
+full tool-calling turn without network access.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Sequence
+
+USAGE = {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def log_message(self, format, *args):  # noqa: A002 - silence per-request logging
+        return
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.server.fake.requests.append(request)
+        if self.server.fake.latency:
+            time.sleep(self.server.fake.latency)
+        if self.server.fake.take_failure():
+            body = json.dumps({"error": {"message": "unavailable", "type": "server_error"}}).encode()
+            self.send_response(self.server.fake.fail_status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        message = self.server.fake.reply(request.get("messages") or [], request.get("tool_choice"))
+        if request.get("stream"):
+            self._stream(request, message)
+        else:
+            self._send_json(self._completion(request, message))
+
+    def _completion(self, request: dict, message: dict) -> dict:
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+                }
+            ],
+            "usage": USAGE,
+        }
+
+    def _send_json(self, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, request: dict, message: dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        def send(delta: dict, finish_reason: Optional[str] = None) -> None:
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        send({"role": "assistant"})
+        for token in re.findall(r"\s*\S+", message.get("content") or ""):
+            send({"content": token})
+        for index, call in enumerate(message.get("tool_calls") or []):
+            send({"tool_calls": [{"index": index, **call}]})
+        send({}, "tool_calls" if message.get("tool_calls") else "stop")
+        if (request.get("stream_options") or {}).get("include_usage"):
+            usage_chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "choices": []}
+            usage_chunk.update(model=request.get("model", "fake"), created=int(time.time()), usage=USAGE)
+            self.wfile.write(f"data: {json.dumps(usage_chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeOpenAIServer"
+
+
+class FakeOpenAIServer:
+    """Runs on ``127.0.0.1`` on a free port; use as a context manager."""
+
+    def __init__(
+        self,
+        tool_names: Sequence[str] = ("get_system_overview",),
+        answer: str = "The system looks healthy.",
+        latency: float = 0.0,
+        fail_first: int = 0,
+        fail_status: int = 503,
+    ):
+        self.tool_names = list(tool_names)
+        self.answer = answer
+        self.latency = latency
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self._failures_lock = threading.Lock()
+        self.requests: List[dict] = []
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def take_failure(self) -> bool:
+        """True while the first ``fail_first`` requests should get ``fail_status``."""
+
+        with self._failures_lock:
+            if self.fail_first <= 0:
+                return False
+            self.fail_first -= 1
+            return True
+
+    def reply(self, messages: List[dict], tool_choice: Optional[str] = None) -> dict:
+        if messages and messages[-1].get("role") == "user" and tool_choice != "none" and self.tool_names:
+            return {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_{index}",
+                        "type": "function",
+                        "function": {"name": name, "arguments": "{}"},
+                    }
+                    for index, name in enumerate(self.tool_names)
+                ],
+            }
+        return {"role": "assistant", "content": self.answer}
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,73 @@
+"""Timing and allocation helpers shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of ``samples`` (``fraction`` in 0..1)."""
+
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "runs": len(samples_ms),
+        "min_ms": round(min(samples_ms), 3),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3),
+        "p50_ms": round(percentile(samples_ms, 0.50), 3),
+        "p90_ms": round(percentile(samples_ms, 0.90), 3),
+        "p99_ms": round(percentile(samples_ms, 0.99), 3),
+        "max_ms": round(max(samples_ms), 3),
+    }
+
+
+def time_once(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def measure_allocations(fn: Callable[[], Any]) -> Dict[str, int]:
+    """Peak and retained bytes allocated by one call of ``fn``, via tracemalloc."""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"alloc_peak_bytes": max(0, peak - before), "alloc_retained_bytes": max(0, after - before)}
+
+
+def bench(
+    name: str,
+    fn: Callable[[], Any],
+    repeats: int = 20,
+    reset: Optional[Callable[[], Any]] = None,
+    track_allocations: bool = True,
+) -> Dict[str, Any]:
+    """Time a cold first call (after ``reset``) followed by ``repeats`` warm calls."""
+
+    if reset is not None:
+        reset()
+    entry: Dict[str, Any] = {"name": name, "cold_ms": round(time_once(fn), 3)}
+    entry["warm"] = summarize([time_once(fn) for _ in range(max(1, repeats))])
+    if track_allocations:
+        if reset is not None:
+            reset()
+        entry.update(measure_allocations(fn))
+    return entry
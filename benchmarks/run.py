@@ -0,0 +1,229 @@
+"""Benchmark tool latency and conversation overhead; emits machine-readable JSON.
+
+Usage::
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --baseline bench.json --tolerance 0.25
+    python -m benchmarks.run --collectors-only --threads 10000
+
+``collector.<backend>.*`` entries compare the psutil and /proc collectors;
+``--threads`` parks that many idle threads first to emulate a busy host.
+
+With ``--baseline`` the process exits non-zero when any benchmark's warm p50
+regressed by more than the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from src.agent.conversation import ConversationRunner
+from src.agent.history import HistoryManager
+from src.agent.tools_registry import FIX_TOOL_NAMES, get_tools_registry
+from src.config import Config
+from src.tools import procfs
+from src.tools.base import ToolResult
+from src.tools.process_engine import top_processes
+from src.tools.snapshot_cache import snapshot_cache
+from src.tools.system_overview import _memory
+from src.tools.temperatures import TemperatureTool
+from src.utils.logging_utils import setup_logging
+
+from .fake_openai import FakeOpenAIServer
+from .harness import bench
+
+SLOW_TOOLS = {"run_network_diagnostics"}
+
+
+def _config(**overrides) -> Config:
+    values = dict(openai_api_key="benchmark", model_name="fake-model", mode="diagnostic_only", confirm_fixes=True)
+    values.update(overrides)
+    return Config(**values)
+
+
+def _thread_count() -> Optional[int]:
+    # The fourth field of /proc/loadavg is "running/total" scheduling entities.
+    try:
+        return int(Path("/proc/loadavg").read_text().split()[3].split("/")[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def host_metadata() -> Dict[str, Any]:
+    return {
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "mounts": len(psutil.disk_partitions(all=False)),
+        "processes": len(psutil.pids()),
+        "threads": _thread_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def bench_tools(repeats: int, include_slow: bool) -> tuple:
+    registry = get_tools_registry(_config())
+    results: List[Dict[str, Any]] = []
+    samples: Dict[str, ToolResult] = {}
+    for name in registry:
+        if name in FIX_TOOL_NAMES or (name in SLOW_TOOLS and not include_slow):
+            continue
+        tool = registry[name]
+        samples[name] = tool.run()
+        results.append(bench(f"tool.{name}", tool.run, repeats=repeats, reset=snapshot_cache.invalidate))
+    return results, samples
+
+
+def bench_serialization(samples: Dict[str, ToolResult], repeats: int) -> List[Dict[str, Any]]:
+    runner = ConversationRunner(_config())
+    results = []
+    for name, result in samples.items():
+        def append(name=name, result=result):
+            runner._append_tool_message(HistoryManager("system"), name, result, "call_0")
+
+        results.append(bench(f"append_tool_message.{name}", append, repeats=repeats))
+    return results
+
+
+def bench_conversation(repeats: int) -> List[Dict[str, Any]]:
+    results = []
+    with FakeOpenAIServer(tool_names=["get_system_overview", "get_disk_health"]) as server:
+        for stream in (True, False):
+            runner = ConversationRunner(_config(stream_responses=stream, openai_base_url=server.base_url))
+
+            def turn(runner=runner):
+                history = HistoryManager("system")
+                history.start_turn("Why is this machine slow?")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    runner._run_turn(history)
+
+            label = "stream" if stream else "blocking"
+            results.append(
+                bench(f"conversation_turn.{label}", turn, repeats=repeats, reset=snapshot_cache.invalidate)
+            )
+            runner.executor.shutdown()
+    return results
+
+
+def spawn_idle_threads(count: int) -> threading.Event:
+    """Park ``count`` idle threads until the returned event is set."""
+
+    stop = threading.Event()
+    previous = threading.stack_size(64 * 1024)
+    try:
+        for _ in range(count):
+            threading.Thread(target=stop.wait, daemon=True).start()
+    finally:
+        threading.stack_size(previous)
+    return stop
+
+
+def bench_collectors(repeats: int) -> List[Dict[str, Any]]:
+    if not procfs.available():
+        return []
+    temperatures = TemperatureTool()
+    cases = {
+        "top_processes.cpu": lambda: top_processes(sort_by="cpu", limit=20, sampled_cpu={}),
+        "top_processes.memory": lambda: top_processes(sort_by="memory", limit=20, interval=0),
+        "top_processes.fds": lambda: top_processes(sort_by="fds", limit=20, interval=0),
+        "virtual_memory": _memory,
+        "temperatures": temperatures.run,
+    }
+    results = []
+    try:
+        for backend in procfs.BACKENDS:
+            procfs.set_collector_backend(backend)
+            for name, fn in cases.items():
+                results.append(
+                    bench(f"collector.{backend}.{name}", fn, repeats=repeats, reset=snapshot_cache.invalidate)
+                )
+    finally:
+        procfs.set_collector_backend("psutil")
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Return benchmarks whose warm p50 exceeds the baseline by more than ``tolerance``."""
+
+    previous = {entry["name"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in current["results"]:
+        old = previous.get(entry["name"])
+        if old is None:
+            continue
+        old_p50, new_p50 = old["warm"]["p50_ms"], entry["warm"]["p50_ms"]
+        # Ignore sub-millisecond noise on very fast benchmarks.
+        if new_p50 > old_p50 * (1 + tolerance) and new_p50 - old_p50 > 1.0:
+            regressions.append({"name": entry["name"], "baseline_p50_ms": old_p50, "p50_ms": new_p50})
+    return regressions
+
+
+def run(
+    repeats: int = 20,
+    include_slow: bool = False,
+    conversation: bool = True,
+    collectors_only: bool = False,
+) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    if not collectors_only:
+        results, samples = bench_tools(repeats, include_slow)
+        results.extend(bench_serialization(samples, repeats))
+        if conversation:
+            results.extend(bench_conversation(max(1, repeats // 2)))
+    results.extend(bench_collectors(repeats))
+    return {"meta": host_metadata(), "results": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ai-system-diagnoser benchmarks")
+    parser.add_argument("--repeats", type=int, default=20, help="Warm runs per benchmark")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="Previous results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown ratio")
+    parser.add_argument("--include-network", action="store_true", help="Also time run_network_diagnostics")
+    parser.add_argument("--skip-conversation", action="store_true", help="Skip the fake-server turn benchmark")
+    parser.add_argument("--collectors-only", action="store_true", help="Only compare the psutil and /proc collectors")
+    parser.add_argument("--threads", type=int, default=0, help="Park this many idle threads while benchmarking")
+    args = parser.parse_args(argv)
+
+    setup_logging().setLevel(logging.WARNING)
+    stop_threads = spawn_idle_threads(args.threads)
+    try:
+        report = run(
+            args.repeats,
+            include_slow=args.include_network,
+            conversation=not args.skip_conversation,
+            collectors_only=args.collectors_only,
+        )
+    finally:
+        stop_threads.set()
+
+    exit_code = 0
+    if args.baseline:
+        report["regressions"] = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from ..utils.metrics import metrics
+from .conversation import (
+    CONFIRM_PROMPT,
+    EXIT_COMMANDS,
+    ConversationRunner,
+    StreamAssembler,
+    TextCallback,
+    TextPrinter,
+    ToolCallCallback,
+)
+from .history import HistoryManager
+from .tool_executor import AsyncToolExecutor
+from .transport import AsyncModelTransport, ModelCallError
+
+INTERRUPTED_NOTE = "[interrupted by the user]"
+
+
+def _resolve(future: "asyncio.Future[str]", result: Optional[str], error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def ainput(prompt: str = "") -> "asyncio.Future[str]":
+    """``input()`` that lets the event loop keep running while the user types.
+
+    The read happens on a daemon thread, which is abandoned if the session ends
+    before the user presses Enter.
+    """
+
+    loop = asyncio.get_running_loop()
+    future: "asyncio.Future[str]" = loop.create_future()
+
+    def read() -> None:
+        try:
+            line, error = input(prompt), None
+        except BaseException as exc:  # noqa: BLE001 - EOFError and friends go to the awaiting task
+            line, error = None, exc
+        try:
+            loop.call_soon_threadsafe(_resolve, future, line, error)
+        except RuntimeError:  # the loop closed while we were waiting
+            pass
+
+    threading.Thread(target=read, name="input", daemon=True).start()
+    return future
+
+
+@contextmanager
+def _interrupt_cancels(task: asyncio.Task) -> Iterator[None]:
+    """While active, Ctrl-C cancels ``task`` instead of raising ``KeyboardInterrupt``."""
+
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGINT)
+    try:
+        loop.add_signal_handler(signal.SIGINT, task.cancel)
+        installed = True
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Windows event loops and non-main threads cannot take signal handlers.
+        installed = False
+    try:
+        yield
+    finally:
+        if installed:
+            loop.remove_signal_handler(signal.SIGINT)
+            signal.signal(signal.SIGINT, previous)
+
+
+class AsyncConversationRunner(ConversationRunner):
+    """:class:`ConversationRunner` on one event loop: model I/O, tools and user input overlap.
+
+    The baseline tools are prefetched while the user types the first question,
+    and Ctrl-C during a turn cancels the model call and every tool in flight,
+    leaving the session open.
+    """
+
+    transport_class = AsyncModelTransport
+
+    def _make_executor(self) -> AsyncToolExecutor:
+        return AsyncToolExecutor(
+            self.tools_registry,
+            self.logger,
+            default_timeout=self.config.tool_timeout,
+            timeouts=self._tool_timeouts(),
+            confirm=self._aconfirm_fix,
+        )
+
+    async def _aconfirm_fix(self, tool_name: str, tool_args: dict) -> bool:
+        self._propose_fix(tool_name, tool_args)
+        confirmation = await ainput(CONFIRM_PROMPT)
+        return confirmation.strip().lower() in {"yes", "y"}
+
+    async def _acall_model(
+        self,
+        history: List[dict],
+        on_text: Optional[TextCallback] = None,
+        on_tool_call: Optional[ToolCallCallback] = None,
+        allow_tools: bool = True,
+    ) -> dict:
+        request = self._build_request(history, allow_tools)
+        cache_key, cached = self._cached(request)
+        if cached is not None:
+            return self._replay(cached, on_text, on_tool_call)
+
+        message = await self._arequest_model(request, on_text, on_tool_call)
+        if cache_key is not None:
+            self.response_cache.put(cache_key, message)
+        return message
+
+    async def _arequest_model(
+        self,
+        request: dict,
+        on_text: Optional[TextCallback],
+        on_tool_call: Optional[ToolCallCallback],
+    ) -> dict:
+        with metrics.span("model_call", model=self.config.model_name) as span:
+            if not self.config.stream_responses:
+                response = await self.transport.create(**request)
+                return self._response_message(response, span, on_text, on_tool_call)
+
+            assembler = StreamAssembler(span, self._record_usage, on_text, on_tool_call)
+            chunks = self.transport.stream(stream_options={"include_usage": True}, **request)
+            try:
+                async for chunk in chunks:
+                    assembler.feed(chunk)
+            finally:
+                await chunks.aclose()
+            return assembler.message()
+
+    async def _arun_turn(self, history: HistoryManager, prefetched=None) -> None:
+        """Call the model, running requested tools, until it answers with text.
+
+        Each assistant message is appended together with its tool results, so a
+        cancelled turn never leaves a tool call without its answer in history.
+        """
+
+        if prefetched is not None:
+            try:
+                results = await prefetched.results()
+            finally:
+                prefetched.cancel()
+            self._append_prefetched(history, results)
+
+        print_text = TextPrinter()
+        for round_number in range(self.config.max_tool_rounds + 1):
+            batch = self.executor.start_batch()
+            try:
+                message = await self._acall_model(
+                    history.messages(),
+                    on_text=print_text,
+                    on_tool_call=batch.add,
+                    allow_tools=round_number < self.config.max_tool_rounds,
+                )
+                if not message.get("tool_calls"):
+                    history.append(message)
+                    break
+
+                print_text.end_message()
+                results = await batch.results()
+            finally:
+                batch.cancel()
+            history.append(message)
+            for call, result in results:
+                self._append_tool_message(history, call.name, result, call.id)
+
+        print("\n")
+
+    async def _interruptible_turn(self, history: HistoryManager, prefetched=None) -> None:
+        turn = asyncio.ensure_future(self._arun_turn(history, prefetched))
+        try:
+            with _interrupt_cancels(turn):
+                await asyncio.wait({turn})
+        finally:
+            turn.cancel()
+        if turn.cancelled():
+            print("\n[interrupted]\n")
+            history.append({"role": "assistant", "content": INTERRUPTED_NOTE})
+            return
+        turn.result()
+
+    async def arun_conversation(self) -> None:
+        history = self._start_session()
+        if history is None:
+            return
+
+        prefetch = self._start_prefetch()
+        try:
+            while True:
+                user_input = await ainput("You: ")
+                if user_input.strip().lower() in EXIT_COMMANDS:
+                    self._end_session()
+                    break
+
+                history.start_turn(user_input)
+                try:
+                    await self._interruptible_turn(history, prefetch.take())
+                except ModelCallError as exc:
+                    self.logger.error("Model call failed: %s", exc)
+                    print(f"\nModel request failed: {exc}\n")
+        finally:
+            prefetch.cancel()
+            self._close()
+            await self.transport.aclose()
+
+    def run_conversation(self):
+        try:
+            asyncio.run(self.arun_conversation())
+        except KeyboardInterrupt:
+            print()
+            self._end_session()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+from ..tools.base import ToolResult
+from ..tools.table import Table, json_default
+
+
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 1500
+# Successively tighter caps tried until a result fits its budget.
+LIST_LIMITS = (50, 20, 10, 5, 3, 1)
+STRING_LIMITS = (2000, 500, 200, 80)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English and JSON)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=json_default)
+
+
+def _clean(value: Any) -> Any:
+    """Round floats and drop fields that carry no signal (None, empty containers)."""
+
+    if isinstance(value, float):
+        return round(value, 1)
+    if isinstance(value, Table):
+        return value.rounded(1)
+    if isinstance(value, dict):
+        cleaned = {}
+        for key, item in value.items():
+            item = _clean(item)
+            if item is None or item == "" or item == [] or item == {}:
+                continue
+            cleaned[key] = item
+        return cleaned
+    if isinstance(value, (list, tuple)):
+        return _collapse_repeats([_clean(item) for item in value])
+    return value
+
+
+def _collapse_repeats(items: List[Any]) -> List[Any]:
+    """Merge identical entries into the first occurrence with a ``repeated`` count."""
+
+    if len(items) < 2:
+        return items
+    counts: Dict[str, int] = {}
+    order: List[Any] = []
+    for item in items:
+        key = dumps(item)
+        if key not in counts:
+            order.append((key, item))
+        counts[key] = counts.get(key, 0) + 1
+
+    if len(order) == len(items):
+        return items
+    collapsed = []
+    for key, item in order:
+        count = counts[key]
+        if count > 1:
+            item = {**item, "repeated": count} if isinstance(item, dict) else {"value": item, "repeated": count}
+        collapsed.append(item)
+    return collapsed
+
+
+def _shrink(value: Any, max_items: int, max_chars: int) -> Any:
+    """Keep the first ``max_items`` of every list (tools return them ranked) and clip strings."""
+
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars] + "..."
+    if isinstance(value, Table):
+        if len(value) <= max_items:
+            return value
+        return {**value.head(max_items).to_json(), "omitted_rows": len(value) - max_items, "total_rows": len(value)}
+    if isinstance(value, dict):
+        return {key: _shrink(item, max_items, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        kept = [_shrink(item, max_items, max_chars) for item in value[:max_items]]
+        if len(value) > max_items:
+            kept.append({"omitted_entries": len(value) - max_items, "total_entries": len(value)})
+        return kept
+    return value
+
+
+def compact_tool_result(result: ToolResult, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Serialize ``result`` for the model, fitted to roughly ``token_budget`` tokens."""
+
+    payload = _clean(result.to_dict())
+    text = dumps(payload)
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    for max_items in LIST_LIMITS:
+        for max_chars in STRING_LIMITS:
+            text = dumps(_shrink(payload, max_items, max_chars))
+            if estimate_tokens(text) <= token_budget:
+                return text
+
+    max_chars = max(0, token_budget * CHARS_PER_TOKEN - 80)
+    return dumps({"success": result.success, "error": result.error, "truncated": True, "preview": text[:max_chars]})
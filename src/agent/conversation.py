@@ -1,99 +1,371 @@
 from __future__ import annotations
 
-import json
-from typing import List
-
-from openai import OpenAI
+import time
+from contextlib import closing
+from typing import Callable, Dict, List, Optional, Tuple
 
 from ..config import Config
+from ..tools.snapshot_cache import snapshot_cache
 from ..utils.logging_utils import setup_logging
+from ..utils.metrics import metrics
+from .compaction import compact_tool_result
+from .history import HistoryManager
+from .prefetch import Prefetch, baseline_calls
 from .prompts import SYSTEM_PROMPT
+from .response_cache import ResponseCache
+from .tool_executor import ToolCall, ToolExecutor
 from .tool_schemas import tool_schemas
-from .tools_registry import FIX_TOOL_NAMES, get_tools_registry
+from .tools_registry import get_tools_registry
+from .transport import ModelCallError, ModelTransport
+
+
+CONFIRM_PROMPT = "Run this action? (yes/no): "
+EXIT_COMMANDS = {"exit", "quit"}
+
+TextCallback = Callable[[str], None]
+ToolCallCallback = Callable[[ToolCall], None]
+
+
+class StreamAssembler:
+    """Builds the assistant message from streamed chunks, dispatching tool calls as they complete."""
+
+    def __init__(
+        self,
+        span,
+        record_usage: Callable,
+        on_text: Optional[TextCallback] = None,
+        on_tool_call: Optional[ToolCallCallback] = None,
+    ):
+        self.span = span
+        self.record_usage = record_usage
+        self.on_text = on_text
+        self.on_tool_call = on_tool_call
+        self.content_parts: List[str] = []
+        self.partial_calls: Dict[int, dict] = {}
+        self.calls: List[ToolCall] = []
+        self.first_token = True
+
+    def _finish(self, index: int) -> None:
+        partial = self.partial_calls.pop(index)
+        call = ToolCall(id=partial["id"], name=partial["name"], arguments=partial["arguments"] or "{}")
+        self.calls.append(call)
+        if self.on_tool_call:
+            self.on_tool_call(call)
+
+    def feed(self, chunk) -> None:
+        # With include_usage the final chunk has no choices, only token counts.
+        self.record_usage(self.span, getattr(chunk, "usage", None))
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta
+        if self.first_token and (delta.content or delta.tool_calls):
+            self.first_token = False
+            self.span.set(first_token_ms=round((time.time_ns() - self.span.start_ns) / 1e6, 1))
+        if delta.content:
+            self.content_parts.append(delta.content)
+            if self.on_text:
+                self.on_text(delta.content)
+        for tool_delta in delta.tool_calls or []:
+            # Tool calls stream in index order; once a new index starts, every
+            # earlier call has its full argument string and can be dispatched.
+            for index in [i for i in self.partial_calls if i < tool_delta.index]:
+                self._finish(index)
+            partial = self.partial_calls.setdefault(tool_delta.index, {"id": "", "name": "", "arguments": ""})
+            if tool_delta.id:
+                partial["id"] = tool_delta.id
+            if tool_delta.function and tool_delta.function.name:
+                partial["name"] = tool_delta.function.name
+            if tool_delta.function and tool_delta.function.arguments:
+                partial["arguments"] += tool_delta.function.arguments
+
+    def message(self) -> dict:
+        for index in sorted(self.partial_calls):
+            self._finish(index)
+        return ConversationRunner._assistant_message("".join(self.content_parts), self.calls)
+
+
+class TextPrinter:
+    """Prints streamed assistant text, prefixing the first piece of each message."""
+
+    def __init__(self):
+        self.printed = False
+
+    def __call__(self, text: str) -> None:
+        if not self.printed:
+            print("Assistant: ", end="")
+            self.printed = True
+        print(text, end="", flush=True)
+
+    def end_message(self) -> None:
+        if self.printed:
+            print()
+            self.printed = False
 
 
 class ConversationRunner:
+    transport_class = ModelTransport
+
     def __init__(self, config: Config):
         self.config = config
         self.logger = setup_logging()
         self.tools_registry = get_tools_registry(config)
-        self.client = OpenAI(api_key=config.openai_api_key)
+        self.transport = self.transport_class(config)
+        snapshot_cache.configure(config.snapshot_ttls)
+        self.response_cache: Optional[ResponseCache] = None
+        if config.response_cache_dir:
+            self.response_cache = ResponseCache(
+                config.response_cache_dir,
+                ttl=config.response_cache_ttl,
+                max_bytes=config.response_cache_max_bytes,
+            )
+        self.executor = self._make_executor()
+
+    def _tool_timeouts(self) -> Dict[str, float]:
+        # A fan-out may legitimately run past TOOL_TIMEOUT; let the controller's own timeouts decide.
+        return {"run_remote_diagnostics": self.config.remote_fan_out_timeout}
 
-    def _call_model(self, history: List[dict]):
-        return self.client.chat.completions.create(
-            model=self.config.model_name, messages=history, tools=tool_schemas
+    def _make_executor(self):
+        return ToolExecutor(
+            self.tools_registry,
+            self.logger,
+            max_workers=self.config.max_tool_workers,
+            default_timeout=self.config.tool_timeout,
+            timeouts=self._tool_timeouts(),
+            confirm=self._confirm_fix,
         )
 
+    @property
+    def client(self):
+        return self.transport.client
+
+    @client.setter
+    def client(self, client) -> None:
+        self.transport.client = client
+
+    def _build_request(self, history: List[dict], allow_tools: bool) -> dict:
+        request = {"model": self.config.model_name, "messages": history, "tools": tool_schemas}
+        if not allow_tools:
+            request["tool_choice"] = "none"
+        return request
+
+    def _cached(self, request: dict) -> Tuple[Optional[str], Optional[dict]]:
+        """``(cache_key, cached_message)``; both ``None`` when the response cache is off."""
+
+        if self.response_cache is None:
+            return None, None
+        cache_key = self.response_cache.key(request)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            metrics.counter("response_cache_hits_total", "Model calls answered from the response cache").inc()
+        return cache_key, cached
+
+    def _call_model(
+        self,
+        history: List[dict],
+        on_text: Optional[TextCallback] = None,
+        on_tool_call: Optional[ToolCallCallback] = None,
+        allow_tools: bool = True,
+    ) -> dict:
+        """Send ``history`` to the model and return the assistant message as a dict.
+
+        ``on_text`` receives content as it is generated and ``on_tool_call`` receives
+        each tool call as soon as its arguments are complete.
+        """
+
+        request = self._build_request(history, allow_tools)
+        cache_key, cached = self._cached(request)
+        if cached is not None:
+            return self._replay(cached, on_text, on_tool_call)
+
+        message = self._request_model(request, on_text, on_tool_call)
+        if cache_key is not None:
+            self.response_cache.put(cache_key, message)
+        return message
+
+    def _request_model(
+        self,
+        request: dict,
+        on_text: Optional[TextCallback],
+        on_tool_call: Optional[ToolCallCallback],
+    ) -> dict:
+        with metrics.span("model_call", model=self.config.model_name) as span:
+            if self.config.stream_responses:
+                return self._stream_model(request, on_text, on_tool_call, span)
+
+            response = self.transport.create(**request)
+            return self._response_message(response, span, on_text, on_tool_call)
+
+    def _response_message(
+        self,
+        response,
+        span,
+        on_text: Optional[TextCallback],
+        on_tool_call: Optional[ToolCallCallback],
+    ) -> dict:
+        self._record_usage(span, getattr(response, "usage", None))
+        message = response.choices[0].message
+        calls = [ToolCall.from_openai(tool_call) for tool_call in message.tool_calls or []]
+        if message.content and on_text:
+            on_text(message.content)
+        if on_tool_call:
+            for call in calls:
+                on_tool_call(call)
+        return self._assistant_message(message.content or "", calls)
+
+    def _record_usage(self, span, usage) -> None:
+        if usage is None:
+            return
+        tokens = metrics.counter("model_tokens_total", "Tokens reported by the model API")
+        for kind in ("prompt_tokens", "completion_tokens"):
+            count = getattr(usage, kind, None) or 0
+            tokens.inc(count, model=self.config.model_name, kind=kind.split("_")[0])
+            span.set(**{kind: count})
+
+    def _stream_model(
+        self,
+        request: dict,
+        on_text: Optional[TextCallback],
+        on_tool_call: Optional[ToolCallCallback],
+        span,
+    ) -> dict:
+        assembler = StreamAssembler(span, self._record_usage, on_text, on_tool_call)
+        with closing(self.transport.stream(stream_options={"include_usage": True}, **request)) as chunks:
+            for chunk in chunks:
+                assembler.feed(chunk)
+        return assembler.message()
+
+    @staticmethod
+    def _replay(
+        message: dict,
+        on_text: Optional[TextCallback],
+        on_tool_call: Optional[ToolCallCallback],
+    ) -> dict:
+        if message.get("content") and on_text:
+            on_text(message["content"])
+        if on_tool_call:
+            for tool_call in message.get("tool_calls") or []:
+                on_tool_call(ToolCall.from_message(tool_call))
+        return message
+
+    @staticmethod
+    def _assistant_message(content: str, calls: List[ToolCall]) -> dict:
+        message = {"role": "assistant", "content": content}
+        if calls:
+            message["tool_calls"] = [call.to_message() for call in calls]
+        return message
+
+    def _start_prefetch(self) -> Prefetch:
+        calls = baseline_calls(self.config.prefetch_tools, self.tools_registry, self.logger)
+        prefetch = Prefetch(self.executor, calls)
+        prefetch.start()
+        return prefetch
+
+    def _append_prefetched(self, history: HistoryManager, results) -> None:
+        """Record prefetched results as if the model had requested them this turn."""
+
+        history.append(self._assistant_message("", [call for call, _ in results]))
+        for call, result in results:
+            self._append_tool_message(history, call.name, result, call.id)
+
     def _append_tool_message(
-        self, history: List[dict], tool_name: str, tool_result, tool_call_id: str
+        self, history: HistoryManager, tool_name: str, tool_result, tool_call_id: str
     ):
         history.append(
             {
                 "role": "tool",
                 "name": tool_name,
                 "tool_call_id": tool_call_id,
-                "content": json.dumps(tool_result.__dict__),
+                "content": compact_tool_result(tool_result, self.config.tool_result_token_budget),
             }
         )
 
-    def _handle_tool_call(self, message, history: List[dict]):
-        for tool_call in message.tool_calls:
-            tool_name = tool_call.function.name
-            tool_args = json.loads(tool_call.function.arguments or "{}")
-            tool = self.tools_registry.get(tool_name)
-            if not tool:
-                self.logger.warning("Unknown tool requested: %s", tool_name)
-                continue
-
-            if tool_name in FIX_TOOL_NAMES:
-                print("Assistant proposes a fix:")
-                print(f"- Tool: {tool_name}")
-                print(f"- Parameters: {tool_args}")
-                confirmation = input("Run this action? (yes/no): ").strip().lower()
-                if confirmation not in {"yes", "y"}:
-                    self._append_tool_message(
-                        history,
-                        tool_name,
-                        type("Decline", (), {"__dict__": {"success": False, "data": {}, "error": "User declined"}})(),
-                        tool_call.id,
-                    )
-                    continue
-
-            self.logger.info("Running tool %s with args %s", tool_name, tool_args)
-            result = tool.run(**tool_args)
-            self._append_tool_message(history, tool_name, result, tool_call.id)
+    @staticmethod
+    def _propose_fix(tool_name: str, tool_args: dict) -> None:
+        print("Assistant proposes a fix:")
+        print(f"- Tool: {tool_name}")
+        print(f"- Parameters: {tool_args}")
 
-    def run_conversation(self):
-        if not self.config.openai_api_key:
+    def _confirm_fix(self, tool_name: str, tool_args: dict) -> bool:
+        self._propose_fix(tool_name, tool_args)
+        confirmation = input(CONFIRM_PROMPT).strip().lower()
+        return confirmation in {"yes", "y"}
+
+    def _run_turn(self, history: HistoryManager, prefetched=None) -> None:
+        """Call the model, running requested tools, until it answers with text.
+
+        ``prefetched`` is a batch of baseline tools whose results go into history
+        before the first model request.
+        """
+
+        if prefetched is not None:
+            self._append_prefetched(history, prefetched.results())
+
+        print_text = TextPrinter()
+        for round_number in range(self.config.max_tool_rounds + 1):
+            batch = self.executor.start_batch()
+            message = self._call_model(
+                history.messages(),
+                on_text=print_text,
+                on_tool_call=batch.add,
+                allow_tools=round_number < self.config.max_tool_rounds,
+            )
+            history.append(message)
+            if not message.get("tool_calls"):
+                break
+
+            print_text.end_message()
+            for call, result in batch.results():
+                self._append_tool_message(history, call.name, result, call.id)
+
+        print("\n")
+
+    def _start_session(self) -> Optional[HistoryManager]:
+        """Print the banner and return a fresh history, or ``None`` when no model is configured."""
+
+        if not self.config.openai_api_key and not self.config.openai_base_url:
             print("OPENAI_API_KEY is not set. Please configure it in your environment or .env file.")
-            return
+            return None
 
         print("ai-system-diagnoser (experimental)")
         print(f"Mode: {'Allow fixes' if self.config.allow_fixes else 'Diagnostic only'}")
         print("Type 'exit' or 'quit' to end the session.\n")
 
-        history: List[dict] = [{"role": "system", "content": SYSTEM_PROMPT}]
+        return HistoryManager(
+            SYSTEM_PROMPT,
+            max_turns=self.config.history_turns,
+            token_limit=self.config.history_token_limit,
+        )
+
+    def _end_session(self) -> None:
+        self.logger.info("Snapshot cache stats: %s", snapshot_cache.stats())
+        if self.response_cache is not None:
+            self.logger.info("Response cache stats: %s", self.response_cache.stats())
 
-        while True:
-            user_input = input("You: ")
-            if user_input.strip().lower() in {"exit", "quit"}:
-                break
+    def _close(self) -> None:
+        """Stop tool workers and close tools holding connections, however the session ended."""
+
+        self.executor.shutdown()
+        self.tools_registry.close()
+
+    def run_conversation(self):
+        history = self._start_session()
+        if history is None:
+            return
+
+        prefetch = self._start_prefetch()
+        try:
+            while True:
+                user_input = input("You: ")
+                if user_input.strip().lower() in EXIT_COMMANDS:
+                    self._end_session()
+                    break
 
-            history.append({"role": "user", "content": user_input})
-            response = self._call_model(history)
-            message = response.choices[0].message
-
-            if message.tool_calls:
-                assistant_msg = {
-                    "role": "assistant",
-                    "content": message.content or "",
-                    "tool_calls": [tc.model_dump() for tc in message.tool_calls],
-                }
-                history.append(assistant_msg)
-                self._handle_tool_call(message, history)
-                # Call the model again with tool outputs
-                response = self._call_model(history)
-                message = response.choices[0].message
-
-            history.append({"role": "assistant", "content": message.content or ""})
-            print(f"Assistant: {message.content}\n")
+                history.start_turn(user_input)
+                try:
+                    self._run_turn(history, prefetch.take())
+                except ModelCallError as exc:
+                    self.logger.error("Model call failed: %s", exc)
+                    print(f"\nModel request failed: {exc}\n")
+        finally:
+            prefetch.cancel()
+            self._close()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import List
+
+from .compaction import dumps, estimate_tokens
+
+
+SUMMARY_HEADER = "Summary of earlier turns in this session (older details were dropped):"
+MESSAGE_OVERHEAD_TOKENS = 4
+MAX_SUMMARY_LINES = 30
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def message_tokens(message: dict) -> int:
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message.get("content") or "")
+    if message.get("tool_calls"):
+        tokens += estimate_tokens(dumps(message["tool_calls"]))
+    return tokens
+
+
+class HistoryManager:
+    """Bounded chat history: the system prompt, a rolling summary and the last turns verbatim.
+
+    A turn is a user message plus every assistant and tool message that answered
+    it. Turns older than ``max_turns`` are folded into one-line summaries, tool
+    output from turns before the last ``tool_result_turns`` is reduced to a short
+    digest, and the whole request is kept under ``token_limit`` estimated tokens.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        max_turns: int = 6,
+        token_limit: int = 12000,
+        tool_result_turns: int = 2,
+    ):
+        self.system_message = {"role": "system", "content": system_prompt}
+        self.max_turns = max(1, max_turns)
+        self.token_limit = token_limit
+        self.tool_result_turns = max(1, tool_result_turns)
+        self.turns: List[List[dict]] = []
+        self.summary_lines: List[str] = []
+        self.omitted_turns = 0
+
+    def start_turn(self, user_content: str) -> None:
+        self.turns.append([{"role": "user", "content": user_content}])
+        while len(self.turns) > self.max_turns:
+            self._fold_oldest_turn()
+        self._digest_stale_tool_results()
+
+    def append(self, message: dict) -> None:
+        if not self.turns:
+            self.turns.append([])
+        self.turns[-1].append(message)
+
+    @staticmethod
+    def summarize_turn(turn: List[dict]) -> str:
+        question = next((m["content"] for m in turn if m["role"] == "user"), "")
+        tools = [
+            call["function"]["name"]
+            for message in turn
+            for call in message.get("tool_calls") or []
+        ]
+        answer = next(
+            (m["content"] for m in reversed(turn) if m["role"] == "assistant" and m.get("content")), ""
+        )
+        line = f"- User: {_clip(question, 160)}"
+        if tools:
+            line += f" | Tools: {', '.join(dict.fromkeys(tools))}"
+        if answer:
+            line += f" | Assistant: {_clip(answer, 240)}"
+        return line
+
+    def _fold_oldest_turn(self) -> None:
+        self.summary_lines.append(self.summarize_turn(self.turns.pop(0)))
+        if len(self.summary_lines) > MAX_SUMMARY_LINES:
+            self.summary_lines.pop(0)
+            self.omitted_turns += 1
+
+    def _digest_stale_tool_results(self) -> None:
+        for turn in self.turns[: -self.tool_result_turns]:
+            for message in turn:
+                if message["role"] == "tool" and not message.get("digested"):
+                    message["content"] = f"[earlier result, {len(message['content'])} chars] " + _clip(
+                        message["content"], 160
+                    )
+                    message["digested"] = True
+
+    def _summary_message(self) -> List[dict]:
+        if not self.summary_lines:
+            return []
+        lines = [SUMMARY_HEADER]
+        if self.omitted_turns:
+            lines.append(f"- ({self.omitted_turns} earliest turns omitted)")
+        lines.extend(self.summary_lines)
+        return [{"role": "system", "content": "\n".join(lines)}]
+
+    def _build(self) -> List[dict]:
+        messages = [self.system_message] + self._summary_message()
+        for turn in self.turns:
+            messages.extend(
+                {key: value for key, value in message.items() if key != "digested"} for message in turn
+            )
+        return messages
+
+    def messages(self) -> List[dict]:
+        """Return the messages to send, enforcing the token ceiling."""
+
+        messages = self._build()
+        while sum(message_tokens(m) for m in messages) > self.token_limit:
+            if len(self.turns) > 1:
+                self._fold_oldest_turn()
+            elif len(self.summary_lines) > 1:
+                self.summary_lines.pop(0)
+                self.omitted_turns += 1
+            elif not self._clip_largest_tool_result():
+                break
+            messages = self._build()
+        return messages
+
+    def _clip_largest_tool_result(self) -> bool:
+        tool_messages = [m for turn in self.turns for m in turn if m["role"] == "tool"]
+        if not tool_messages:
+            return False
+        largest = max(tool_messages, key=lambda m: len(m["content"]))
+        if len(largest["content"]) <= 200:
+            return False
+        largest["content"] = largest["content"][: len(largest["content"]) // 2] + "...[truncated]"
+        return True
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Iterable, List, Mapping
+
+from ..tools.base import BaseTool
+from .tool_executor import ToolCall
+from .tools_registry import FIX_TOOL_NAMES
+
+# Results collected longer ago than this are collected again for the first question.
+DEFAULT_MAX_AGE = 120.0
+
+
+def baseline_calls(tool_names: Iterable[str], registry: Mapping[str, BaseTool], logger: logging.Logger) -> List[ToolCall]:
+    """Argument-less calls for the read-only tools among ``tool_names``."""
+
+    calls = []
+    for name in tool_names:
+        if name in FIX_TOOL_NAMES or name not in registry:
+            logger.warning("Not prefetching %s: not an available read-only tool", name)
+            continue
+        calls.append(ToolCall(id=f"prefetch_{name}", name=name))
+    return calls
+
+
+class Prefetch:
+    """Baseline tools started when the session opens, for the first model request.
+
+    Nearly every session starts with the model asking for the same overview
+    tools. Starting them while the user types, and handing the results to the
+    first request as if the model had already called them, saves that request
+    a whole model round-trip.
+
+    ``executor`` is a :class:`~.tool_executor.ToolExecutor` or an
+    :class:`~.tool_executor.AsyncToolExecutor`; :meth:`take` returns a batch
+    from it, whose ``results()`` is awaited in the async case.
+    """
+
+    def __init__(
+        self,
+        executor,
+        calls: List[ToolCall],
+        max_age: float = DEFAULT_MAX_AGE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.executor = executor
+        self.calls = calls
+        self.max_age = max_age
+        self._clock = clock
+        self._batch = None
+        self._started = 0.0
+
+    def _dispatch(self):
+        batch = self.executor.start_batch()
+        for call in self.calls:
+            batch.add(call)
+        self._started = self._clock()
+        return batch
+
+    def start(self) -> None:
+        if self.calls:
+            self._batch = self._dispatch()
+
+    def take(self):
+        """The started batch, once; ``None`` afterwards or when nothing was prefetched.
+
+        Results older than ``max_age`` would describe a system the user has
+        stopped looking at, so the calls are dispatched again instead.
+        """
+
+        batch, self._batch = self._batch, None
+        if batch is not None and self._clock() - self._started > self.max_age:
+            batch.cancel()
+            batch = self._dispatch()
+        return batch
+
+    def cancel(self) -> None:
+        batch, self._batch = self._batch, None
+        if batch is not None:
+            batch.cancel()
+
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_TTL = 24 * 3600.0
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_VERSION = 1
+
+# Keys whose values differ between otherwise identical runs and say nothing about the problem.
+VOLATILE_KEYS = frozenset({"time", "timestamp", "collected_at", "uptime_seconds", "first_seen", "last_seen"})
+
+MessageNormalizer = Callable[[dict], dict]
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _normalize_value(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, float):
+        return round(value)
+    return value
+
+
+def normalize_message(message: dict) -> dict:
+    """Default normalizer: make near-identical tool payloads hash the same.
+
+    Tool call ids are dropped, and JSON tool results lose volatile keys and have
+    floats rounded to whole numbers.
+    """
+
+    normalized = {key: value for key, value in message.items() if key != "tool_call_id"}
+    if message.get("tool_calls"):
+        normalized["tool_calls"] = [
+            {key: value for key, value in call.items() if key != "id"} for call in message["tool_calls"]
+        ]
+    if message.get("role") == "tool" and isinstance(message.get("content"), str):
+        try:
+            normalized["content"] = _normalize_value(json.loads(message["content"]))
+        except ValueError:
+            pass
+    return normalized
+
+
+class ResponseCache:
+    """On-disk cache of assistant messages keyed by a hash of the request.
+
+    One JSON file per entry. Entries older than ``ttl`` are ignored, reads bump
+    the file's mtime, and writes evict the least recently used files once the
+    directory exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        normalizer: Optional[MessageNormalizer] = normalize_message,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.normalizer = normalizer
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, request: dict) -> str:
+        messages: List[dict] = request.get("messages") or []
+        if self.normalizer is not None:
+            messages = [self.normalizer(message) for message in messages]
+        material = {
+            "version": CACHE_VERSION,
+            "model": request.get("model"),
+            "messages": messages,
+            "tools": request.get("tools"),
+            "tool_choice": request.get("tool_choice"),
+        }
+        encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entry = None
+
+        now = self._clock()
+        if not isinstance(entry, dict) or now - entry.get("created_at", 0) > self.ttl:
+            if entry is not None:
+                path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry["message"]
+
+    def put(self, key: str, message: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps({"created_at": self._clock(), "message": message}), encoding="utf-8")
+        os.replace(tmp_path, path)
+        now = self._clock()
+        os.utime(path, (now, now))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..tools.base import BaseTool, ToolResult
+from ..tools.snapshot_cache import snapshot_cache
+from ..utils.metrics import metrics
+from .tools_registry import FIX_TOOL_NAMES
+
+
+DEFAULT_TOOL_TIMEOUTS: Dict[str, float] = {
+    "run_network_diagnostics": 20.0,
+}
+
+
+@dataclass
+class ToolCall:
+    """A tool invocation requested by the model, independent of the OpenAI SDK types."""
+
+    id: str
+    name: str
+    arguments: str = "{}"
+
+    @classmethod
+    def from_openai(cls, tool_call) -> "ToolCall":
+        return cls(
+            id=tool_call.id,
+            name=tool_call.function.name,
+            arguments=tool_call.function.arguments or "{}",
+        )
+
+    @classmethod
+    def from_message(cls, message: dict) -> "ToolCall":
+        function = message.get("function") or {}
+        return cls(
+            id=message.get("id", ""),
+            name=function.get("name", ""),
+            arguments=function.get("arguments") or "{}",
+        )
+
+    def to_message(self) -> dict:
+        return {
+            "id": self.id,
+            "type": "function",
+            "function": {"name": self.name, "arguments": self.arguments},
+        }
+
+
+ConfirmCallback = Callable[[str, dict], bool]
+AsyncConfirmCallback = Callable[[str, dict], Awaitable[bool]]
+
+
+class ToolExecutor:
+    """Runs read-only tools concurrently and fix tools one at a time after confirmation.
+
+    Results are always returned in the order the calls were requested so that the
+    tool messages line up with the assistant's ``tool_calls`` list.
+    """
+
+    def __init__(
+        self,
+        tools_registry: Mapping[str, BaseTool],
+        logger: logging.Logger,
+        max_workers: int = 8,
+        default_timeout: float = 30.0,
+        timeouts: Optional[Mapping[str, float]] = None,
+        confirm: Optional[ConfirmCallback] = None,
+    ):
+        self.tools_registry = tools_registry
+        self.logger = logger
+        self.default_timeout = default_timeout
+        self.timeouts = dict(DEFAULT_TOOL_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.confirm = confirm
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._pool_lock = threading.Lock()
+
+    def timeout_for(self, tool_name: str) -> float:
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    def _invoke(self, tool: BaseTool, tool_name: str, tool_args: dict) -> Tuple[ToolResult, float]:
+        """Run one tool, returning its result and wall time in seconds."""
+
+        self.logger.info("Running tool %s with args %s", tool_name, tool_args)
+        started = time.perf_counter()
+        with metrics.span("tool_run", tool=tool_name) as span:
+            try:
+                result = tool.run(**tool_args)
+            except Exception as exc:  # noqa: BLE001 - surface tool failures to the model
+                self.logger.exception("Tool %s failed", tool_name)
+                result = ToolResult(success=False, data={}, error=f"{type(exc).__name__}: {exc}")
+            if not result.success:
+                span.status = "error"
+        seconds = time.perf_counter() - started
+        self.logger.info("Tool %s finished in %.1f ms", tool_name, seconds * 1000)
+        return result, seconds
+
+    @staticmethod
+    def _parse_arguments(call: ToolCall) -> Tuple[Optional[dict], Optional[ToolResult]]:
+        try:
+            tool_args = json.loads(call.arguments or "{}")
+        except json.JSONDecodeError as exc:
+            return None, ToolResult(success=False, data={}, error=f"Invalid tool arguments: {exc}")
+        if not isinstance(tool_args, dict):
+            return None, ToolResult(success=False, data={}, error="Tool arguments must be a JSON object")
+        return tool_args, None
+
+    def _run_fix(self, tool: BaseTool, call: ToolCall, tool_args: dict) -> Tuple[ToolResult, float]:
+        if self.confirm is not None and not self.confirm(call.name, tool_args):
+            return ToolResult(success=False, data={}, error="User declined"), 0.0
+        try:
+            return self._invoke(tool, call.name, tool_args)
+        finally:
+            # Whatever the outcome, the fix may have changed the system under us.
+            snapshot_cache.invalidate()
+
+    def _await(self, call: ToolCall, future: Future, deadline: float) -> Tuple[ToolResult, float]:
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            timeout = self.timeout_for(call.name)
+            error = f"Tool timed out after {timeout:g}s"
+            if not future.cancel():
+                # The thread cannot be stopped; keep it from holding up later batches.
+                self._replace_pool()
+                error += " and is still running in the background"
+            self.logger.warning("Tool %s timed out after %.1fs", call.name, timeout)
+            return ToolResult(success=False, data={}, error=error), timeout
+
+    def _replace_pool(self) -> None:
+        """Send new calls to fresh workers; the old pool finishes its calls and then exits."""
+
+        with self._pool_lock:
+            stuck, self._pool = self._pool, ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+        stuck.shutdown(wait=False)
+
+    def start_batch(self) -> "ToolBatch":
+        return ToolBatch(self)
+
+    def run_calls(self, tool_calls: Iterable[ToolCall]) -> List[Tuple[ToolCall, ToolResult]]:
+        batch = self.start_batch()
+        for call in tool_calls:
+            batch.add(call)
+        return batch.results()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ToolBatch:
+    """Tool calls from one assistant message, dispatched as soon as each call is known.
+
+    Read-only tools start on the executor's pool from :meth:`add`, which lets a
+    streaming response kick off tools while the model is still generating the
+    remaining calls. Fix tools are queued and only run from :meth:`results`.
+    """
+
+    def __init__(self, executor: ToolExecutor):
+        self.executor = executor
+        self.calls: List[ToolCall] = []
+        self._ready: Dict[int, Tuple[ToolResult, float]] = {}
+        self._pending: List[Tuple[int, Future, float]] = []
+        self._fixes: List[Tuple[int, BaseTool, dict]] = []
+
+    def add(self, call: ToolCall) -> None:
+        executor = self.executor
+        index = len(self.calls)
+        self.calls.append(call)
+
+        tool = executor.tools_registry.get(call.name)
+        if not tool:
+            executor.logger.warning("Unknown tool requested: %s", call.name)
+            self._ready[index] = ToolResult(success=False, data={}, error=f"Unknown tool: {call.name}"), 0.0
+            return
+
+        tool_args, error = executor._parse_arguments(call)
+        if error is not None:
+            self._ready[index] = error, 0.0
+            return
+
+        if call.name in FIX_TOOL_NAMES:
+            self._fixes.append((index, tool, tool_args))
+            return
+
+        deadline = time.monotonic() + executor.timeout_for(call.name)
+        future = executor._pool.submit(executor._invoke, tool, call.name, tool_args)
+        self._pending.append((index, future, deadline))
+
+    def cancel(self) -> None:
+        """Drop calls that have not started yet; a running tool thread cannot be stopped."""
+
+        for _, future, _ in self._pending:
+            future.cancel()
+
+    def timed_results(self) -> List[Tuple[ToolCall, ToolResult, float]]:
+        """Wait for every call and return ``(call, result, seconds)`` in request order."""
+
+        for index, future, deadline in self._pending:
+            self._ready[index] = self.executor._await(self.calls[index], future, deadline)
+        self._pending = []
+
+        # Fix tools change the system, so they run only after every read-only
+        # probe in the batch has finished and strictly one at a time.
+        for index, tool, tool_args in self._fixes:
+            self._ready[index] = self.executor._run_fix(tool, self.calls[index], tool_args)
+        self._fixes = []
+
+        return [(call, *self._ready[index]) for index, call in enumerate(self.calls)]
+
+    def results(self) -> List[Tuple[ToolCall, ToolResult]]:
+        return [(call, result) for call, result, _ in self.timed_results()]
+
+
+class AsyncToolExecutor:
+    """Event-loop counterpart of :class:`ToolExecutor`, built on :meth:`BaseTool.arun`.
+
+    Read-only calls run as tasks, so cancelling a batch (when the user interrupts
+    a turn) cancels every tool still in flight.
+    """
+
+    def __init__(
+        self,
+        tools_registry: Mapping[str, BaseTool],
+        logger: logging.Logger,
+        default_timeout: float = 30.0,
+        timeouts: Optional[Mapping[str, float]] = None,
+        confirm: Optional[AsyncConfirmCallback] = None,
+    ):
+        self.tools_registry = tools_registry
+        self.logger = logger
+        self.default_timeout = default_timeout
+        self.timeouts = dict(DEFAULT_TOOL_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.confirm = confirm
+
+    def timeout_for(self, tool_name: str) -> float:
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    async def _invoke(self, tool: BaseTool, tool_name: str, tool_args: dict) -> Tuple[ToolResult, float]:
+        self.logger.info("Running tool %s with args %s", tool_name, tool_args)
+        started = time.perf_counter()
+        timeout = self.timeout_for(tool_name)
+        with metrics.span("tool_run", tool=tool_name) as span:
+            try:
+                result = await asyncio.wait_for(tool.arun(**tool_args), timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning("Tool %s timed out after %.1fs", tool_name, timeout)
+                result = ToolResult(success=False, data={}, error=f"Tool timed out after {timeout:g}s")
+            except asyncio.CancelledError:
+                span.status = "cancelled"
+                raise
+            except Exception as exc:  # noqa: BLE001 - surface tool failures to the model
+                self.logger.exception("Tool %s failed", tool_name)
+                result = ToolResult(success=False, data={}, error=f"{type(exc).__name__}: {exc}")
+            if not result.success:
+                span.status = "error"
+        seconds = time.perf_counter() - started
+        self.logger.info("Tool %s finished in %.1f ms", tool_name, seconds * 1000)
+        return result, seconds
+
+    async def _run_fix(self, tool: BaseTool, call: ToolCall, tool_args: dict) -> Tuple[ToolResult, float]:
+        if self.confirm is not None and not await self.confirm(call.name, tool_args):
+            return ToolResult(success=False, data={}, error="User declined"), 0.0
+        try:
+            return await self._invoke(tool, call.name, tool_args)
+        finally:
+            snapshot_cache.invalidate()
+
+    def start_batch(self) -> "AsyncToolBatch":
+        return AsyncToolBatch(self)
+
+    async def run_calls(self, tool_calls: Iterable[ToolCall]) -> List[Tuple[ToolCall, ToolResult]]:
+        batch = self.start_batch()
+        for call in tool_calls:
+            batch.add(call)
+        return await batch.results()
+
+    def shutdown(self) -> None:
+        """Nothing to release: every task belongs to a batch, which cancels its own."""
+
+
+class AsyncToolBatch:
+    """:class:`ToolBatch` for the event loop: read-only calls start as tasks from :meth:`add`."""
+
+    def __init__(self, executor: AsyncToolExecutor):
+        self.executor = executor
+        self.calls: List[ToolCall] = []
+        self._ready: Dict[int, Tuple[ToolResult, float]] = {}
+        self._tasks: Dict[int, "asyncio.Future[Tuple[ToolResult, float]]"] = {}
+        self._fixes: List[Tuple[int, BaseTool, dict]] = []
+
+    def add(self, call: ToolCall) -> None:
+        executor = self.executor
+        index = len(self.calls)
+        self.calls.append(call)
+
+        tool = executor.tools_registry.get(call.name)
+        if not tool:
+            executor.logger.warning("Unknown tool requested: %s", call.name)
+            self._ready[index] = ToolResult(success=False, data={}, error=f"Unknown tool: {call.name}"), 0.0
+            return
+
+        tool_args, error = ToolExecutor._parse_arguments(call)
+        if error is not None:
+            self._ready[index] = error, 0.0
+            return
+
+        if call.name in FIX_TOOL_NAMES:
+            self._fixes.append((index, tool, tool_args))
+            return
+
+        self._tasks[index] = asyncio.ensure_future(executor._invoke(tool, call.name, tool_args))
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+
+    async def timed_results(self) -> List[Tuple[ToolCall, ToolResult, float]]:
+        """Wait for every call and return ``(call, result, seconds)`` in request order."""
+
+        try:
+            for index, task in self._tasks.items():
+                self._ready[index] = await task
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        self._tasks = {}
+
+        for index, tool, tool_args in self._fixes:
+            self._ready[index] = await self.executor._run_fix(tool, self.calls[index], tool_args)
+        self._fixes = []
+
+        return [(call, *self._ready[index]) for index, call in enumerate(self.calls)]
+
+    async def results(self) -> List[Tuple[ToolCall, ToolResult]]:
+        return [(call, result) for call, result, _ in await self.timed_results()]
@@ -7,11 +7,32 @@ tool_schemas = [
             "parameters": {"type": "object", "properties": {}, "required": []},
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_hardware_inventory",
+            "description": (
+                "Get static hardware facts: CPU model, GPUs, memory modules, network interfaces and disks. "
+                "Cached per boot, so it is cheap to call."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Probe the hardware again instead of using the inventory cached for this boot",
+                        "default": False,
+                    }
+                },
+                "required": [],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
             "name": "get_process_snapshot",
-            "description": "List top processes by resource usage.",
+            "description": "List top processes by CPU, memory, I/O or open file descriptors.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -19,7 +40,13 @@ tool_schemas = [
                         "type": "integer",
                         "description": "Max number of processes to return.",
                         "default": 20,
-                    }
+                    },
+                    "sort_by": {
+                        "type": "string",
+                        "enum": ["cpu", "memory", "io", "fds"],
+                        "description": "Resource to rank processes by.",
+                        "default": "cpu",
+                    },
                 },
                 "required": [],
             },
@@ -29,8 +56,18 @@ tool_schemas = [
         "type": "function",
         "function": {
             "name": "get_disk_health",
-            "description": "Check SMART/health status for disks.",
-            "parameters": {"type": "object", "properties": {}, "required": []},
+            "description": "Check SMART/health status, I/O latency, utilisation and queue depth for disks.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "include_smart": {
+                        "type": "boolean",
+                        "description": "Query SMART health (cached per device; set false for I/O stats only)",
+                        "default": True,
+                    }
+                },
+                "required": [],
+            },
         },
     },
     {
@@ -45,7 +82,32 @@ tool_schemas = [
                         "type": "integer",
                         "description": "Maximum number of events to return",
                         "default": 50,
-                    }
+                    },
+                    "since_minutes": {
+                        "type": "integer",
+                        "description": "Only include events from the last N minutes",
+                        "default": 1440,
+                    },
+                    "min_priority": {
+                        "type": "string",
+                        "enum": ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"],
+                        "description": "Least severe priority to include",
+                        "default": "err",
+                    },
+                    "only_new": {
+                        "type": "boolean",
+                        "description": (
+                            "Only return events logged since the previous call; if more than limit "
+                            "arrived, the older ones are skipped and the result is marked truncated"
+                        ),
+                        "default": False,
+                    },
+                    "source": {
+                        "type": "string",
+                        "enum": ["system", "diagnoser"],
+                        "description": "Read the OS logs or this assistant's own log file",
+                        "default": "system",
+                    },
                 },
                 "required": [],
             },
@@ -55,20 +117,98 @@ tool_schemas = [
         "type": "function",
         "function": {
             "name": "run_network_diagnostics",
-            "description": "Run ping and DNS checks against a target.",
+            "description": (
+                "Run DNS, TCP connect and ping checks against one or more targets concurrently; "
+                "reports per-phase latency percentiles and jitter."
+            ),
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "target": {
-                        "type": "string",
-                        "description": "Target host or IP to test",
-                        "default": "8.8.8.8",
+                    "targets": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Hosts or IPs to test (gateway, DNS servers, internal services)",
+                        "default": ["8.8.8.8"],
+                    },
+                    "ports": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "description": "TCP ports to connect to on every target",
+                        "default": [],
+                    },
+                    "count": {
+                        "type": "integer",
+                        "description": "Probes per check",
+                        "minimum": 1,
+                        "maximum": 10,
+                        "default": 4,
+                    },
+                    "timeout": {"type": "number", "description": "Per-probe timeout in seconds", "default": 3},
+                    "ping": {"type": "boolean", "description": "Also run ICMP ping", "default": True},
+                },
+                "required": [],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_anomalies",
+            "description": (
+                "Compare current CPU, memory, disk and top-process metrics with this host's rolling "
+                "baseline and return only the metrics that deviate from normal. Prefer this over raw "
+                "snapshots when asking whether something is unusual for this machine."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "z_threshold": {
+                        "type": "number",
+                        "description": "Standard deviations from the baseline mean that count as anomalous",
+                        "default": 3.0,
                     }
                 },
                 "required": [],
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "run_remote_diagnostics",
+            "description": (
+                "Run one read-only diagnostic tool on the remote hosts configured in REMOTE_HOSTS, "
+                "concurrently, and return each host's result. Use it to compare machines in a cluster."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "tool": {
+                        "type": "string",
+                        "enum": [
+                            "get_system_overview",
+                            "get_hardware_inventory",
+                            "get_process_snapshot",
+                            "get_disk_health",
+                            "get_recent_system_errors",
+                            "run_network_diagnostics",
+                            "get_temperature_readings",
+                            "get_anomalies",
+                        ],
+                        "description": "Read-only tool to run on every host",
+                        "default": "get_system_overview",
+                    },
+                    "arguments": {"type": "object", "description": "Arguments for the tool"},
+                    "hosts": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Subset of the configured agents (host or host:port); all of them when omitted",
+                    },
+                },
+                "required": [],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
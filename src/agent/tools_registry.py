@@ -1,34 +1,91 @@
 from __future__ import annotations
 
-from typing import Dict
+import threading
+from typing import Dict, Iterator, MutableMapping, Tuple
 
+from .. import tools
 from ..config import Config
-from ..tools import (
-    DiskHealthTool,
-    DisableStartupItemTool,
-    EventLogsTool,
-    NetworkDiagnosticsTool,
-    ProcessSnapshotTool,
-    RestartServiceTool,
-    SystemFileCheckTool,
-    SystemOverviewTool,
-    TemperatureTool,
-)
 from ..tools.base import BaseTool
 
 
 FIX_TOOL_NAMES = {"restart_service", "run_system_file_check", "disable_startup_item"}
 
+# Tool name -> (class name exported by ``tools``, whether the constructor takes the config).
+TOOL_CLASSES: Dict[str, Tuple[str, bool]] = {
+    "get_system_overview": ("SystemOverviewTool", True),
+    "get_hardware_inventory": ("HardwareInventoryTool", True),
+    "get_process_snapshot": ("ProcessSnapshotTool", False),
+    "get_disk_health": ("DiskHealthTool", False),
+    "get_recent_system_errors": ("EventLogsTool", False),
+    "run_network_diagnostics": ("NetworkDiagnosticsTool", False),
+    "get_temperature_readings": ("TemperatureTool", False),
+    "get_anomalies": ("AnomaliesTool", True),
+    "run_remote_diagnostics": ("RemoteDiagnosticsTool", True),
+    "restart_service": ("RestartServiceTool", True),
+    "run_system_file_check": ("SystemFileCheckTool", True),
+    "disable_startup_item": ("DisableStartupItemTool", True),
+}
 
-def get_tools_registry(config: Config) -> Dict[str, BaseTool]:
-    return {
-        "get_system_overview": SystemOverviewTool(),
-        "get_process_snapshot": ProcessSnapshotTool(),
-        "get_disk_health": DiskHealthTool(),
-        "get_recent_system_errors": EventLogsTool(),
-        "run_network_diagnostics": NetworkDiagnosticsTool(),
-        "get_temperature_readings": TemperatureTool(),
-        "restart_service": RestartServiceTool(config),
-        "run_system_file_check": SystemFileCheckTool(config),
-        "disable_startup_item": DisableStartupItemTool(config),
-    }
+
+class LazyToolRegistry(MutableMapping):
+    """Tool name -> tool instance mapping that imports and builds each tool on first use.
+
+    Iterating over names or checking membership never instantiates anything,
+    so startup only pays for the tools a session actually calls.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._names = list(TOOL_CLASSES)
+        self._instances: Dict[str, BaseTool] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> BaseTool:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        if name not in self._names:
+            raise KeyError(name)
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                class_name, needs_config = TOOL_CLASSES[name]
+                tool_class = getattr(tools, class_name)
+                instance = tool_class(self.config) if needs_config else tool_class()
+                self._instances[name] = instance
+            return instance
+
+    def __setitem__(self, name: str, tool: BaseTool) -> None:
+        with self._lock:
+            if name not in self._names:
+                self._names.append(name)
+            self._instances[name] = tool
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            if name not in self._names:
+                raise KeyError(name)
+            self._names.remove(name)
+            self._instances.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def close(self) -> None:
+        """Close every tool built so far; tools never used are not created just to be closed."""
+
+        with self._lock:
+            instances = list(self._instances.values())
+        for tool in instances:
+            tool.close()
+
+
+def get_tools_registry(config: Config) -> LazyToolRegistry:
+    return LazyToolRegistry(config)
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional
+
+from ..config import Config
+from ..utils.logging_utils import setup_logging
+from ..utils.metrics import metrics
+
+LOCAL_API_KEY = "not-needed"
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = {408, 409, 429}
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+class ModelCallError(RuntimeError):
+    """The model request failed after retries or hit the deadline."""
+
+
+class CircuitOpenError(ModelCallError):
+    """Recent model requests kept failing, so new ones are refused until the cooldown ends."""
+
+
+def shared_http_client():
+    """Process-wide keep-alive HTTP pool shared by every OpenAI client."""
+
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            from openai import DefaultHttpxClient
+
+            _http_client = DefaultHttpxClient()
+        return _http_client
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in RETRY_STATUSES or status >= 500
+
+    from openai import APIConnectionError
+
+    return isinstance(exc, APIConnectionError)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures; after ``cooldown`` seconds one trial call is let through."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = self._clock()
+
+
+class ModelTransport:
+    """Chat completion calls with a shared connection pool, deadlines, retries and a circuit breaker.
+
+    Retries use full-jitter exponential backoff (or the server's ``Retry-After``) and
+    only happen before a response starts, so streamed tokens are never duplicated.
+    Streams are consumed through :meth:`stream`, which keeps the deadline and the
+    breaker in force until the last chunk.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.config = config
+        self.logger = setup_logging()
+        self.breaker = CircuitBreaker(config.circuit_breaker_threshold, config.circuit_breaker_cooldown, clock)
+        self._client = None
+        self._sleep = sleep
+        self._clock = clock
+        self._jitter = jitter
+
+    def _client_options(self) -> Dict[str, Any]:
+        from openai import Timeout
+
+        return {
+            "api_key": self.config.openai_api_key or LOCAL_API_KEY,
+            "base_url": self.config.openai_base_url,
+            "timeout": Timeout(self.config.model_timeout, connect=self.config.model_connect_timeout),
+            "max_retries": 0,
+        }
+
+    @property
+    def client(self):
+        # openai takes roughly half a second to import, so defer it to the first model call.
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(http_client=shared_http_client(), **self._client_options())
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        server_hint = retry_after(exc)
+        if server_hint is not None:
+            return min(server_hint, BACKOFF_CAP * 4)
+        return self._jitter() * min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+
+    def _admit(self, deadline: float) -> float:
+        """Seconds left for the next attempt; raises if the breaker is open or the deadline has passed."""
+
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"Model endpoint is failing; not retrying for {self.config.circuit_breaker_cooldown:g}s"
+            )
+        return self._remaining(deadline)
+
+    def _remaining(self, deadline: float) -> float:
+        remaining = deadline - self._clock()
+        if remaining <= 0:
+            raise ModelCallError(f"Model call exceeded its {self.config.model_deadline:g}s deadline")
+        return remaining
+
+    def _attempt_timeout(self, remaining: float):
+        from openai import Timeout
+
+        return Timeout(
+            min(self.config.model_timeout, remaining),
+            connect=min(self.config.model_connect_timeout, remaining),
+        )
+
+    def _retry_delay(self, exc: Exception, attempt: int, deadline: float) -> float:
+        """Record a failed attempt and return the wait before the next one.
+
+        Raises :class:`ModelCallError` when ``exc`` is not worth retrying or the
+        retry budget is spent.
+        """
+
+        if not is_retryable(exc):
+            # The endpoint answered; a rejected request says nothing about its health.
+            self.breaker.record_success()
+            raise ModelCallError(f"Model call failed: {exc}") from exc
+        self.breaker.record_failure()
+        metrics.counter("model_retries_total", "Retryable model call failures").inc(error=type(exc).__name__)
+        delay = self._backoff(attempt, exc)
+        if attempt + 1 > self.config.model_max_retries or self._clock() + delay >= deadline:
+            raise ModelCallError(f"Model call failed after {attempt + 1} attempt(s): {exc}") from exc
+        self.logger.warning("Model call failed (%s); retrying in %.2fs", exc, delay)
+        return delay
+
+    def _open(self, deadline: float, request: Dict[str, Any]):
+        for attempt in itertools.count():
+            remaining = self._admit(deadline)
+            try:
+                return self.client.chat.completions.create(timeout=self._attempt_timeout(remaining), **request)
+            except Exception as exc:  # noqa: BLE001 - classified in _retry_delay
+                delay = self._retry_delay(exc, attempt, deadline)
+                self._sleep(delay)
+
+    def create(self, **request: Any):
+        """``client.chat.completions.create`` under the configured retry and deadline policy."""
+
+        response = self._open(self._clock() + self.config.model_deadline, request)
+        self.breaker.record_success()
+        return response
+
+    def stream(self, **request: Any) -> Iterator[Any]:
+        """Yield the chunks of a streamed completion.
+
+        The deadline is checked as each chunk arrives, so a slow stream is cut
+        off; a single stalled read is bounded by the per-attempt read timeout.
+        Failures while reading count against the circuit breaker.
+        """
+
+        deadline = self._clock() + self.config.model_deadline
+        response = self._open(deadline, dict(request, stream=True))
+        try:
+            for chunk in response:
+                self._remaining(deadline)
+                yield chunk
+        except ModelCallError:
+            self.breaker.record_failure()
+            raise
+        except Exception as exc:  # noqa: BLE001 - read errors and API errors mid-stream
+            self.breaker.record_failure()
+            raise ModelCallError(f"Model response stream failed: {exc}") from exc
+        except BaseException:
+            # The caller stopped reading (closed early, cancelled, Ctrl-C); the endpoint was answering.
+            self.breaker.record_success()
+            raise
+        finally:
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
+        self.breaker.record_success()
+
+
+class AsyncModelTransport(ModelTransport):
+    """:class:`ModelTransport` on ``AsyncOpenAI``: the same policy, with backoff that yields to other tasks.
+
+    The async HTTP pool is tied to the event loop that first uses it, so each
+    transport owns one instead of sharing the process-wide pool.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ):
+        super().__init__(config, clock=clock, jitter=jitter)
+        self._async_sleep = sleep
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+            self._client = AsyncOpenAI(http_client=DefaultAsyncHttpxClient(), **self._client_options())
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
+    async def _aopen(self, deadline: float, request: Dict[str, Any]):
+        for attempt in itertools.count():
+            remaining = self._admit(deadline)
+            try:
+                return await self.client.chat.completions.create(
+                    timeout=self._attempt_timeout(remaining), **request
+                )
+            except Exception as exc:  # noqa: BLE001 - classified in _retry_delay
+                delay = self._retry_delay(exc, attempt, deadline)
+                await self._async_sleep(delay)
+
+    async def create(self, **request: Any):
+        response = await self._aopen(self._clock() + self.config.model_deadline, request)
+        self.breaker.record_success()
+        return response
+
+    async def stream(self, **request: Any) -> AsyncIterator[Any]:
+        """Async :meth:`ModelTransport.stream`; each read is also bounded by the time left."""
+
+        deadline = self._clock() + self.config.model_deadline
+        response = await self._aopen(deadline, dict(request, stream=True))
+        chunks = response.__aiter__()
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), self._remaining(deadline))
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise ModelCallError(
+                        f"Model call exceeded its {self.config.model_deadline:g}s deadline"
+                    ) from None
+                yield chunk
+        except ModelCallError:
+            self.breaker.record_failure()
+            raise
+        except Exception as exc:  # noqa: BLE001 - read errors and API errors mid-stream
+            self.breaker.record_failure()
+            raise ModelCallError(f"Model response stream failed: {exc}") from exc
+        except BaseException:
+            self.breaker.record_success()
+            raise
+        finally:
+            # Closing releases the connection even when the turn was cancelled mid-stream.
+            close = getattr(response, "close", None)
+            if close is not None:
+                await close()
+        self.breaker.record_success()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Iterable, List, Optional
+
+from .agent.tool_executor import ToolCall, ToolExecutor
+from .agent.tools_registry import FIX_TOOL_NAMES, get_tools_registry
+from .config import Config
+from .tools.table import json_default
+from .utils.logging_utils import setup_logging
+
+
+REPORT_FORMATS = ("json", "ndjson")
+# Derived from the other tools' results below instead of collecting them twice.
+DERIVED_TOOLS = {"get_anomalies"}
+# Reports describe the local host only.
+REMOTE_TOOLS = {"run_remote_diagnostics"}
+
+
+def collect_report(config: Config, tool_names: Optional[Iterable[str]] = None) -> dict:
+    """Run every read-only tool concurrently and return a single structured report."""
+
+    logger = setup_logging()
+    registry = get_tools_registry(config)
+    names = [name for name in (tool_names or registry) if name not in FIX_TOOL_NAMES | DERIVED_TOOLS | REMOTE_TOOLS]
+    executor = ToolExecutor(
+        registry,
+        logger,
+        max_workers=max(1, len(names)),
+        default_timeout=config.tool_timeout,
+    )
+
+    started = time.perf_counter()
+    batch = executor.start_batch()
+    for name in names:
+        batch.add(ToolCall(id=name, name=name))
+
+    tools = {}
+    for call, result, seconds in batch.timed_results():
+        tools[call.name] = {**result.to_dict(), "duration_ms": round(seconds * 1000, 1)}
+    executor.shutdown()
+
+    report = {
+        "host": platform.node(),
+        "collected_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "tools": tools,
+    }
+    if config.baseline_db_path:
+        from .tools.anomalies import open_store, record_and_diff
+
+        store = open_store(config)
+        results = {name: entry["data"] for name, entry in tools.items() if entry["success"]}
+        report["anomalies"] = record_and_diff(store, config, results, host=report["host"])
+    return report
+
+
+def _report_lines(report: dict, fmt: str) -> List[str]:
+    if fmt == "json":
+        return [json.dumps(report, default=json_default)]
+
+    header = {key: value for key, value in report.items() if key != "tools"}
+    lines = [json.dumps({"type": "report", **header}, default=json_default)]
+    for name, entry in report["tools"].items():
+        lines.append(json.dumps({"type": "tool", "host": report["host"], "tool": name, **entry}, default=json_default))
+    return lines
+
+
+def write_report(report: dict, fmt: str = "json", output: Optional[Path] = None) -> None:
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+
+    lines = _report_lines(report, fmt)
+    if output is None:
+        _write_lines(sys.stdout, lines)
+        sys.stdout.flush()
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as handle:
+        _write_lines(handle, lines)
+
+
+def _write_lines(stream: IO[str], lines: List[str]) -> None:
+    for line in lines:
+        stream.write(line + "\n")
+
+
+def run_collection(config: Config, fmt: str = "json", output: Optional[Path] = None) -> dict:
+    """Headless entry point: collect every diagnostic once and write the report."""
+
+    logger = setup_logging()
+    report = collect_report(config)
+    write_report(report, fmt, output)
+    failed = [name for name, entry in report["tools"].items() if not entry["success"]]
+    logger.info(
+        "Collected %d tools in %.1f ms (%d unsuccessful: %s)",
+        len(report["tools"]),
+        report["duration_ms"],
+        len(failed),
+        ", ".join(failed) or "none",
+    )
+    return report
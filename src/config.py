@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
 
@@ -16,15 +16,106 @@ class Config:
     model_name: str
     mode: str
     confirm_fixes: bool
+    tool_timeout: float = 30.0
+    max_tool_workers: int = 8
+    max_tool_rounds: int = 5
+    stream_responses: bool = True
+    async_runner: bool = False
+    prefetch_tools: List[str] = field(default_factory=list)
+    snapshot_ttls: Dict[str, float] = field(default_factory=dict)
+    sampler_enabled: bool = False
+    sampler_interval: float = 1.0
+    sampler_capacity: int = 300
+    max_concurrent_commands: int = 4
+    tool_result_token_budget: int = 1500
+    history_turns: int = 6
+    history_token_limit: int = 12000
+    metrics_export_path: Optional[Path] = None
+    response_cache_dir: Optional[Path] = None
+    response_cache_ttl: float = 86400.0
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    openai_base_url: Optional[str] = None
+    model_timeout: float = 60.0
+    model_connect_timeout: float = 5.0
+    model_deadline: float = 180.0
+    model_max_retries: int = 3
+    circuit_breaker_threshold: int = 5
+    circuit_breaker_cooldown: float = 30.0
+    baseline_db_path: Optional[Path] = None
+    baseline_window_hours: float = 168.0
+    baseline_record_interval: float = 300.0
+    baseline_retention_days: float = 30.0
+    inventory_cache_path: Optional[Path] = None
+    collector_backend: str = "psutil"
+    remote_hosts: List[str] = field(default_factory=list)
+    remote_token: Optional[str] = None
+    remote_agent_address: str = "127.0.0.1:8765"
+    remote_timeout: float = 30.0
 
     @property
     def allow_fixes(self) -> bool:
         return self.mode.lower() == "allow_fixes"
 
+    @property
+    def remote_fan_out_timeout(self) -> float:
+        """Longest a remote fan-out can take: a connect and a call, plus one retry of both."""
+
+        return 2 * (DEFAULT_REMOTE_CONNECT_TIMEOUT + self.remote_timeout)
+
 
 DEFAULT_MODEL = "gpt-4.1-mini"
 DEFAULT_MODE = "diagnostic_only"
 DEFAULT_CONFIRM_FIXES = True
+DEFAULT_TOOL_TIMEOUT = 30.0
+DEFAULT_MAX_TOOL_WORKERS = 8
+DEFAULT_MAX_TOOL_ROUNDS = 5
+DEFAULT_STREAM_RESPONSES = True
+DEFAULT_PREFETCH_TOOLS = "get_system_overview,get_process_snapshot"
+DEFAULT_SAMPLER_INTERVAL = 1.0
+DEFAULT_SAMPLER_CAPACITY = 300
+DEFAULT_MAX_CONCURRENT_COMMANDS = 4
+DEFAULT_TOOL_RESULT_TOKEN_BUDGET = 1500
+DEFAULT_HISTORY_TURNS = 6
+DEFAULT_HISTORY_TOKEN_LIMIT = 12000
+DEFAULT_RESPONSE_CACHE_TTL = 86400.0
+DEFAULT_RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MODEL_TIMEOUT = 60.0
+DEFAULT_MODEL_CONNECT_TIMEOUT = 5.0
+DEFAULT_MODEL_DEADLINE = 180.0
+DEFAULT_MODEL_MAX_RETRIES = 3
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+DEFAULT_CIRCUIT_BREAKER_COOLDOWN = 30.0
+DEFAULT_BASELINE_DB_NAME = "baseline.sqlite3"
+DEFAULT_BASELINE_WINDOW_HOURS = 168.0
+DEFAULT_BASELINE_RECORD_INTERVAL = 300.0
+DEFAULT_BASELINE_RETENTION_DAYS = 30.0
+DEFAULT_INVENTORY_CACHE_NAME = "inventory.json"
+DEFAULT_COLLECTOR_BACKEND = "psutil"
+DEFAULT_AGENT_PORT = 8765
+DEFAULT_REMOTE_AGENT_ADDRESS = f"127.0.0.1:{DEFAULT_AGENT_PORT}"
+DEFAULT_REMOTE_TIMEOUT = 30.0
+DEFAULT_REMOTE_CONNECT_TIMEOUT = 5.0
+
+
+def user_cache_dir() -> Path:
+    """Per-user directory for state kept between runs, so nothing lands in the working directory."""
+
+    return Path(os.getenv("XDG_CACHE_HOME") or "~/.cache").expanduser() / "ai-system-diagnoser"
+
+
+def _parse_float_map(value: str | None) -> Dict[str, float]:
+    """Parse ``"name=1.5,other=10"`` into a dict, ignoring malformed entries."""
+
+    parsed: Dict[str, float] = {}
+    for item in (value or "").split(","):
+        name, sep, number = item.partition("=")
+        if not sep:
+            continue
+        try:
+            parsed[name.strip()] = float(number)
+        except ValueError:
+            continue
+    return parsed
 
 
 def load_config(env_path: Path | None = None) -> Config:
@@ -44,9 +135,100 @@ def load_config(env_path: Path | None = None) -> Config:
         else confirm_fixes_env.lower() in {"1", "true", "yes"}
     )
 
+    tool_timeout = float(os.getenv("TOOL_TIMEOUT", DEFAULT_TOOL_TIMEOUT))
+    max_tool_workers = int(os.getenv("MAX_TOOL_WORKERS", DEFAULT_MAX_TOOL_WORKERS))
+    max_tool_rounds = int(os.getenv("MAX_TOOL_ROUNDS", DEFAULT_MAX_TOOL_ROUNDS))
+    stream_responses_env = os.getenv("STREAM_RESPONSES")
+    stream_responses = (
+        DEFAULT_STREAM_RESPONSES
+        if stream_responses_env is None
+        else stream_responses_env.lower() in {"1", "true", "yes"}
+    )
+    async_runner = (os.getenv("ASYNC_RUNNER") or "").lower() in {"1", "true", "yes"}
+    # An empty PREFETCH_TOOLS turns the prefetch off.
+    prefetch_env = os.getenv("PREFETCH_TOOLS", DEFAULT_PREFETCH_TOOLS)
+    prefetch_tools = [name.strip() for name in prefetch_env.split(",") if name.strip()]
+    snapshot_ttls = _parse_float_map(os.getenv("SNAPSHOT_TTLS"))
+    sampler_enabled = (os.getenv("SAMPLER_ENABLED") or "").lower() in {"1", "true", "yes"}
+    sampler_interval = float(os.getenv("SAMPLER_INTERVAL", DEFAULT_SAMPLER_INTERVAL))
+    sampler_capacity = int(os.getenv("SAMPLER_CAPACITY", DEFAULT_SAMPLER_CAPACITY))
+    max_concurrent_commands = int(os.getenv("MAX_CONCURRENT_COMMANDS", DEFAULT_MAX_CONCURRENT_COMMANDS))
+    tool_result_token_budget = int(os.getenv("TOOL_RESULT_TOKEN_BUDGET", DEFAULT_TOOL_RESULT_TOKEN_BUDGET))
+    history_turns = int(os.getenv("HISTORY_TURNS", DEFAULT_HISTORY_TURNS))
+    history_token_limit = int(os.getenv("HISTORY_TOKEN_LIMIT", DEFAULT_HISTORY_TOKEN_LIMIT))
+    metrics_export_env = os.getenv("METRICS_EXPORT_PATH")
+    metrics_export_path = Path(metrics_export_env) if metrics_export_env else None
+    response_cache_env = os.getenv("RESPONSE_CACHE_DIR")
+    response_cache_dir = Path(response_cache_env).expanduser() if response_cache_env else None
+    response_cache_ttl = float(os.getenv("RESPONSE_CACHE_TTL", DEFAULT_RESPONSE_CACHE_TTL))
+    response_cache_max_bytes = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", DEFAULT_RESPONSE_CACHE_MAX_BYTES))
+    openai_base_url = os.getenv("OPENAI_BASE_URL") or None
+    model_timeout = float(os.getenv("MODEL_TIMEOUT", DEFAULT_MODEL_TIMEOUT))
+    model_connect_timeout = float(os.getenv("MODEL_CONNECT_TIMEOUT", DEFAULT_MODEL_CONNECT_TIMEOUT))
+    model_deadline = float(os.getenv("MODEL_DEADLINE", DEFAULT_MODEL_DEADLINE))
+    model_max_retries = int(os.getenv("MODEL_MAX_RETRIES", DEFAULT_MODEL_MAX_RETRIES))
+    circuit_breaker_threshold = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", DEFAULT_CIRCUIT_BREAKER_THRESHOLD))
+    circuit_breaker_cooldown = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN", DEFAULT_CIRCUIT_BREAKER_COOLDOWN))
+    # An empty BASELINE_DB_PATH disables the baseline store.
+    baseline_db_env = os.getenv("BASELINE_DB_PATH")
+    if baseline_db_env is None:
+        baseline_db_path = user_cache_dir() / DEFAULT_BASELINE_DB_NAME
+    else:
+        baseline_db_path = Path(baseline_db_env).expanduser() if baseline_db_env else None
+    baseline_window_hours = float(os.getenv("BASELINE_WINDOW_HOURS", DEFAULT_BASELINE_WINDOW_HOURS))
+    baseline_record_interval = float(os.getenv("BASELINE_RECORD_INTERVAL", DEFAULT_BASELINE_RECORD_INTERVAL))
+    baseline_retention_days = float(os.getenv("BASELINE_RETENTION_DAYS", DEFAULT_BASELINE_RETENTION_DAYS))
+    # An empty INVENTORY_CACHE_PATH keeps the hardware inventory in memory only.
+    inventory_cache_env = os.getenv("INVENTORY_CACHE_PATH")
+    if inventory_cache_env is None:
+        inventory_cache_path = user_cache_dir() / DEFAULT_INVENTORY_CACHE_NAME
+    else:
+        inventory_cache_path = Path(inventory_cache_env).expanduser() if inventory_cache_env else None
+    collector_backend = os.getenv("COLLECTOR_BACKEND", DEFAULT_COLLECTOR_BACKEND).lower()
+    # Normalized to host:port by the remote tool, so loading config never imports the protocol module.
+    remote_hosts = [host.strip() for host in os.getenv("REMOTE_HOSTS", "").split(",") if host.strip()]
+    remote_token = os.getenv("REMOTE_TOKEN") or None
+    remote_agent_address = os.getenv("REMOTE_AGENT_ADDRESS", DEFAULT_REMOTE_AGENT_ADDRESS)
+    remote_timeout = float(os.getenv("REMOTE_TIMEOUT", DEFAULT_REMOTE_TIMEOUT))
+
     return Config(
         openai_api_key=openai_api_key,
         model_name=model_name,
         mode=mode,
         confirm_fixes=confirm_fixes,
+        tool_timeout=tool_timeout,
+        max_tool_workers=max_tool_workers,
+        max_tool_rounds=max_tool_rounds,
+        stream_responses=stream_responses,
+        async_runner=async_runner,
+        prefetch_tools=prefetch_tools,
+        snapshot_ttls=snapshot_ttls,
+        sampler_enabled=sampler_enabled,
+        sampler_interval=sampler_interval,
+        sampler_capacity=sampler_capacity,
+        max_concurrent_commands=max_concurrent_commands,
+        tool_result_token_budget=tool_result_token_budget,
+        history_turns=history_turns,
+        history_token_limit=history_token_limit,
+        metrics_export_path=metrics_export_path,
+        response_cache_dir=response_cache_dir,
+        response_cache_ttl=response_cache_ttl,
+        response_cache_max_bytes=response_cache_max_bytes,
+        openai_base_url=openai_base_url,
+        model_timeout=model_timeout,
+        model_connect_timeout=model_connect_timeout,
+        model_deadline=model_deadline,
+        model_max_retries=model_max_retries,
+        circuit_breaker_threshold=circuit_breaker_threshold,
+        circuit_breaker_cooldown=circuit_breaker_cooldown,
+        baseline_db_path=baseline_db_path,
+        baseline_window_hours=baseline_window_hours,
+        baseline_record_interval=baseline_record_interval,
+        baseline_retention_days=baseline_retention_days,
+        inventory_cache_path=inventory_cache_path,
+        collector_backend=collector_backend,
+        remote_hosts=remote_hosts,
+        remote_token=remote_token,
+        remote_agent_address=remote_agent_address,
+        remote_timeout=remote_timeout,
     )
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import logging
+from pathlib import Path
 
 from .agent.conversation import ConversationRunner
-from .config import load_config
+from .collect import REPORT_FORMATS, run_collection
+from .config import Config, load_config
+from .tools.procfs import set_collector_backend
 from .utils.logging_utils import setup_logging
+from .utils.metrics import metrics
+from .utils.shell_utils import set_max_concurrent_commands
 
 
 def parse_args() -> argparse.Namespace:
@@ -12,6 +18,42 @@ def parse_args() -> argparse.Namespace:
     group = parser.add_mutually_exclusive_group()
     group.add_argument("--diagnostic-only", action="store_true", help="Disable fix operations")
     group.add_argument("--allow-fixes", action="store_true", help="Enable fix operations")
+    parser.add_argument(
+        "--async",
+        dest="async_runner",
+        action="store_true",
+        help="Use the event-loop conversation runner (also ASYNC_RUNNER=true)",
+    )
+    parser.add_argument(
+        "--sample",
+        action="store_true",
+        help="Record metrics in a background sampler so tools can report recent trends",
+    )
+    parser.add_argument(
+        "--collect",
+        action="store_true",
+        help="Run every read-only diagnostic once, write a report and exit (no API key needed)",
+    )
+    parser.add_argument(
+        "--format", choices=REPORT_FORMATS, default="json", help="Report format for --collect"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the --collect report here instead of stdout"
+    )
+    parser.add_argument(
+        "--agent",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="HOST:PORT",
+        help="Serve the read-only tools to remote controllers (default address: REMOTE_AGENT_ADDRESS)",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        default=None,
+        help="Write metrics and spans here on exit (.json for OTLP-style JSON, else Prometheus text)",
+    )
     return parser.parse_args()
 
 
@@ -25,10 +67,49 @@ def main():
         config.mode = "diagnostic_only"
 
     logger = setup_logging()
+    set_max_concurrent_commands(config.max_concurrent_commands)
+    set_collector_backend(config.collector_backend)
+
+    if args.metrics:
+        config.metrics_export_path = args.metrics
+    try:
+        _run(args, config, logger)
+    finally:
+        if config.metrics_export_path:
+            metrics.export(config.metrics_export_path)
+            logger.info("Wrote metrics to %s", config.metrics_export_path)
+
+
+def _run(args: argparse.Namespace, config: Config, logger: logging.Logger) -> None:
+    if args.collect:
+        logger.info("Starting ai-system-diagnoser in collect mode")
+        run_collection(config, fmt=args.format, output=args.output)
+        return
+
+    if args.sample:
+        config.sampler_enabled = True
+    if config.sampler_enabled:
+        from .tools.sampler import start_sampler
+
+        start_sampler(interval=config.sampler_interval, capacity=config.sampler_capacity)
+        logger.info("Background sampler running every %.1fs", config.sampler_interval)
+
+    if args.agent is not None:
+        from .remote.agent import run_agent
+
+        logger.info("Starting ai-system-diagnoser in agent mode")
+        run_agent(config, address=args.agent or None, logger=logger)
+        return
+
     logger.info("Starting ai-system-diagnoser in %s mode", config.mode)
     logger.info("Using AI model: %s", config.model_name)
 
-    runner = ConversationRunner(config)
+    if args.async_runner or config.async_runner:
+        from .agent.async_conversation import AsyncConversationRunner
+
+        runner = AsyncConversationRunner(config)
+    else:
+        runner = ConversationRunner(config)
     runner.run_conversation()
 
 
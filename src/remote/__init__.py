@@ -0,0 +1 @@
+"""Remote diagnostics: an agent daemon serving read-only tools and a fan-out controller."""
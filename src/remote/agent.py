@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import ipaddress
+import json
+import logging
+import platform
+import time
+from contextlib import suppress
+from typing import Any, Dict, Optional, Set
+
+from ..agent.tool_executor import ToolCall, ToolExecutor
+from ..agent.tools_registry import FIX_TOOL_NAMES, get_tools_registry
+from ..config import DEFAULT_AGENT_PORT, Config
+from ..tools.base import ToolResult
+from ..utils.logging_utils import setup_logging
+from .protocol import PROTOCOL_VERSION, ProtocolError, encode_frame, parse_address, read_frame
+
+# Fix tools never run remotely, and serving the fan-out tool would let agents call each other.
+NOT_SERVED = FIX_TOOL_NAMES | {"run_remote_diagnostics"}
+HANDSHAKE_TIMEOUT = 10.0
+# Bounds on what one agent takes on, so a flood of connections or requests cannot exhaust it.
+MAX_CONNECTIONS = 64
+MAX_CALLS_PER_CONNECTION = 16
+
+
+def is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+class AgentServer:
+    """Serves this host's read-only tools to controllers over length-prefixed JSON.
+
+    A connection opens with a ``hello`` exchange that carries the shared token.
+    After that the controller may send ``call`` requests without waiting; each
+    response carries the request ``id`` and is written as soon as its tool
+    finishes. Connections beyond ``max_connections`` are closed at once, and a
+    connection with ``max_calls`` requests in flight is not read until one ends.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_AGENT_PORT,
+        token: Optional[str] = None,
+        logger: Optional[logging.Logger] = None,
+        max_connections: int = MAX_CONNECTIONS,
+        max_calls: int = MAX_CALLS_PER_CONNECTION,
+    ):
+        if not token and not is_loopback(host):
+            raise ValueError("REMOTE_TOKEN is required to listen on a non-loopback address")
+        self.host = host
+        self.port = port
+        self.token = token or None
+        self.max_connections = max_connections
+        self.max_calls = max_calls
+        self.logger = logger or setup_logging()
+        registry = get_tools_registry(config)
+        for name in NOT_SERVED & set(registry):
+            del registry[name]
+        self.tool_names = list(registry)
+        self.executor = ToolExecutor(
+            registry,
+            self.logger,
+            max_workers=config.max_tool_workers,
+            default_timeout=config.tool_timeout,
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 asks the OS for a free port; report the one actually bound.
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info("Agent serving %d tools on %s:%d", len(self.tool_names), self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        if self._handlers:
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        self.executor.shutdown()
+
+    async def _send(self, writer: asyncio.StreamWriter, lock: asyncio.Lock, message: Dict[str, Any]) -> None:
+        try:
+            frame = encode_frame(message)
+        except ProtocolError as exc:
+            frame = encode_frame({**message, "success": False, "data": None, "error": str(exc)})
+        async with lock:
+            writer.write(frame)
+            await writer.drain()
+
+    async def _handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> bool:
+        hello = await asyncio.wait_for(read_frame(reader), HANDSHAKE_TIMEOUT)
+        if hello.get("type") != "hello" or hello.get("version") != PROTOCOL_VERSION:
+            error = f"Expected hello for protocol version {PROTOCOL_VERSION}"
+        elif self.token and not hmac.compare_digest(str(hello.get("token") or "").encode(), self.token.encode()):
+            error = "Invalid token"
+        else:
+            info = {"type": "hello", "version": PROTOCOL_VERSION, "host": platform.node(), "tools": self.tool_names}
+            await self._send(writer, lock, info)
+            return True
+        self.logger.warning("Rejected agent connection from %s: %s", writer.get_extra_info("peername"), error)
+        await self._send(writer, lock, {"type": "error", "error": error})
+        return False
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self._handlers) >= self.max_connections:
+            peer = writer.get_extra_info("peername")
+            self.logger.warning("Refusing agent connection from %s: %d already open", peer, len(self._handlers))
+            writer.close()
+            return
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        lock = asyncio.Lock()
+        calls: Set[asyncio.Task] = set()
+        slots = asyncio.Semaphore(self.max_calls)
+
+        def finished(call: asyncio.Task) -> None:
+            calls.discard(call)
+            slots.release()
+
+        try:
+            if not await self._handshake(reader, writer, lock):
+                return
+            while True:
+                await slots.acquire()
+                try:
+                    request = await read_frame(reader)
+                except BaseException:
+                    slots.release()
+                    raise
+                call = asyncio.ensure_future(self._serve(request, writer, lock))
+                calls.add(call)
+                call.add_done_callback(finished)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        except ProtocolError as exc:
+            self.logger.warning("Dropping agent connection from %s: %s", writer.get_extra_info("peername"), exc)
+        finally:
+            for call in list(calls):
+                call.cancel()
+            self._handlers.discard(handler)
+            writer.close()
+            with suppress(Exception):
+                await writer.wait_closed()
+
+    async def _serve(self, request: Dict[str, Any], writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        name = request.get("tool")
+        arguments = request.get("arguments") or {}
+        started = time.perf_counter()
+        if request.get("type") != "call" or name not in self.tool_names:
+            result = ToolResult(success=False, data=None, error=f"Tool not served by this agent: {name}")
+        elif not isinstance(arguments, dict):
+            result = ToolResult(success=False, data=None, error="Tool arguments must be a JSON object")
+        else:
+            batch = self.executor.start_batch()
+            batch.add(ToolCall(id=str(request.get("id")), name=name, arguments=json.dumps(arguments)))
+            [(_, result)] = await asyncio.get_running_loop().run_in_executor(None, batch.results)
+        response = {
+            "type": "result",
+            "id": request.get("id"),
+            **result.to_dict(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        with suppress(ConnectionError):
+            await self._send(writer, lock, response)
+
+
+def run_agent(config: Config, address: Optional[str] = None, logger: Optional[logging.Logger] = None) -> None:
+    """Run the agent daemon until interrupted."""
+
+    logger = logger or setup_logging()
+    host, port = parse_address(address or config.remote_agent_address)
+    server = AgentServer(config, host, port, token=config.remote_token, logger=logger)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("Agent stopped")
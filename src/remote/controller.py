@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import suppress
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config import DEFAULT_REMOTE_CONNECT_TIMEOUT, DEFAULT_REMOTE_TIMEOUT
+from ..utils.metrics import metrics
+from .protocol import PROTOCOL_VERSION, ProtocolError, parse_address, read_frame, write_frame
+
+DEFAULT_CONNECT_TIMEOUT = DEFAULT_REMOTE_CONNECT_TIMEOUT
+DEFAULT_CALL_TIMEOUT = DEFAULT_REMOTE_TIMEOUT
+
+
+class AgentError(Exception):
+    """The agent refused the connection (bad token or protocol version)."""
+
+
+class ConnectTimeout(OSError):
+    """The agent did not accept the connection or finish the handshake in time."""
+
+
+class AgentConnection:
+    """One open connection to an agent; concurrent calls are multiplexed over it by request id."""
+
+    def __init__(self, address: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, info: Dict[str, Any]):
+        self.address = address
+        self.host: str = info.get("host") or address
+        self.tools: List[str] = list(info.get("tools") or [])
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._reader_task = asyncio.ensure_future(self._read_responses())
+
+    @classmethod
+    async def open(cls, address: str, token: Optional[str], timeout: float = DEFAULT_CONNECT_TIMEOUT) -> "AgentConnection":
+        host, port = parse_address(address)
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        except asyncio.TimeoutError:
+            raise ConnectTimeout(f"Could not connect within {timeout:g}s") from None
+        try:
+            await write_frame(writer, {"type": "hello", "version": PROTOCOL_VERSION, "token": token})
+            try:
+                info = await asyncio.wait_for(read_frame(reader), timeout)
+            except asyncio.TimeoutError:
+                raise ConnectTimeout(f"No handshake within {timeout:g}s") from None
+            if info.get("type") != "hello":
+                raise AgentError(info.get("error") or "Handshake rejected")
+        except BaseException:
+            writer.close()
+            raise
+        return cls(address, reader, writer, info)
+
+    @property
+    def closed(self) -> bool:
+        return self._reader_task.done()
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                message = await read_frame(self._reader)
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Connection to {self.address} closed"))
+            self._pending.clear()
+            self._writer.close()
+
+    async def call(self, tool: str, arguments: Dict[str, Any], timeout: float = DEFAULT_CALL_TIMEOUT) -> Dict[str, Any]:
+        if self.closed:
+            raise ConnectionError(f"Connection to {self.address} closed")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            async with self._write_lock:
+                await write_frame(self._writer, {"type": "call", "id": request_id, "tool": tool, "arguments": arguments})
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def close(self) -> None:
+        self._reader_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._reader_task
+        with suppress(Exception):
+            await self._writer.wait_closed()
+
+
+class AgentPool:
+    """Keeps one open connection per agent address and fans tool calls out over them."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        call_timeout: float = DEFAULT_CALL_TIMEOUT,
+    ):
+        self.token = token
+        self.connect_timeout = connect_timeout
+        self.call_timeout = call_timeout
+        self._connections: Dict[str, AgentConnection] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def connection(self, address: str) -> AgentConnection:
+        lock = self._locks.setdefault(address, asyncio.Lock())
+        async with lock:
+            connection = self._connections.get(address)
+            if connection is None or connection.closed:
+                connection = await AgentConnection.open(address, self.token, self.connect_timeout)
+                self._connections[address] = connection
+            return connection
+
+    async def call(self, address: str, tool: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run ``tool`` on one agent; failures are reported in the entry, never raised."""
+
+        started = time.perf_counter()
+        entry: Dict[str, Any] = {"address": address, "host": None}
+        with metrics.span("remote_call", agent=address, tool=tool) as span:
+            # A pooled connection may have been dropped since its last use; the
+            # tools are read-only, so one retry on a fresh connection is safe.
+            for attempt in range(2):
+                try:
+                    connection = await self.connection(address)
+                    entry["host"] = connection.host
+                    response = await connection.call(tool, arguments or {}, self.call_timeout)
+                except ConnectionError as exc:
+                    if attempt == 0:
+                        continue
+                    error = f"{type(exc).__name__}: {exc}"
+                except asyncio.TimeoutError:
+                    error = f"Agent did not answer within {self.call_timeout:g}s"
+                except (OSError, AgentError, ProtocolError) as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                else:
+                    entry.update(success=bool(response.get("success")), data=response.get("data"))
+                    entry["error"] = response.get("error")
+                    break
+                entry.update(success=False, data=None, error=error)
+                break
+            if not entry["success"]:
+                span.status = "error"
+        entry["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return entry
+
+    async def fan_out(
+        self, addresses: Iterable[str], tool: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return list(await asyncio.gather(*(self.call(address, tool, arguments) for address in addresses)))
+
+    async def close(self) -> None:
+        connections, self._connections = list(self._connections.values()), {}
+        await asyncio.gather(*(connection.close() for connection in connections), return_exceptions=True)
+
+
+def aggregate(tool: str, entries: List[Dict[str, Any]], duration_ms: float) -> Dict[str, Any]:
+    failed = [entry["address"] for entry in entries if not entry["success"]]
+    return {
+        "tool": tool,
+        "hosts": entries,
+        "succeeded": len(entries) - len(failed),
+        "failed": failed,
+        "duration_ms": duration_ms,
+    }
+
+
+class RemoteController:
+    """Synchronous front end to an :class:`AgentPool` running on its own event loop.
+
+    Tools run in worker threads, each of which would otherwise get a fresh event
+    loop; a dedicated loop thread lets pooled connections outlive single calls.
+    """
+
+    def __init__(
+        self,
+        addresses: Iterable[str],
+        token: Optional[str] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        call_timeout: float = DEFAULT_CALL_TIMEOUT,
+    ):
+        self.addresses = list(addresses)
+        self.pool = AgentPool(token, connect_timeout, call_timeout)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._run_loop, args=(self._loop,), name="remote-agents", daemon=True).start()
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def run(
+        self, tool: str, arguments: Optional[Dict[str, Any]] = None, addresses: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Run ``tool`` on every agent (or ``addresses``) concurrently and aggregate the results."""
+
+        started = time.perf_counter()
+        future = asyncio.run_coroutine_threadsafe(
+            self.pool.fan_out(list(addresses or self.addresses), tool, arguments), self._ensure_loop()
+        )
+        entries = future.result()
+        return aggregate(tool, entries, round((time.perf_counter() - started) * 1000, 1))
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.pool.close(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
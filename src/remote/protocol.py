@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+from typing import Any, Dict, List, Tuple
+
+from ..config import DEFAULT_AGENT_PORT
+from ..tools.table import json_default
+
+PROTOCOL_VERSION = 1
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+# Every frame is a 4-byte big-endian payload length followed by one UTF-8 JSON object.
+HEADER = struct.Struct("!I")
+
+
+class ProtocolError(Exception):
+    """The peer sent something that is not a valid frame for this protocol."""
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    payload = json.dumps(message, default=json_default, separators=(",", ":")).encode("utf-8")
+    if len(payload) > MAX_FRAME_BYTES:
+        raise ProtocolError(f"Frame of {len(payload)} bytes exceeds {MAX_FRAME_BYTES}")
+    return HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """Read one message; raises ``asyncio.IncompleteReadError`` when the peer closes."""
+
+    (length,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ProtocolError(f"Frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+    try:
+        message = json.loads(await reader.readexactly(length))
+    except ValueError as exc:
+        raise ProtocolError(f"Invalid frame: {exc}") from exc
+    if not isinstance(message, dict):
+        raise ProtocolError("Frame must hold a JSON object")
+    return message
+
+
+async def write_frame(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+    writer.write(encode_frame(message))
+    await writer.drain()
+
+
+def parse_address(address: str, default_port: int = DEFAULT_AGENT_PORT) -> Tuple[str, int]:
+    """``"host"``, ``"host:port"`` or ``"[v6]:port"`` -> ``(host, port)``."""
+
+    address = address.strip()
+    if address.startswith("["):
+        host, _, rest = address[1:].partition("]")
+        port = rest.lstrip(":")
+    elif address.count(":") == 1:
+        host, _, port = address.partition(":")
+    else:
+        host, port = address, ""
+    if not host:
+        raise ValueError(f"Invalid agent address: {address!r}")
+    return host, int(port) if port else default_port
+
+
+def parse_addresses(value: str | None) -> List[str]:
+    """Comma-separated agent addresses, normalized to ``host:port``."""
+
+    addresses = []
+    for item in (value or "").split(","):
+        if item.strip():
+            host, port = parse_address(item)
+            addresses.append(f"[{host}]:{port}" if ":" in host else f"{host}:{port}")
+    return addresses
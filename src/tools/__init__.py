@@ -1,22 +1,50 @@
+"""Diagnostic and fix tools.
+
+Tool classes are imported on first attribute access so that importing the
+package (or :mod:`tools.base`) does not pull in psutil and every tool module.
+"""
+
+from importlib import import_module
+
 from .base import BaseTool, ToolResult
-from .disk_health import DiskHealthTool
-from .event_logs import EventLogsTool
-from .fixes import DisableStartupItemTool, RestartServiceTool, SystemFileCheckTool
-from .network import NetworkDiagnosticsTool
-from .processes import ProcessSnapshotTool
-from .system_overview import SystemOverviewTool
-from .temperatures import TemperatureTool
+
+_TOOL_MODULES = {
+    "AnomaliesTool": ".anomalies",
+    "DiskHealthTool": ".disk_health",
+    "EventLogsTool": ".event_logs",
+    "HardwareInventoryTool": ".inventory",
+    "RestartServiceTool": ".fixes",
+    "SystemFileCheckTool": ".fixes",
+    "DisableStartupItemTool": ".fixes",
+    "NetworkDiagnosticsTool": ".network",
+    "ProcessSnapshotTool": ".processes",
+    "RemoteDiagnosticsTool": ".remote",
+    "SystemOverviewTool": ".system_overview",
+    "TemperatureTool": ".temperatures",
+}
 
 __all__ = [
     "BaseTool",
     "ToolResult",
+    "AnomaliesTool",
     "DiskHealthTool",
     "EventLogsTool",
+    "HardwareInventoryTool",
     "RestartServiceTool",
     "SystemFileCheckTool",
     "DisableStartupItemTool",
     "NetworkDiagnosticsTool",
     "ProcessSnapshotTool",
+    "RemoteDiagnosticsTool",
     "SystemOverviewTool",
     "TemperatureTool",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
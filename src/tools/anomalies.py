@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import platform
+from typing import Any, Dict, Optional
+
+from ..config import Config
+from .base import BaseTool, ToolResult
+from .baseline import DEFAULT_Z_THRESHOLD, BaselineStore, extract_metrics
+from .disk_health import DiskHealthTool
+from .processes import ProcessSnapshotTool
+from .system_overview import SystemOverviewTool
+
+PROCESS_LIMIT = 15
+
+
+def open_store(config: Config) -> Optional[BaselineStore]:
+    return BaselineStore(config.baseline_db_path) if config.baseline_db_path else None
+
+
+def record_and_diff(
+    store: BaselineStore,
+    config: Config,
+    results: Dict[str, Any],
+    host: Optional[str] = None,
+    z_threshold: float = DEFAULT_Z_THRESHOLD,
+) -> Dict[str, Any]:
+    """Diff tool results against the host's baseline, then add them to it."""
+
+    host = host or platform.node()
+    metrics = extract_metrics(results)
+    diff = store.diff(host, metrics, window_hours=config.baseline_window_hours, z_threshold=z_threshold)
+    store.record(
+        host,
+        metrics,
+        min_interval=config.baseline_record_interval,
+        retention_days=config.baseline_retention_days,
+    )
+    return {"host": host, "metrics_compared": len(metrics), **diff}
+
+
+class AnomaliesTool(BaseTool):
+    name = "get_anomalies"
+    description = (
+        "Compare current CPU, memory, disk and top-process metrics with this host's rolling "
+        "baseline and return only the metrics that deviate from normal."
+    )
+    parameters_schema = {
+        "type": "object",
+        "properties": {
+            "z_threshold": {
+                "type": "number",
+                "description": "Standard deviations from the baseline mean that count as anomalous",
+                "default": DEFAULT_Z_THRESHOLD,
+            }
+        },
+        "required": [],
+    }
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._overview = SystemOverviewTool(config)
+        self._processes = ProcessSnapshotTool()
+        self._disks = DiskHealthTool()
+
+    def run(self, z_threshold: float = DEFAULT_Z_THRESHOLD) -> ToolResult:
+        store = open_store(self.config)
+        if store is None:
+            return ToolResult(success=False, data={}, error="Baseline store disabled; set BASELINE_DB_PATH")
+
+        sources = {
+            "get_system_overview": self._overview.run(),
+            "get_process_snapshot": self._processes.run(limit=PROCESS_LIMIT),
+            "get_disk_health": self._disks.run(include_smart=False),
+        }
+        results = {name: result.data for name, result in sources.items() if result.success}
+        return ToolResult(success=True, data=record_and_diff(store, self.config, results, z_threshold=z_threshold))
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Dict
 
+from ..utils.shell_utils import run_sync
+
 
 @dataclass
 class ToolResult:
@@ -10,6 +13,9 @@ class ToolResult:
     data: Any
     error: str | None = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {"success": self.success, "data": self.data, "error": self.error}
+
 
 class BaseTool:
     name: str
@@ -18,3 +24,27 @@ class BaseTool:
 
     def run(self, **kwargs) -> ToolResult:  # pragma: no cover - interface
         raise NotImplementedError
+
+    async def arun(self, **kwargs) -> ToolResult:
+        """Run without blocking the event loop.
+
+        Synchronous tools run in a worker thread; cancelling the caller stops
+        waiting for them but cannot interrupt the thread itself.
+        """
+        return await asyncio.to_thread(self.run, **kwargs)
+
+    def close(self) -> None:
+        """Release anything held between calls; called when the session ends."""
+
+
+class AsyncTool(BaseTool):
+    """Base for tools implemented as coroutines, so cancellation reaches their I/O.
+
+    Subclasses override :meth:`arun`; :meth:`run` drives it for synchronous callers.
+    """
+
+    async def arun(self, **kwargs) -> ToolResult:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def run(self, **kwargs) -> ToolResult:
+        return run_sync(self.arun(**kwargs))
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .table import Table
+
+DEFAULT_WINDOW_HOURS = 7 * 24.0
+DEFAULT_RETENTION_DAYS = 30.0
+DEFAULT_RECORD_INTERVAL = 300.0
+DEFAULT_Z_THRESHOLD = 3.0
+MIN_SAMPLES = 5
+# Changes smaller than this are never reported, however tight the baseline.
+NOISE_FRACTION = 0.05
+NOISE_FLOOR = 1.0
+# A flat baseline has no spread, so fall back to a relative change threshold.
+MIN_RELATIVE_CHANGE = 0.25
+MAX_NEW_METRICS = 10
+# Process metrics are only recorded while the process ranks in the snapshot's top N,
+# so a baseline built from a fraction of the snapshots is skewed towards busy periods.
+PARTIAL_METRIC_PREFIXES = ("process.",)
+MIN_PARTIAL_COVERAGE = 0.8
+_QUERY_CHUNK = 500
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS samples"
+    " (host TEXT NOT NULL, metric TEXT NOT NULL, ts REAL NOT NULL, value REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS samples_host_metric_ts ON samples (host, metric, ts)",
+    "CREATE TABLE IF NOT EXISTS snapshots (host TEXT NOT NULL, ts REAL NOT NULL, PRIMARY KEY (host, ts))",
+)
+
+_initialized: Set[Path] = set()
+_initialized_lock = threading.Lock()
+
+
+def _overview_metrics(data: Dict[str, Any]) -> Dict[str, float]:
+    metrics = {
+        "cpu.usage_percent": (data.get("cpu") or {}).get("usage_percent"),
+        "ram.usage_percent": (data.get("ram") or {}).get("usage_percent"),
+    }
+    for disk in data.get("disks") or []:
+        metrics[f"disk.{disk['device']}.usage_percent"] = disk.get("usage_percent")
+    return metrics
+
+
+def _process_metrics(data: Table) -> Dict[str, float]:
+    # Processes come and go by pid, so aggregate by name.
+    metrics: Dict[str, float] = {}
+    for process in data.records():
+        name = process.get("name") or "unknown"
+        for field in ("cpu_percent", "memory_mb"):
+            key = f"process.{name}.{field}"
+            metrics[key] = metrics.get(key, 0.0) + (process.get(field) or 0.0)
+    return metrics
+
+
+def _disk_io_metrics(data: Dict[str, Any]) -> Dict[str, float]:
+    metrics: Dict[str, float] = {}
+    for drive in data.get("drives") or []:
+        for field, value in (drive.get("io") or {}).items():
+            metrics[f"diskio.{drive['device']}.{field}"] = value
+    return metrics
+
+
+METRIC_EXTRACTORS: Dict[str, Callable[[Any], Dict[str, float]]] = {
+    "get_system_overview": _overview_metrics,
+    "get_process_snapshot": _process_metrics,
+    "get_disk_health": _disk_io_metrics,
+}
+
+
+def extract_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten tool ``data`` (keyed by tool name) into numeric ``metric -> value`` pairs."""
+
+    metrics: Dict[str, float] = {}
+    for tool_name, data in results.items():
+        extractor = METRIC_EXTRACTORS.get(tool_name)
+        if extractor is None or data is None:
+            continue
+        for metric, value in extractor(data).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                metrics[metric] = float(value)
+    return metrics
+
+
+class BaselineStore:
+    """SQLite store of per-host metric samples with a rolling-baseline diff.
+
+    Samples are indexed by ``(host, metric, ts)`` so a diff only touches the rows
+    of the metrics being compared inside the baseline window.
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self._clock = clock
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        # Stores are opened per call; create the schema once per database file.
+        key = self.path.resolve()
+        with _initialized_lock:
+            if key in _initialized and self.path.exists():
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in SCHEMA:
+                    conn.execute(statement)
+            _initialized.add(key)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def last_recorded(self, host: str) -> Optional[float]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT MAX(ts) FROM snapshots WHERE host = ?", (host,)).fetchone()
+        return row[0]
+
+    def record(
+        self,
+        host: str,
+        metrics: Dict[str, float],
+        min_interval: float = 0.0,
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+    ) -> bool:
+        """Store one snapshot unless the host's last one is newer than ``min_interval`` seconds."""
+
+        now = self._clock()
+        last = self.last_recorded(host)
+        if not metrics or (last is not None and now - last < min_interval):
+            return False
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR IGNORE INTO snapshots (host, ts) VALUES (?, ?)", (host, now))
+            conn.executemany(
+                "INSERT INTO samples (host, metric, ts, value) VALUES (?, ?, ?, ?)",
+                [(host, metric, now, value) for metric, value in metrics.items()],
+            )
+            cutoff = now - retention_days * 86400
+            conn.execute("DELETE FROM samples WHERE host = ? AND ts < ?", (host, cutoff))
+            conn.execute("DELETE FROM snapshots WHERE host = ? AND ts < ?", (host, cutoff))
+        return True
+
+    def baselines(self, host: str, metrics: Iterable[str], window_hours: float) -> Dict[str, Dict[str, float]]:
+        """Count, mean and standard deviation per metric over the window."""
+
+        since = self._clock() - window_hours * 3600
+        names = list(metrics)
+        stats: Dict[str, Dict[str, float]] = {}
+        with closing(self._connect()) as conn:
+            for start in range(0, len(names), _QUERY_CHUNK):
+                chunk = names[start : start + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    "SELECT metric, COUNT(*), AVG(value), AVG(value * value) FROM samples"
+                    f" WHERE host = ? AND metric IN ({placeholders}) AND ts >= ? GROUP BY metric",
+                    (host, *chunk, since),
+                )
+                for metric, count, mean, mean_square in rows:
+                    variance = max(0.0, mean_square - mean * mean)
+                    stats[metric] = {"samples": count, "mean": mean, "stddev": math.sqrt(variance)}
+        return stats
+
+    def snapshot_count(self, host: str, window_hours: float) -> int:
+        since = self._clock() - window_hours * 3600
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM snapshots WHERE host = ? AND ts >= ?", (host, since)
+            ).fetchone()[0]
+
+    def diff(
+        self,
+        host: str,
+        current: Dict[str, float],
+        window_hours: float = DEFAULT_WINDOW_HOURS,
+        z_threshold: float = DEFAULT_Z_THRESHOLD,
+        min_samples: int = MIN_SAMPLES,
+    ) -> Dict[str, Any]:
+        """Only the metrics that deviate from the host's rolling baseline, largest first.
+
+        ``new_metrics`` lists the biggest metrics never seen in the window (for
+        example a process that was not running before), once the host has history.
+        Process metrics are only judged when they were recorded in most snapshots.
+        """
+
+        stats = self.baselines(host, current, window_hours)
+        snapshots = self.snapshot_count(host, window_hours)
+        anomalies = []
+        for metric, value in current.items():
+            baseline = stats.get(metric)
+            if baseline is None or baseline["samples"] < min_samples:
+                continue
+            if metric.startswith(PARTIAL_METRIC_PREFIXES) and baseline["samples"] < snapshots * MIN_PARTIAL_COVERAGE:
+                continue
+            mean, stddev = baseline["mean"], baseline["stddev"]
+            delta = value - mean
+            if abs(delta) <= max(abs(mean) * NOISE_FRACTION, NOISE_FLOOR):
+                continue
+            if stddev > 1e-6 * max(1.0, abs(mean)):
+                score = delta / stddev
+                deviating = abs(score) >= z_threshold
+            else:
+                score = None
+                deviating = abs(delta) > abs(mean) * MIN_RELATIVE_CHANGE
+            if deviating:
+                anomalies.append(
+                    {
+                        "metric": metric,
+                        "value": round(value, 2),
+                        "baseline_mean": round(mean, 2),
+                        "baseline_stddev": round(stddev, 2),
+                        "z_score": round(score, 1) if score is not None else None,
+                        "samples": baseline["samples"],
+                    }
+                )
+        anomalies.sort(key=lambda item: abs(item["z_score"] or float("inf")), reverse=True)
+
+        new_metrics: List[str] = []
+        if snapshots >= min_samples:
+            unseen = [metric for metric in current if metric not in stats and current[metric] > 0]
+            new_metrics = sorted(unseen, key=current.get, reverse=True)[:MAX_NEW_METRICS]
+        return {
+            "baseline_snapshots": snapshots,
+            "anomalies": anomalies,
+            "new_metrics": {metric: round(current[metric], 2) for metric in new_metrics},
+        }
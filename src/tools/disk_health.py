@@ -1,53 +1,204 @@
 from __future__ import annotations
 
-import psutil
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 from .base import BaseTool, ToolResult
-from ..utils.os_detect import is_windows
+from .linux_disks import (
+    DiskStat,
+    block_devices,
+    device_info,
+    io_deltas,
+    read_diskstats,
+    read_smart,
+    smartctl_available,
+)
+from .snapshot_cache import snapshot_cache
+from .snapshots import disk_usages
+from ..utils.os_detect import is_linux, is_windows
 from ..utils.shell_utils import run_command
 
+# Used only when there is no earlier sample to diff against.
+IO_SAMPLE_INTERVAL = 0.1
+MIN_IO_WINDOW = 1.0
+MAX_SMART_WORKERS = 8
+
+GET_PHYSICAL_DISK = (
+    "Get-PhysicalDisk | Select-Object FriendlyName,Size,MediaType,HealthStatus,OperationalStatus"
+    " | ConvertTo-Json -Compress"
+)
+
+
+class _SmartFailure(Exception):
+    """Carries a failed SMART read out of the cache loader so it is not cached."""
+
+    def __init__(self, result: dict):
+        super().__init__(result.get("error"))
+        self.result = result
+
 
 class DiskHealthTool(BaseTool):
     name = "get_disk_health"
-    description = "Fetch SMART/health status for attached disks."
-    parameters_schema: dict = {"type": "object", "properties": {}, "required": []}
+    description = "Fetch SMART/health status and I/O latency for attached disks."
+    parameters_schema: dict = {
+        "type": "object",
+        "properties": {
+            "include_smart": {
+                "type": "boolean",
+                "description": "Query SMART health (cached per device)",
+                "default": True,
+            }
+        },
+        "required": [],
+    }
+
+    def __init__(self):
+        self._previous: Optional[Tuple[float, Dict[str, DiskStat]]] = None
+        self._last_io: Optional[Tuple[Dict[str, Dict[str, float]], float]] = None
+        self._lock = threading.Lock()
 
-    def run(self) -> ToolResult:
+    def run(self, include_smart: bool = True) -> ToolResult:
         if is_windows():
-            success, stdout, stderr = run_command(
-                ["wmic", "diskdrive", "get", "Status,Model,Size", "/format:csv"]
-            )
-            if not success:
-                return ToolResult(success=False, data={}, error=stderr or "Unable to query disk health")
-
-            drives = []
-            for line in stdout.splitlines():
-                if not line or line.lower().startswith("node,"):
-                    continue
-                parts = [p.strip() for p in line.split(",")]
-                if len(parts) < 4:
-                    continue
-                _, model, size, status = parts
-                try:
-                    size_gb = round(int(size) / (1024 ** 3), 2)
-                except ValueError:
-                    size_gb = 0
-                drives.append({"model": model, "size_gb": size_gb, "status": status or "Unknown"})
-
-            return ToolResult(success=True, data={"drives": drives})
-
-        # Fallback for non-Windows systems: provide high-level disk info
+            return self._run_windows()
+        if is_linux():
+            devices = block_devices()
+            if devices:
+                return self._run_linux(devices, include_smart)
+        return self._run_fallback()
+
+    def _sample_io(self, devices: List[str]) -> Tuple[Dict[str, Dict[str, float]], float]:
+        """I/O deltas since the previous call (or over a short interval on the first call).
+
+        Calls closer together than ``MIN_IO_WINDOW`` reuse the last deltas rather than
+        reporting rates over a few milliseconds.
+        """
+
+        with self._lock:
+            if self._last_io is not None and time.monotonic() - self._previous[0] < MIN_IO_WINDOW:
+                return self._last_io
+            previous = self._previous
+            if previous is None:
+                previous = (time.monotonic(), read_diskstats(devices))
+                time.sleep(IO_SAMPLE_INTERVAL)
+            now, current = time.monotonic(), read_diskstats(devices)
+            elapsed = max(now - previous[0], 1e-3)
+            deltas = {
+                name: io_deltas(previous[1][name], stat, elapsed)
+                for name, stat in current.items()
+                if name in previous[1]
+            }
+            self._previous = (now, current)
+            self._last_io = (deltas, elapsed)
+            return self._last_io
+
+    def _smart(self, devices: List[str]) -> Dict[str, dict]:
+        """SMART health per device, queried in parallel and cached under the ``smart`` TTL.
+
+        Failures (a smartctl timeout, say) are returned but not cached, so the
+        next call queries the drive again instead of repeating a stale error.
+        """
+
+        def read(device: str) -> dict:
+            health = read_smart(device)
+            if "error" in health:
+                raise _SmartFailure(health)
+            return health
+
+        def load(device: str) -> dict:
+            try:
+                return snapshot_cache.get("smart", lambda: read(device), key=device)
+            except _SmartFailure as failure:
+                return failure.result
+
+        workers = min(MAX_SMART_WORKERS, len(devices))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smart") as pool:
+            return dict(zip(devices, pool.map(load, devices)))
+
+    def _run_linux(self, devices: List[str], include_smart: bool) -> ToolResult:
+        io, window = self._sample_io(devices)
+        drives = [device_info(name) for name in devices]
+
+        notes = []
+        smart: Dict[str, dict] = {}
+        physical = [drive["device"] for drive in drives if drive["physical"]]
+        if include_smart and physical:
+            if smartctl_available():
+                smart = self._smart(physical)
+            else:
+                notes.append("smartctl not installed; SMART status unavailable")
+
+        for drive in drives:
+            health = smart.get(drive["device"], {})
+            drive["status"] = health.get("status", "Unknown")
+            if health:
+                drive["smart"] = {key: value for key, value in health.items() if key != "status"}
+            if drive["device"] in io:
+                drive["io"] = io[drive["device"]]
+
+        return ToolResult(
+            success=True,
+            data={"drives": drives, "io_window_seconds": round(window, 2)},
+            error="; ".join(notes) or None,
+        )
+
+    def _run_windows(self) -> ToolResult:
+        success, stdout, _ = run_command(
+            ["powershell", "-NoProfile", "-Command", GET_PHYSICAL_DISK], max_output_bytes=None
+        )
+        if success and stdout:
+            try:
+                disks = json.loads(stdout)
+            except ValueError:
+                disks = None
+            if disks is not None:
+                if isinstance(disks, dict):
+                    disks = [disks]
+                drives = [
+                    {
+                        "model": disk.get("FriendlyName") or "Unknown",
+                        "size_gb": round(int(disk.get("Size") or 0) / (1024 ** 3), 2),
+                        "media_type": disk.get("MediaType"),
+                        "status": disk.get("HealthStatus") or "Unknown",
+                        "operational_status": disk.get("OperationalStatus"),
+                    }
+                    for disk in disks
+                ]
+                return ToolResult(success=True, data={"drives": drives})
+        return self._run_wmic()
+
+    def _run_wmic(self) -> ToolResult:
+        # wmic is deprecated and missing on newer Windows builds; only used when Get-PhysicalDisk fails.
+        success, stdout, stderr = run_command(["wmic", "diskdrive", "get", "Status,Model,Size", "/format:csv"])
+        if not success:
+            return ToolResult(success=False, data={}, error=stderr or "Unable to query disk health")
+
+        drives = []
+        for line in stdout.splitlines():
+            if not line or line.lower().startswith("node,"):
+                continue
+            parts = [p.strip() for p in line.split(",")]
+            if len(parts) < 4:
+                continue
+            _, model, size, status = parts
+            try:
+                size_gb = round(int(size) / (1024 ** 3), 2)
+            except ValueError:
+                size_gb = 0
+            drives.append({"model": model, "size_gb": size_gb, "status": status or "Unknown"})
+
+        return ToolResult(success=True, data={"drives": drives})
+
+    def _run_fallback(self) -> ToolResult:
         drives = []
         seen_devices = set()
-        for part in psutil.disk_partitions(all=False):
+        for part, usage in disk_usages():
             if part.device in seen_devices:
                 continue
             seen_devices.add(part.device)
-            try:
-                usage = psutil.disk_usage(part.mountpoint)
-                size_gb = round(usage.total / (1024 ** 3), 2)
-            except PermissionError:
-                size_gb = 0
+            size_gb = round(usage.total / (1024 ** 3), 2) if usage is not None else 0
             drives.append({"model": part.device, "size_gb": size_gb, "status": "Unknown"})
 
         return ToolResult(success=True, data={"drives": drives}, error="SMART status not available on this platform")
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import json
+import re
+from datetime import datetime, timedelta
+from typing import Optional
 
 from .base import BaseTool, ToolResult
-from ..utils.os_detect import is_windows
+from .linux_logs import PRIORITIES, FileCursor, find_syslog, read_journal, read_syslog
+from .log_reader import StopReading, tail_matching
+from ..utils.logging_utils import DEFAULT_LOG_PATH
+from ..utils.os_detect import is_linux, is_windows
 from ..utils.shell_utils import run_command
 
 
+# Windows event levels: 1 Critical, 2 Error, 3 Warning, 4 Information, 5 Verbose.
+_WINDOWS_LEVELS = {0: 1, 1: 1, 2: 1, 3: 2, 4: 3, 5: 4, 6: 4, 7: 5}
+_LOGGING_PRIORITIES = {"CRITICAL": 2, "ERROR": 3, "WARNING": 4, "INFO": 6, "DEBUG": 7}
+# Matches the format configured in utils.logging_utils.setup_logging.
+_APP_LOG_LINE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(\w+)\] (\S+) - (.*)$")
+
+
 class EventLogsTool(BaseTool):
     name = "get_recent_system_errors"
     description = "Fetch recent error-level events from system logs."
@@ -17,27 +30,137 @@ class EventLogsTool(BaseTool):
                 "type": "integer",
                 "description": "Maximum number of events to return",
                 "default": 50,
-            }
+            },
+            "since_minutes": {
+                "type": "integer",
+                "description": "Only include events from the last N minutes",
+                "default": 1440,
+            },
+            "min_priority": {
+                "type": "string",
+                "enum": list(PRIORITIES),
+                "description": "Least severe priority to include",
+                "default": "err",
+            },
+            "only_new": {
+                "type": "boolean",
+                "description": (
+                    "Only return events logged since the previous call; if more than limit "
+                    "arrived, the older ones are skipped and the result is marked truncated"
+                ),
+                "default": False,
+            },
+            "source": {
+                "type": "string",
+                "enum": ["system", "diagnoser"],
+                "description": "Read the OS logs or this assistant's own log file",
+                "default": "system",
+            },
         },
         "required": [],
     }
 
-    def run(self, limit: int = 50) -> ToolResult:
-        if not is_windows():
-            return ToolResult(success=False, data=[], error="Event log inspection is only supported on Windows")
+    def __init__(self):
+        self._journal_cursor: Optional[str] = None
+        self._syslog_cursor: Optional[FileCursor] = None
+        self._windows_record_id = 0
 
+    def _run_windows(self, limit: int, since_minutes: int, max_priority: int, only_new: bool) -> ToolResult:
+        levels = sorted({level for priority, level in _WINDOWS_LEVELS.items() if priority <= max_priority})
+        level_filter = " or ".join(f"Level={level}" for level in levels)
+        record_filter = f" and EventRecordID > {self._windows_record_id}" if only_new else ""
+        window_ms = since_minutes * 60 * 1000
+        # Filtering happens inside the event log service instead of after export.
+        xpath = f"*[System[({level_filter}){record_filter} and TimeCreated[timediff(@SystemTime) <= {window_ms}]]]"
         ps_command = (
-            "Get-WinEvent -LogName System -MaxEvents 200 | "
-            f"Where-Object {{$_.LevelDisplayName -eq 'Error'}} | Select-Object -First {limit} | "
-            "Select-Object TimeCreated, ProviderName, Id, LevelDisplayName, Message | ConvertTo-Json"
+            f"Get-WinEvent -LogName System -FilterXPath '{xpath}' -MaxEvents {limit} -ErrorAction SilentlyContinue | "
+            "Select-Object TimeCreated, ProviderName, Id, RecordId, LevelDisplayName, Message | ConvertTo-Json -Compress"
         )
-        success, stdout, stderr = run_command(["powershell", "-Command", ps_command])
+        # Truncated JSON cannot be parsed, so keep all of it; -MaxEvents bounds the size.
+        success, stdout, stderr = run_command(["powershell", "-Command", ps_command], max_output_bytes=None)
         if not success:
             return ToolResult(success=False, data=[], error=stderr or "Unable to read event logs")
 
         try:
-            events = json.loads(stdout)
+            events = json.loads(stdout) if stdout else []
         except json.JSONDecodeError:
             events = []
+        if isinstance(events, dict):
+            events = [events]
+
+        record_ids = [event.get("RecordId") for event in events if isinstance(event.get("RecordId"), int)]
+        if record_ids:
+            self._windows_record_id = max(self._windows_record_id, *record_ids)
+        return ToolResult(success=True, data=events)
+
+    def _run_linux(self, limit: int, since_minutes: int, max_priority: int, only_new: bool) -> ToolResult:
+        since = datetime.now().astimezone() - timedelta(minutes=since_minutes)
+
+        events, cursor, journal_error = read_journal(
+            limit, max_priority, since, cursor=self._journal_cursor if only_new else None
+        )
+        if events is not None:
+            self._journal_cursor = cursor
+            return ToolResult(success=True, data=events)
 
+        path = find_syslog()
+        if path is None:
+            return ToolResult(
+                success=False, data=[], error=f"No readable system log found ({journal_error})"
+            )
+        events, self._syslog_cursor = read_syslog(
+            path, limit, max_priority, since, cursor=self._syslog_cursor if only_new else None
+        )
         return ToolResult(success=True, data=events)
+
+    def _run_diagnoser(self, limit: int, since_minutes: int, max_priority: int) -> ToolResult:
+        since = datetime.now() - timedelta(minutes=since_minutes)
+
+        def parse(line: str) -> Optional[dict]:
+            match = _APP_LOG_LINE.match(line)
+            if not match:
+                return None
+            timestamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+            if timestamp < since:
+                raise StopReading
+            priority = _LOGGING_PRIORITIES.get(match.group(2), PRIORITIES["info"])
+            if priority > max_priority:
+                return None
+            return {
+                "time": timestamp.isoformat(),
+                "source": match.group(3),
+                "priority": match.group(2).lower(),
+                "message": match.group(4),
+            }
+
+        if not DEFAULT_LOG_PATH.exists():
+            return ToolResult(success=True, data=[])
+        return ToolResult(success=True, data=tail_matching(DEFAULT_LOG_PATH, parse, limit))
+
+    def run(
+        self,
+        limit: int = 50,
+        since_minutes: int = 1440,
+        min_priority: str = "err",
+        only_new: bool = False,
+        source: str = "system",
+    ) -> ToolResult:
+        if min_priority not in PRIORITIES:
+            return ToolResult(success=False, data=[], error=f"Unknown priority: {min_priority}")
+        max_priority = PRIORITIES[min_priority]
+        limit = max(1, int(limit))
+        # One extra event shows whether older matches were left out. Readers go
+        # newest first, so a cursor cannot come back for them on the next call.
+        fetch = limit + 1
+
+        if source == "diagnoser":
+            result = self._run_diagnoser(fetch, since_minutes, max_priority)
+        elif is_windows():
+            result = self._run_windows(fetch, since_minutes, max_priority, only_new)
+        elif is_linux():
+            result = self._run_linux(fetch, since_minutes, max_priority, only_new)
+        else:
+            return ToolResult(success=False, data=[], error="Event log inspection is not supported on this platform")
+        if result.success:
+            result.data = {"events": result.data[:limit], "truncated": len(result.data) > limit}
+        return result
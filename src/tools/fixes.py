@@ -7,6 +7,8 @@ from .base import BaseTool, ToolResult
 
 
 DISABLED_MESSAGE = "Fix operations disabled in this mode."
+# SFC prints a progress line per percent; only the tail carries the verdict.
+SFC_OUTPUT_BYTES = 64 * 1024
 
 
 class RestartServiceTool(BaseTool):
@@ -51,7 +53,7 @@ class SystemFileCheckTool(BaseTool):
         if not is_windows():
             return ToolResult(success=False, data={}, error="System file check is only supported on Windows")
 
-        success, stdout, stderr = run_command(["sfc", "/scannow"], timeout=600)
+        success, stdout, stderr = run_command(["sfc", "/scannow"], timeout=600, max_output_bytes=SFC_OUTPUT_BYTES)
         if not success:
             return ToolResult(success=False, data={}, error=stderr or stdout)
 
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import re
+import shutil
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+from ..config import Config
+from ..utils.os_detect import is_linux, is_windows
+from .base import BaseTool, ToolResult
+from ..utils.shell_utils import run_command
+from .linux_disks import block_devices, device_info
+
+INVENTORY_VERSION = 1
+BOOT_ID_PATH = Path("/proc/sys/kernel/random/boot_id")
+DRM_PATH = Path("/sys/class/drm")
+PCI_VENDORS = {"0x10de": "NVIDIA", "0x1002": "AMD", "0x8086": "Intel", "0x1af4": "Virtio", "0x1234": "QEMU"}
+
+_cached: Optional[Dict[str, Any]] = None
+_lock = threading.Lock()
+
+
+def boot_id() -> str:
+    """Identifier that changes on every reboot (the boot time where there is no boot_id)."""
+
+    try:
+        return BOOT_ID_PATH.read_text().strip()
+    except OSError:
+        return str(int(psutil.boot_time()))
+
+
+def _powershell_json(command: str) -> List[dict]:
+    success, stdout, _ = run_command(
+        ["powershell", "-NoProfile", "-Command", f"{command} | ConvertTo-Json -Compress"], max_output_bytes=None
+    )
+    if not success or not stdout:
+        return []
+    try:
+        parsed = json.loads(stdout)
+    except ValueError:
+        return []
+    return [parsed] if isinstance(parsed, dict) else parsed
+
+
+def _cpu_model() -> str:
+    if is_linux():
+        try:
+            with open("/proc/cpuinfo", encoding="utf-8", errors="replace") as handle:
+                for line in handle:
+                    if line.startswith("model name"):
+                        return line.split(":", 1)[1].strip()
+        except OSError:
+            pass
+    return platform.processor() or "unknown"
+
+
+def probe_os() -> Dict[str, Any]:
+    return {
+        "system": platform.system(),
+        "release": platform.release(),
+        "version": platform.version(),
+        "machine": platform.machine(),
+    }
+
+
+def probe_cpu() -> Dict[str, Any]:
+    try:
+        max_mhz = round(psutil.cpu_freq().max) or None
+    except (AttributeError, NotImplementedError, OSError):
+        max_mhz = None
+    return {
+        "model": _cpu_model(),
+        "cores_physical": psutil.cpu_count(logical=False) or 0,
+        "cores_logical": psutil.cpu_count(logical=True) or 0,
+        "max_mhz": max_mhz,
+    }
+
+
+def probe_gpus() -> List[Dict[str, Any]]:
+    if shutil.which("nvidia-smi"):
+        success, stdout, _ = run_command(
+            ["nvidia-smi", "--query-gpu=name,driver_version,memory.total", "--format=csv,noheader,nounits"]
+        )
+        if success and stdout:
+            gpus = []
+            for line in stdout.splitlines():
+                parts = [part.strip() for part in line.split(",")]
+                if len(parts) >= 3:
+                    gpus.append({"name": parts[0], "driver_version": parts[1], "memory_mb": parts[2]})
+            if gpus:
+                return gpus
+
+    if is_windows():
+        return [
+            {"name": gpu.get("Name") or "unknown", "driver_version": gpu.get("DriverVersion") or "unknown"}
+            for gpu in _powershell_json("Get-CimInstance Win32_VideoController | Select-Object Name,DriverVersion")
+        ]
+
+    # Without vendor tools, PCI ids from sysfs still say what is installed.
+    gpus = []
+    for card in sorted(DRM_PATH.glob("card[0-9]*")):
+        if "-" in card.name:
+            continue
+        try:
+            vendor = (card / "device" / "vendor").read_text().strip()
+            device = (card / "device" / "device").read_text().strip()
+        except OSError:
+            continue
+        driver = (card / "device" / "driver").resolve().name if (card / "device" / "driver").exists() else "unknown"
+        gpus.append({"name": f"{PCI_VENDORS.get(vendor, vendor)} {device}", "driver_version": driver})
+    return gpus
+
+
+def _parse_dmidecode(output: str) -> List[Dict[str, Any]]:
+    dimms = []
+    for block in output.split("\n\n"):
+        if "Memory Device" not in block:
+            continue
+        fields = dict(re.findall(r"^\s*([^:\n]+):\s*(.+)$", block, re.MULTILINE))
+        if fields.get("Size", "").startswith("No Module"):
+            continue
+        dimms.append(
+            {
+                "locator": fields.get("Locator"),
+                "size": fields.get("Size"),
+                "type": fields.get("Type"),
+                "speed": fields.get("Configured Memory Speed") or fields.get("Speed"),
+                "manufacturer": fields.get("Manufacturer"),
+            }
+        )
+    return dimms
+
+
+def probe_memory() -> Dict[str, Any]:
+    memory: Dict[str, Any] = {"total_gb": round(psutil.virtual_memory().total / (1024 ** 3), 2)}
+    if is_windows():
+        memory["dimms"] = [
+            {
+                "locator": dimm.get("DeviceLocator"),
+                "size": f"{int(dimm.get('Capacity') or 0) // (1024 ** 2)} MB",
+                "speed": dimm.get("Speed"),
+                "manufacturer": dimm.get("Manufacturer"),
+            }
+            for dimm in _powershell_json(
+                "Get-CimInstance Win32_PhysicalMemory | Select-Object DeviceLocator,Capacity,Speed,Manufacturer"
+            )
+        ]
+    elif shutil.which("dmidecode") and hasattr(os, "geteuid") and os.geteuid() == 0:
+        success, stdout, _ = run_command(["dmidecode", "--type", "memory"])
+        if success:
+            memory["dimms"] = _parse_dmidecode(stdout)
+    return memory
+
+
+def probe_nics() -> List[Dict[str, Any]]:
+    addresses = psutil.net_if_addrs()
+    nics = []
+    for name, stats in sorted(psutil.net_if_stats().items()):
+        macs = [addr.address for addr in addresses.get(name, []) if addr.family == psutil.AF_LINK]
+        if name == "lo" or (macs and macs[0] == "00:00:00:00:00:00"):
+            continue
+        ipv4 = [addr.address for addr in addresses.get(name, []) if addr.family == socket.AF_INET]
+        nics.append({"name": name, "mac": macs[0] if macs else None, "speed_mbps": stats.speed, "mtu": stats.mtu, "ipv4": ipv4})
+    return nics
+
+
+def probe_disks() -> List[Dict[str, Any]]:
+    if is_linux():
+        devices = block_devices()
+        if devices:
+            return [device_info(name) for name in devices]
+    return [{"device": part.device, "fstype": part.fstype} for part in psutil.disk_partitions(all=False)]
+
+
+PROBES: Dict[str, Callable[[], Any]] = {
+    "os": probe_os,
+    "cpu": probe_cpu,
+    "gpus": probe_gpus,
+    "memory": probe_memory,
+    "nics": probe_nics,
+    "disks": probe_disks,
+}
+
+
+def collect_inventory() -> Dict[str, Any]:
+    """Run every probe in parallel; a failing probe yields ``{"error": ...}`` for its section."""
+
+    def run(probe: Callable[[], Any]) -> Any:
+        try:
+            return probe()
+        except Exception as exc:  # noqa: BLE001 - one broken probe should not lose the rest
+            return {"error": f"{type(exc).__name__}: {exc}"}
+
+    with ThreadPoolExecutor(max_workers=len(PROBES), thread_name_prefix="inventory") as pool:
+        sections = dict(zip(PROBES, pool.map(run, PROBES.values())))
+    return {
+        "boot_id": boot_id(),
+        "collected_at": datetime.now(timezone.utc).isoformat(),
+        **sections,
+    }
+
+
+def _read_cache(path: Path, current_boot: str) -> Optional[Dict[str, Any]]:
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cached.get("version") != INVENTORY_VERSION or cached.get("inventory", {}).get("boot_id") != current_boot:
+        return None
+    return cached["inventory"]
+
+
+def _write_cache(path: Path, inventory: Dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"version": INVENTORY_VERSION, "inventory": inventory}), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def hardware_inventory(cache_path: Optional[Path] = None, refresh: bool = False) -> Dict[str, Any]:
+    """Static hardware facts, probed once per process and, with ``cache_path``, once per boot.
+
+    The returned dict is shared and must be treated as read-only.
+    """
+
+    global _cached
+    with _lock:
+        if _cached is not None and not refresh:
+            return _cached
+        inventory = None
+        if cache_path is not None and not refresh:
+            inventory = _read_cache(cache_path, boot_id())
+        if inventory is None:
+            inventory = collect_inventory()
+            if cache_path is not None:
+                _write_cache(cache_path, inventory)
+        _cached = inventory
+        return inventory
+
+
+def reset_inventory() -> None:
+    """Forget the in-process copy (the cache file is kept)."""
+
+    global _cached
+    with _lock:
+        _cached = None
+
+
+class HardwareInventoryTool(BaseTool):
+    name = "get_hardware_inventory"
+    description = "Get static hardware facts: CPU model, GPUs, memory modules, network interfaces and disks."
+    parameters_schema = {
+        "type": "object",
+        "properties": {
+            "refresh": {
+                "type": "boolean",
+                "description": "Probe the hardware again instead of using the inventory cached for this boot",
+                "default": False,
+            }
+        },
+        "required": [],
+    }
+
+    def __init__(self, config: Optional[Config] = None):
+        self.cache_path = config.inventory_cache_path if config else None
+
+    def run(self, refresh: bool = False) -> ToolResult:
+        return ToolResult(success=True, data=hardware_inventory(self.cache_path, refresh=refresh))
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.shell_utils import run_command_async, run_sync
+
+PROC_DISKSTATS = Path("/proc/diskstats")
+SYS_BLOCK = Path("/sys/block")
+SECTOR_BYTES = 512
+SKIPPED_PREFIXES = ("loop", "ram", "zram", "fd", "sr")
+SMARTCTL_TIMEOUT = 15.0
+
+# ATA attribute ids that indicate media problems when their raw value is non-zero.
+ATA_WARNING_ATTRIBUTES = {
+    5: "reallocated_sectors",
+    187: "reported_uncorrectable",
+    197: "pending_sectors",
+    198: "offline_uncorrectable",
+}
+
+
+@dataclass(frozen=True)
+class DiskStat:
+    """Cumulative counters for one block device, as in ``/proc/diskstats``."""
+
+    reads: int
+    read_sectors: int
+    read_ms: int
+    writes: int
+    write_sectors: int
+    write_ms: int
+    in_flight: int
+    io_ms: int
+    weighted_ms: int
+
+    @classmethod
+    def from_fields(cls, fields: List[str]) -> "DiskStat":
+        values = [int(value) for value in fields[:11]]
+        reads, _, read_sectors, read_ms, writes, _, write_sectors, write_ms, in_flight, io_ms, weighted_ms = values
+        return cls(reads, read_sectors, read_ms, writes, write_sectors, write_ms, in_flight, io_ms, weighted_ms)
+
+
+def block_devices(sys_block: Path = SYS_BLOCK) -> List[str]:
+    """Whole-disk device names (partitions and loop/ram devices excluded)."""
+
+    try:
+        names = sorted(entry.name for entry in sys_block.iterdir())
+    except OSError:
+        return []
+    return [name for name in names if not name.startswith(SKIPPED_PREFIXES)]
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace").strip()
+    except OSError:
+        return None
+
+
+def device_info(name: str, sys_block: Path = SYS_BLOCK) -> Dict[str, Any]:
+    base = sys_block / name
+    sectors = _read_text(base / "size")
+    rotational = _read_text(base / "queue" / "rotational")
+    model = _read_text(base / "device" / "model") or _read_text(base / "device" / "name")
+    return {
+        "device": name,
+        "model": model or name,
+        "size_gb": round(int(sectors) * SECTOR_BYTES / (1024 ** 3), 2) if sectors and sectors.isdigit() else 0,
+        "rotational": rotational == "1" if rotational is not None else None,
+        "physical": (base / "device").exists(),
+    }
+
+
+def read_diskstats(
+    devices: List[str], proc_path: Path = PROC_DISKSTATS, sys_block: Path = SYS_BLOCK
+) -> Dict[str, DiskStat]:
+    """Counters for ``devices`` from one read of /proc/diskstats, else per-device /sys/block/*/stat."""
+
+    wanted = set(devices)
+    stats: Dict[str, DiskStat] = {}
+    text = _read_text(proc_path)
+    if text is not None:
+        for line in text.splitlines():
+            fields = line.split()
+            if len(fields) >= 14 and fields[2] in wanted:
+                stats[fields[2]] = DiskStat.from_fields(fields[3:])
+        return stats
+
+    for name in devices:
+        fields = (_read_text(sys_block / name / "stat") or "").split()
+        if len(fields) >= 11:
+            stats[name] = DiskStat.from_fields(fields)
+    return stats
+
+
+def io_deltas(previous: DiskStat, current: DiskStat, elapsed: float) -> Dict[str, float]:
+    """Throughput, average latency, utilisation and queue depth between two samples."""
+
+    elapsed_ms = max(elapsed * 1000, 1e-6)
+    reads = current.reads - previous.reads
+    writes = current.writes - previous.writes
+    read_ms = current.read_ms - previous.read_ms
+    write_ms = current.write_ms - previous.write_ms
+    return {
+        "read_iops": round(reads / elapsed, 1),
+        "write_iops": round(writes / elapsed, 1),
+        "read_mb_s": round((current.read_sectors - previous.read_sectors) * SECTOR_BYTES / 1e6 / elapsed, 2),
+        "write_mb_s": round((current.write_sectors - previous.write_sectors) * SECTOR_BYTES / 1e6 / elapsed, 2),
+        "read_latency_ms": round(read_ms / reads, 2) if reads else 0.0,
+        "write_latency_ms": round(write_ms / writes, 2) if writes else 0.0,
+        "util_percent": round(min(100.0, (current.io_ms - previous.io_ms) / elapsed_ms * 100), 1),
+        "avg_queue_depth": round((current.weighted_ms - previous.weighted_ms) / elapsed_ms, 2),
+        "in_flight": current.in_flight,
+    }
+
+
+def parse_smartctl(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce ``smartctl --json`` output to health status, key counters and warnings."""
+
+    passed = (report.get("smart_status") or {}).get("passed")
+    smart: Dict[str, Any] = {
+        "status": "OK" if passed else ("Failing" if passed is False else "Unknown"),
+        "serial": report.get("serial_number"),
+        "temperature_c": (report.get("temperature") or {}).get("current"),
+        "power_on_hours": (report.get("power_on_time") or {}).get("hours"),
+    }
+    warnings: List[str] = []
+
+    for attribute in (report.get("ata_smart_attributes") or {}).get("table", []):
+        label = ATA_WARNING_ATTRIBUTES.get(attribute.get("id"))
+        if label is None:
+            continue
+        raw = (attribute.get("raw") or {}).get("value", 0)
+        smart[label] = raw
+        if raw:
+            warnings.append(f"{label}={raw}")
+        if attribute.get("when_failed"):
+            warnings.append(f"{attribute.get('name', label)} failed {attribute['when_failed']}")
+
+    nvme = report.get("nvme_smart_health_information_log")
+    if nvme:
+        smart["percentage_used"] = nvme.get("percentage_used")
+        smart["media_errors"] = nvme.get("media_errors")
+        if nvme.get("critical_warning"):
+            warnings.append(f"critical_warning={nvme['critical_warning']}")
+        if nvme.get("media_errors"):
+            warnings.append(f"media_errors={nvme['media_errors']}")
+        if (nvme.get("percentage_used") or 0) >= 90:
+            warnings.append(f"percentage_used={nvme['percentage_used']}")
+
+    if warnings:
+        smart["warnings"] = warnings
+        if smart["status"] == "OK":
+            smart["status"] = "Warning"
+    return {key: value for key, value in smart.items() if value is not None}
+
+
+def smartctl_available() -> bool:
+    return shutil.which("smartctl") is not None
+
+
+def read_smart(device: str, timeout: float = SMARTCTL_TIMEOUT) -> Dict[str, Any]:
+    """Run ``smartctl --json`` for one device; returns parsed health or ``{"error": ...}``."""
+
+    command = ["smartctl", "--json", "-H", "-A", "-i", os.path.join("/dev", device)]
+    result = run_sync(run_command_async(command, timeout=timeout, max_output_bytes=None))
+    try:
+        report = json.loads(result.stdout)
+    except ValueError:
+        return {"error": (result.stderr or result.stdout or "smartctl produced no output").strip()[:200]}
+
+    # Bits 0-1 of the exit status mean the device could not be opened or queried at all.
+    if result.returncode is not None and result.returncode & 0b11:
+        messages = [item.get("string", "") for item in (report.get("smartctl") or {}).get("messages", [])]
+        return {"error": "; ".join(filter(None, messages)) or f"smartctl exited with {result.returncode}"}
+    return parse_smartctl(report)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Deque, List, Optional, Tuple
+
+from ..utils.shell_utils import run_command_streaming
+from .log_reader import StopReading, rotated_since, tail_matching, tail_segments
+
+
+PRIORITIES = {
+    "emerg": 0,
+    "alert": 1,
+    "crit": 2,
+    "err": 3,
+    "warning": 4,
+    "notice": 5,
+    "info": 6,
+    "debug": 7,
+}
+PRIORITY_NAMES = {value: name for name, value in PRIORITIES.items()}
+
+SYSLOG_PATHS = ("/var/log/syslog", "/var/log/messages")
+
+# Plain-text syslog lines carry no priority, so severity is inferred from keywords.
+_KEYWORD_PRIORITIES: Tuple[Tuple[int, re.Pattern], ...] = (
+    (PRIORITIES["crit"], re.compile(r"\b(panic|fatal|critical|emerg\w*|oops|segfault)\b", re.IGNORECASE)),
+    (PRIORITIES["err"], re.compile(r"\b(err(or)?s?|fail(ed|ure|s)?|denied|timed out)\b", re.IGNORECASE)),
+    (PRIORITIES["warning"], re.compile(r"\b(warn(ing)?s?)\b", re.IGNORECASE)),
+)
+_RFC3339 = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\s+(\S+)\s+(.*)$")
+_TRADITIONAL = re.compile(r"^([A-Z][a-z]{2}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2})\s+(\S+)\s+(.*)$")
+_SOURCE = re.compile(r"^([^\s:\[]+)(?:\[\d+\])?:\s*(.*)$")
+
+
+@dataclass
+class FileCursor:
+    path: str
+    inode: int
+    offset: int
+
+
+def _journal_message(value) -> str:
+    # journald encodes non-UTF-8 messages as a list of byte values.
+    if isinstance(value, list):
+        return bytes(value).decode("utf-8", errors="replace")
+    return value or ""
+
+
+def read_journal(
+    limit: int,
+    max_priority: int,
+    since: datetime,
+    cursor: Optional[str] = None,
+    timeout: float = 30,
+) -> Tuple[Optional[List[dict]], Optional[str], str]:
+    """Read matching journald entries newest first.
+
+    Returns ``(events, newest_cursor, error)``; ``events`` is ``None`` when
+    ``journalctl`` is missing or fails so the caller can fall back to syslog
+    files. No matching entries is an empty list, not a failure. Without a
+    cursor the journal is read backwards and ``journalctl`` is stopped once
+    ``limit`` events match; with one it is read forwards from the cursor,
+    keeping the newest ``limit`` events.
+    """
+
+    command = [
+        "journalctl",
+        "--no-pager",
+        "--output=json",
+        f"--priority=0..{max_priority}",
+        f"--since={since.astimezone().strftime('%Y-%m-%d %H:%M:%S')}",
+    ]
+    if cursor:
+        command.append(f"--after-cursor={cursor}")
+    else:
+        command.append("--reverse")
+
+    since_usec = int(since.timestamp() * 1_000_000)
+    events: Deque[dict] = deque(maxlen=limit)
+    state = {"cursor": None}
+
+    def on_line(line: str) -> bool:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            return False
+        # Reading backwards the newest entry comes first; reading forwards, last.
+        if cursor or state["cursor"] is None:
+            state["cursor"] = entry.get("__CURSOR")
+        priority = int(entry.get("PRIORITY", PRIORITIES["info"]))
+        timestamp = int(entry.get("__REALTIME_TIMESTAMP", 0))
+        if priority > max_priority or timestamp < since_usec:
+            return False
+        events.append(
+            {
+                "time": datetime.fromtimestamp(timestamp / 1_000_000, tz=timezone.utc).isoformat(),
+                "source": entry.get("SYSLOG_IDENTIFIER") or entry.get("_SYSTEMD_UNIT") or entry.get("_COMM"),
+                "priority": PRIORITY_NAMES.get(priority, str(priority)),
+                "pid": entry.get("_PID"),
+                "message": _journal_message(entry.get("MESSAGE")),
+            }
+        )
+        return not cursor and len(events) >= limit
+
+    result = run_command_streaming(command, on_line=on_line, timeout=timeout)
+    if not (result.success or result.stopped_early):
+        return None, None, result.stderr or "journalctl failed"
+    ordered = list(reversed(events)) if cursor else list(events)
+    return ordered, state["cursor"] or cursor, ""
+
+
+def syslog_priority(message: str) -> int:
+    for priority, pattern in _KEYWORD_PRIORITIES:
+        if pattern.search(message):
+            return priority
+    return PRIORITIES["info"]
+
+
+def parse_syslog_line(line: str, now: datetime) -> Optional[dict]:
+    """Split a traditional or RFC 3339 syslog line into an event dict."""
+
+    match = _RFC3339.match(line)
+    if match:
+        try:
+            timestamp = datetime.fromisoformat(match.group(1).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.astimezone()
+    else:
+        match = _TRADITIONAL.match(line)
+        if not match:
+            return None
+        try:
+            timestamp = datetime.strptime(f"{now.year} {match.group(1)}", "%Y %b %d %H:%M:%S").astimezone()
+        except ValueError:
+            return None
+        # Traditional timestamps have no year; anything "in the future" is from last year.
+        if timestamp > now:
+            timestamp = timestamp.replace(year=now.year - 1)
+
+    body = match.group(3)
+    source_match = _SOURCE.match(body)
+    source, message = (source_match.group(1), source_match.group(2)) if source_match else (None, body)
+    priority = syslog_priority(message)
+    return {
+        "time": timestamp.isoformat(),
+        "source": source,
+        "priority": PRIORITY_NAMES[priority],
+        "message": message,
+        "_timestamp": timestamp,
+        "_priority": priority,
+    }
+
+
+def find_syslog() -> Optional[str]:
+    for path in SYSLOG_PATHS:
+        if os.access(path, os.R_OK):
+            return path
+    return None
+
+
+def read_syslog(
+    path: str,
+    limit: int,
+    max_priority: int,
+    since: datetime,
+    cursor: Optional[FileCursor] = None,
+) -> Tuple[List[dict], FileCursor]:
+    """Return the newest ``limit`` matching events from ``path`` and its rotations.
+
+    The log is read backwards, so the scan ends as soon as ``limit`` events match
+    or an entry older than ``since`` is reached. With a cursor for the same file,
+    only bytes appended since the previous call are inspected, following the file
+    into its rotations if it was rotated in between. The returned cursor
+    covers the whole file, so when more than ``limit`` events were appended the
+    older ones are never returned; callers ask for one extra event to detect that.
+    """
+
+    now = datetime.now().astimezone()
+    stat = os.stat(path)
+    segments = None
+    if cursor and cursor.path == path:
+        if cursor.inode == stat.st_ino:
+            if cursor.offset <= stat.st_size:
+                segments = [(path, cursor.offset)]
+        else:
+            # Rotated since the last call: the new file, then the old one from where we stopped.
+            rotated = rotated_since(path, cursor.inode)
+            if rotated is not None:
+                segments = [(log_path, 0) for log_path in rotated[:-1]] + [(rotated[-1], cursor.offset)]
+
+    def parse(line: str) -> Optional[dict]:
+        event = parse_syslog_line(line, now)
+        if event is None:
+            return None
+        if event.pop("_timestamp") < since:
+            raise StopReading
+        if event.pop("_priority") > max_priority:
+            return None
+        return event
+
+    if segments is None:
+        events = tail_matching(path, parse, limit)
+    else:
+        events = tail_segments(segments, parse, limit)
+    return events, FileCursor(path=path, inode=stat.st_ino, offset=stat.st_size)
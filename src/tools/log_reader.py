@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import gzip
+import mmap
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+PathLike = Union[str, Path]
+
+_NUMBERED = re.compile(r"^\.(\d+)(\.gz)?$")
+_DATED = re.compile(r"^-(\d{8,10})(\.gz)?$")
+
+
+class StopReading(Exception):
+    """Raised by a parse callback when no older line can be relevant (e.g. outside a time window)."""
+
+
+def reverse_lines(path: PathLike, start: int = 0, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield the lines of ``path`` from last to first without reading the whole file.
+
+    The file is memory-mapped and scanned backwards with ``rfind``, so only the
+    pages holding the lines actually consumed are read from disk. Lines before
+    byte offset ``start`` are not returned.
+    """
+
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size <= start:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = size
+            if mapped[end - 1 : end] == b"\n":
+                end -= 1
+            while end > start:
+                newline = mapped.rfind(b"\n", start, end)
+                line_start = newline + 1 if newline >= 0 else start
+                yield mapped[line_start:end].decode(encoding, errors="replace").rstrip("\r")
+                end = newline if newline >= 0 else start
+
+
+def rotated_logs(path: PathLike) -> List[Path]:
+    """Return ``path`` followed by its rotated siblings, newest first.
+
+    Understands numbered rotation (``syslog.1``, ``syslog.2.gz``) and logrotate's
+    ``dateext`` suffixes (``messages-20240101``, ``messages-20240101.gz``).
+    """
+
+    live = Path(path)
+    numbered = []
+    dated = []
+    if live.parent.is_dir():
+        for sibling in live.parent.iterdir():
+            if not sibling.name.startswith(live.name) or sibling == live:
+                continue
+            suffix = sibling.name[len(live.name) :]
+            match = _NUMBERED.match(suffix)
+            if match:
+                numbered.append((int(match.group(1)), sibling))
+                continue
+            match = _DATED.match(suffix)
+            if match:
+                dated.append((match.group(1), sibling))
+
+    ordered = [live] if live.exists() else []
+    ordered.extend(sibling for _, sibling in sorted(numbered))
+    ordered.extend(sibling for _, sibling in sorted(dated, reverse=True))
+    return ordered
+
+
+def _tail_gzip(path: Path, parse: Callable[[str], Optional[T]], limit: int) -> "tuple[List[T], bool]":
+    # Compressed members cannot be read backwards, so stream them forward and keep
+    # only the newest ``limit`` matches; memory stays proportional to the result.
+    matches: Deque[T] = deque(maxlen=limit)
+    stopped = False
+    with gzip.open(path, "rt", encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            try:
+                value = parse(line.rstrip("\r\n"))
+            except StopReading:
+                # Everything up to here is too old; newer lines may still match.
+                matches.clear()
+                stopped = True
+                continue
+            if value is not None:
+                matches.append(value)
+    return list(reversed(matches)), stopped
+
+
+def rotated_since(path: PathLike, inode: int) -> Optional[List[Path]]:
+    """``path`` and its rotations, newest first, down to the file with ``inode``.
+
+    Rotating by rename keeps the inode, so this finds where a reader that last
+    saw ``inode`` left off. Returns ``None`` when no uncompressed log has it.
+    """
+
+    paths = []
+    for log_path in rotated_logs(path):
+        if log_path.suffix == ".gz":
+            return None
+        paths.append(log_path)
+        try:
+            if log_path.stat().st_ino == inode:
+                return paths
+        except OSError:
+            continue
+    return None
+
+
+def tail_segments(
+    segments: Sequence[Tuple[PathLike, int]],
+    parse: Callable[[str], Optional[T]],
+    limit: int,
+) -> List[T]:
+    """Like :func:`tail_matching` over explicit ``(path, start_offset)`` pairs, newest file first."""
+
+    results: List[T] = []
+    for log_path, start in segments:
+        log_path = Path(log_path)
+        remaining = limit - len(results)
+        if remaining <= 0:
+            break
+        try:
+            if log_path.suffix == ".gz":
+                values, stopped = _tail_gzip(log_path, parse, remaining)
+                results.extend(values)
+                if stopped:
+                    break
+                continue
+
+            for line in reverse_lines(log_path, start=start):
+                value = parse(line)
+                if value is not None:
+                    results.append(value)
+                    if len(results) >= limit:
+                        break
+        except StopReading:
+            break
+        except (OSError, EOFError):
+            continue
+    return results
+
+
+def tail_matching(
+    path: PathLike,
+    parse: Callable[[str], Optional[T]],
+    limit: int,
+    include_rotated: bool = True,
+    start: int = 0,
+) -> List[T]:
+    """Return up to ``limit`` parsed lines from ``path`` (and its rotations), newest first.
+
+    ``parse`` turns a line into a value, returns ``None`` to skip it, or raises
+    :class:`StopReading` to end the scan. Reading stops as soon as ``limit``
+    values are found, so the cost is proportional to the result rather than the
+    log size. ``start`` skips the part of the live file before that byte offset.
+    """
+
+    paths = rotated_logs(path) if include_rotated else [Path(path)]
+    return tail_segments([(log_path, start if index == 0 else 0) for index, log_path in enumerate(paths)], parse, limit)
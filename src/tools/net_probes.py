@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from ..utils.os_detect import is_mac, is_windows
+from ..utils.shell_utils import CommandSlots, run_command_async
+
+PING_INTERVAL = 0.2
+# Pings have their own budget, sized to one call's targets, so they do not run in
+# waves behind MAX_CONCURRENT_COMMANDS; concurrent calls beyond it still queue.
+MAX_CONCURRENT_PINGS = 32
+_PING_SLOTS = CommandSlots(MAX_CONCURRENT_PINGS)
+_PING_TIME = re.compile(r"time[=<]\s*([0-9.]+)\s*ms", re.IGNORECASE)
+_PING_LOSS = re.compile(r"(\d+(?:\.\d+)?)% (?:packet )?loss", re.IGNORECASE)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_stats(samples_ms: List[float]) -> Optional[Dict[str, float]]:
+    """Min/p50/p90/max plus jitter (mean difference between consecutive samples)."""
+
+    if not samples_ms:
+        return None
+    ordered = sorted(samples_ms)
+    diffs = [abs(b - a) for a, b in zip(samples_ms, samples_ms[1:])]
+    return {
+        "min": round(ordered[0], 2),
+        "p50": round(_percentile(ordered, 0.5), 2),
+        "p90": round(_percentile(ordered, 0.9), 2),
+        "max": round(ordered[-1], 2),
+        "jitter": round(sum(diffs) / len(diffs), 2) if diffs else 0.0,
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+async def resolve(host: str, timeout: float) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    try:
+        infos = await asyncio.wait_for(loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), timeout)
+    except asyncio.TimeoutError:
+        return {"success": False, "error": f"DNS lookup timed out after {timeout:g}s"}
+    except OSError as exc:
+        return {"success": False, "error": str(exc)}
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    return {"success": True, "addresses": addresses, "latency_ms": round(_elapsed_ms(started), 2)}
+
+
+async def _open(addresses: List[str], port: int, timeout: float):
+    """Connect to the first address that accepts, so an unroutable IPv6 record does not hide a live IPv4 one."""
+
+    error = None
+    for address in addresses:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout)
+        except asyncio.TimeoutError:
+            error = f"Connect timed out after {timeout:g}s"
+        except OSError as exc:
+            error = exc.strerror or str(exc)
+        else:
+            return address, writer, None
+    return None, None, error
+
+
+async def tcp_connect(addresses: List[str], port: int, count: int, timeout: float) -> Dict[str, Any]:
+    """Open ``count`` TCP connections in turn; stops at the first failure so a dead port costs one timeout.
+
+    The first connection tries each resolved address in order and later ones
+    reuse the address that answered.
+    """
+
+    samples: List[float] = []
+    error = None
+    for _ in range(count):
+        started = time.perf_counter()
+        address, writer, error = await _open(addresses, port, timeout)
+        if writer is None:
+            break
+        samples.append(_elapsed_ms(started))
+        addresses = [address]
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    result: Dict[str, Any] = {"port": port, "success": error is None, "connected": len(samples)}
+    if samples:
+        result["address"] = addresses[0]
+        result["latency_ms"] = latency_stats(samples)
+    if error:
+        result["error"] = error
+    return result
+
+
+def parse_ping(output: str, sent: int) -> Dict[str, Any]:
+    samples = [float(match) for match in _PING_TIME.findall(output)]
+    loss_match = _PING_LOSS.search(output)
+    loss = float(loss_match.group(1)) if loss_match else round(100 * (1 - len(samples) / max(sent, 1)), 1)
+    return {
+        "success": bool(samples),
+        "sent": sent,
+        "received": len(samples),
+        "packet_loss_percent": loss,
+        "latency_ms": latency_stats(samples),
+    }
+
+
+def ping_command(host: str, count: int, timeout: float) -> List[str]:
+    """``ping`` arguments waiting at most ``timeout`` seconds for each reply."""
+
+    if is_windows():
+        return ["ping", "-n", str(count), "-w", str(int(timeout * 1000)), host]
+    # Linux ping takes -W in seconds; macOS and FreeBSD take it in milliseconds.
+    if is_mac() or sys.platform.startswith("freebsd"):
+        wait = str(max(1, int(timeout * 1000)))
+    else:
+        wait = str(max(1, int(timeout)))
+    return ["ping", "-c", str(count), "-i", str(PING_INTERVAL), "-W", wait, host]
+
+
+async def ping(host: str, count: int, timeout: float) -> Dict[str, Any]:
+    command = ping_command(host, count, timeout)
+    # Worst case every reply takes the full timeout.
+    result = await run_command_async(command, timeout=timeout + count * PING_INTERVAL + 1, slots=_PING_SLOTS)
+    if result.returncode is None:
+        return {"success": False, "error": result.stderr or "ping unavailable"}
+    parsed = parse_ping(result.stdout, count)
+    if not parsed["success"]:
+        lines = (result.stderr or result.stdout).strip().splitlines()
+        parsed["error"] = lines[-1][:200] if lines else "No replies"
+    return parsed
+
+
+async def probe_target(
+    target: str, ports: List[int], count: int, timeout: float, with_ping: bool
+) -> Dict[str, Any]:
+    """DNS then TCP connects to each port, with ping running alongside."""
+
+    ping_task = asyncio.ensure_future(ping(target, count, timeout)) if with_ping else None
+    result: Dict[str, Any] = {"target": target, "dns": await resolve(target, timeout)}
+
+    if ports:
+        if result["dns"]["success"]:
+            addresses = result["dns"]["addresses"]
+            result["tcp"] = list(
+                await asyncio.gather(*(tcp_connect(addresses, port, count, timeout) for port in ports))
+            )
+        else:
+            result["tcp"] = [{"port": port, "success": False, "error": "DNS lookup failed"} for port in ports]
+
+    if ping_task is not None:
+        result["ping"] = await ping_task
+    return result
+
+
+async def probe_targets(
+    targets: List[str], ports: List[int], count: int, timeout: float, with_ping: bool
+) -> List[Dict[str, Any]]:
+    return list(
+        await asyncio.gather(*(probe_target(target, ports, count, timeout, with_ping) for target in targets))
+    )
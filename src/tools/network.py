@@ -1,55 +1,79 @@
 from __future__ import annotations
 
-import platform
-import re
-import socket
-from typing import Any, Dict
+import time
+from typing import List, Optional
 
-from .base import BaseTool, ToolResult
-from ..utils.shell_utils import run_command
+from .base import AsyncTool, ToolResult
+from .net_probes import MAX_CONCURRENT_PINGS, probe_targets
 
+DEFAULT_TARGETS = ["8.8.8.8"]
+DEFAULT_COUNT = 4
+MAX_COUNT = 10
+DEFAULT_PROBE_TIMEOUT = 3.0
+MAX_TARGETS = MAX_CONCURRENT_PINGS
+MAX_PORTS = 16
 
-class NetworkDiagnosticsTool(BaseTool):
+
+class NetworkDiagnosticsTool(AsyncTool):
     name = "run_network_diagnostics"
-    description = "Run ping and DNS checks against a target."
+    description = "Run DNS, TCP connect and ping checks against one or more targets concurrently."
     parameters_schema = {
         "type": "object",
         "properties": {
-            "target": {
-                "type": "string",
-                "description": "Target host or IP to test",
-                "default": "8.8.8.8",
-            }
+            "targets": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Hosts or IPs to test (gateway, DNS servers, internal services)",
+                "default": DEFAULT_TARGETS,
+            },
+            "target": {"type": "string", "description": "Single host to test (same as targets=[target])"},
+            "ports": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "description": "TCP ports to connect to on every target",
+                "default": [],
+            },
+            "count": {
+                "type": "integer",
+                "description": "Probes per check",
+                "minimum": 1,
+                "maximum": MAX_COUNT,
+                "default": DEFAULT_COUNT,
+            },
+            "timeout": {
+                "type": "number",
+                "description": "Per-probe timeout in seconds",
+                "default": DEFAULT_PROBE_TIMEOUT,
+            },
+            "ping": {"type": "boolean", "description": "Also run ICMP ping", "default": True},
         },
         "required": [],
     }
 
-    def _ping_target(self, target: str) -> Dict[str, Any]:
-        count_flag = "-n" if platform.system().lower() == "windows" else "-c"
-        success, stdout, stderr = run_command(["ping", count_flag, "4", target], timeout=15)
-        if not success:
-            return {"success": False, "error": stderr or stdout}
-
-        # Parse average latency
-        avg_match = re.search(r"= [^/]*/([^/]+)/", stdout) or re.search(r"Average = ([0-9.]+)ms", stdout)
-        avg_ms = float(avg_match.group(1)) if avg_match else None
-        loss_match = re.search(r"(\d+)% packet loss", stdout) or re.search(r"Lost = \d+ \((\d+)% loss\)", stdout)
-        packet_loss = float(loss_match.group(1)) if loss_match else 0
-
-        return {"success": True, "avg_ms": avg_ms, "packet_loss_percent": packet_loss}
-
-    def _dns_lookup(self, target: str) -> Dict[str, Any]:
+    async def arun(
+        self,
+        targets: Optional[List[str]] = None,
+        target: Optional[str] = None,
+        ports: Optional[List[int]] = None,
+        count: int = DEFAULT_COUNT,
+        timeout: float = DEFAULT_PROBE_TIMEOUT,
+        ping: bool = True,
+    ) -> ToolResult:
+        names = list(dict.fromkeys((targets or []) + ([target] if target else []))) or DEFAULT_TARGETS
+        if len(names) > MAX_TARGETS or len(ports or []) > MAX_PORTS:
+            return ToolResult(
+                success=False,
+                data={},
+                error=f"At most {MAX_TARGETS} targets and {MAX_PORTS} ports per call",
+            )
         try:
-            ip = socket.gethostbyname(target)
-            return {"success": True, "resolved_ip": ip}
-        except socket.gaierror as exc:
-            return {"success": False, "error": str(exc)}
-
-    def run(self, target: str = "8.8.8.8") -> ToolResult:
-        ping_result = self._ping_target(target)
-        dns_result = self._dns_lookup(target)
+            port_numbers = [int(port) for port in ports or []]
+        except (TypeError, ValueError):
+            return ToolResult(success=False, data={}, error="Ports must be integers")
 
+        started = time.perf_counter()
+        results = await probe_targets(names, port_numbers, min(max(1, int(count)), MAX_COUNT), float(timeout), ping)
         return ToolResult(
             success=True,
-            data={"target": target, "ping": ping_result, "dns": dns_result},
+            data={"targets": results, "duration_ms": round((time.perf_counter() - started) * 1000, 1)},
         )
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import psutil
+
+from . import procfs
+from .table import Table
+
+CPU_SAMPLE_INTERVAL = 0.1
+SORT_KEYS = ("cpu", "memory", "io", "fds")
+
+_MB = 1024 ** 2
+# Readings denied for other users' processes are None, so only columns that are
+# always readable are packed into arrays.
+COLUMN_TYPECODES = {
+    "pid": "q",
+    "cpu_avg_percent": "d",
+}
+
+T = TypeVar("T")
+
+
+def _unless_denied(read: Callable[[], T]) -> Optional[T]:
+    """``read()``, or ``None`` when the process belongs to someone we may not inspect."""
+
+    try:
+        return read()
+    except psutil.AccessDenied:
+        return None
+
+
+def _io_bytes(proc: psutil.Process) -> Optional[Tuple[int, int]]:
+    try:
+        counters = _unless_denied(proc.io_counters)
+    except (AttributeError, NotImplementedError):
+        return 0, 0
+    return None if counters is None else (counters.read_bytes, counters.write_bytes)
+
+
+def _open_handles(proc: psutil.Process) -> Optional[int]:
+    # num_fds is POSIX only; Windows exposes the equivalent as num_handles.
+    reader: Optional[Callable[[], int]] = getattr(proc, "num_fds", None) or getattr(proc, "num_handles", None)
+    if reader is None:
+        return 0
+    try:
+        return _unless_denied(reader)
+    except NotImplementedError:
+        return 0
+
+
+def rank_key(sort_by: str, cpu: Optional[float], rss: Optional[int], io, fds: Optional[int]) -> float:
+    """Sort value for one process; unreadable values rank below every readable one."""
+
+    if sort_by == "cpu":
+        value = cpu
+    elif sort_by == "memory":
+        value = rss
+    elif sort_by == "io":
+        value = None if io is None else io[0] + io[1]
+    else:
+        value = fds
+    return -1 if value is None else value
+
+
+def table_row(pid: int, name, cpu, rss, io, fds, sort_by: str, average: Optional[float] = None) -> list:
+    """One output row; ``average`` is the sampler's CPU average, when sampling."""
+
+    row = [pid, name, None if cpu is None else round(cpu, 2), None if rss is None else round(rss / _MB, 2)]
+    if average is not None:
+        row.append(round(average, 2))
+    if sort_by == "io":
+        row += [None, None] if io is None else [round(io[0] / _MB, 2), round(io[1] / _MB, 2)]
+    if sort_by == "fds":
+        row.append(fds)
+    return row
+
+
+def table_columns(sort_by: str, sampled: bool) -> List[str]:
+    columns = ["pid", "name", "cpu_percent", "memory_mb"]
+    if sampled:
+        columns.append("cpu_avg_percent")
+    if sort_by == "io":
+        columns += ["io_read_mb", "io_write_mb"]
+    if sort_by == "fds":
+        columns.append("open_fds")
+    return columns
+
+
+def _prime_cpu(processes: List[psutil.Process]) -> None:
+    for proc in processes:
+        try:
+            proc.cpu_percent(interval=None)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+
+
+def _measure(
+    processes: List[psutil.Process],
+    sort_by: str,
+    sampled_cpu: Optional[Dict[int, Tuple[float, float]]],
+) -> Iterator[tuple]:
+    """Yield ``(sort_key, pid, proc, cpu, rss, io, fds)`` for every live process.
+
+    Readings we are not allowed to take are ``None``; the process is still listed.
+    """
+
+    for proc in processes:
+        try:
+            with proc.oneshot():
+                if sampled_cpu is None:
+                    cpu = _unless_denied(lambda: proc.cpu_percent(interval=None))
+                else:
+                    cpu = sampled_cpu.get(proc.pid, (0.0, 0.0))[0]
+                memory = _unless_denied(proc.memory_info)
+                rss = None if memory is None else memory.rss
+                io = _io_bytes(proc) if sort_by == "io" else None
+                fds = _open_handles(proc) if sort_by == "fds" else None
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+
+        yield rank_key(sort_by, cpu, rss, io, fds), proc.pid, proc, cpu, rss, io, fds
+
+
+def top_processes(
+    sort_by: str = "cpu",
+    limit: int = 20,
+    interval: float = CPU_SAMPLE_INTERVAL,
+    sampled_cpu: Optional[Dict[int, Tuple[float, float]]] = None,
+) -> Table:
+    """Return the ``limit`` heaviest processes ranked by ``sort_by``.
+
+    CPU counters of every process are primed first and read again after one
+    shared ``interval``, so ``cpu_percent`` reflects real usage rather than the
+    0.0 a cold read returns. When ``sampled_cpu`` (pid -> (latest, average)) is
+    supplied from the background sampler, priming and the wait are skipped.
+    Only the selected rows are materialized, as one :class:`Table`.
+    """
+
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+
+    if procfs.enabled():
+        try:
+            return procfs.top_processes(sort_by, limit, interval, sampled_cpu)
+        except OSError:
+            pass
+
+    processes = list(psutil.process_iter(attrs=["name"]))
+    if sampled_cpu is None and interval > 0:
+        _prime_cpu(processes)
+        time.sleep(interval)
+
+    selected = heapq.nlargest(limit, _measure(processes, sort_by, sampled_cpu), key=lambda row: (row[0], row[1]))
+
+    table = Table(table_columns(sort_by, sampled_cpu is not None), typecodes=COLUMN_TYPECODES)
+    for _, pid, proc, cpu, rss, io, fds in selected:
+        average = None if sampled_cpu is None else sampled_cpu.get(pid, (0.0, 0.0))[1]
+        table.append(table_row(pid, proc.info.get("name"), cpu, rss, io, fds, sort_by, average))
+    return table
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import psutil
-
 from .base import BaseTool, ToolResult
+from .process_engine import SORT_KEYS, top_processes
+from .sampler import get_sampler
+from .snapshot_cache import snapshot_cache
+from .table import Table
 
 
 class ProcessSnapshotTool(BaseTool):
     name = "get_process_snapshot"
-    description = "List top processes by CPU usage."
+    description = "List top processes by CPU, memory, I/O or open file descriptors."
     parameters_schema = {
         "type": "object",
         "properties": {
@@ -15,26 +17,29 @@ class ProcessSnapshotTool(BaseTool):
                 "type": "integer",
                 "description": "Max number of processes to return.",
                 "default": 20,
-            }
+            },
+            "sort_by": {
+                "type": "string",
+                "enum": list(SORT_KEYS),
+                "description": "Resource to rank processes by.",
+                "default": "cpu",
+            },
         },
         "required": [],
     }
 
-    def run(self, limit: int = 20) -> ToolResult:
-        processes = []
-        for proc in psutil.process_iter(attrs=["pid", "name", "cpu_percent", "memory_info"]):
-            try:
-                info = proc.info
-                processes.append(
-                    {
-                        "pid": info.get("pid"),
-                        "name": info.get("name"),
-                        "cpu_percent": info.get("cpu_percent"),
-                        "memory_mb": round((info.get("memory_info").rss or 0) / (1024 ** 2), 2),
-                    }
-                )
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+    def _collect(self, sort_by: str, limit: int) -> Table:
+        sampler = get_sampler()
+        # With the background sampler running, per-process CPU comes from its ring
+        # buffers and no priming interval is needed.
+        sampled_cpu = sampler.process_cpu() if sampler is not None else None
+        return top_processes(sort_by=sort_by, limit=limit, sampled_cpu=sampled_cpu)
+
+    def run(self, limit: int = 20, sort_by: str = "cpu") -> ToolResult:
+        if sort_by not in SORT_KEYS:
+            return ToolResult(success=False, data=[], error=f"sort_by must be one of {', '.join(SORT_KEYS)}")
 
-        processes_sorted = sorted(processes, key=lambda p: p.get("cpu_percent", 0), reverse=True)
-        return ToolResult(success=True, data=processes_sorted[:limit])
+        processes = snapshot_cache.get(
+            "processes", lambda: self._collect(sort_by, limit), key=(sort_by, limit)
+        )
+        return ToolResult(success=True, data=processes)
@@ -0,0 +1,253 @@
+"""Linux-native collectors that read ``/proc`` and ``/sys`` directly.
+
+They return the same shapes as the psutil-based code paths but skip psutil's
+per-process objects and namedtuples: files are read with ``os.readv`` into one
+reused per-thread buffer and directories are walked with ``os.scandir``. The
+backend is chosen with :func:`set_collector_backend`; callers fall back to
+psutil when :func:`enabled` is false or a read fails with ``OSError``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .table import Table
+
+BACKENDS = ("psutil", "procfs")
+PROC = "/proc"
+HWMON = "/sys/class/hwmon"
+BUFFER_SIZE = 16 * 1024
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# Kernel truncates comm to 15 characters; longer names are recovered from cmdline.
+_COMM_LENGTH = 15
+
+_backend = "psutil"
+_local = threading.local()
+
+
+def set_collector_backend(name: str) -> None:
+    global _backend
+    name = (name or "psutil").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Collector backend must be one of {', '.join(BACKENDS)}")
+    _backend = name
+
+
+def available() -> bool:
+    return sys.platform.startswith("linux") and os.path.exists(f"{PROC}/self/stat")
+
+
+def enabled() -> bool:
+    """Whether the ``procfs`` backend is selected and this host has ``/proc``."""
+    return _backend == "procfs" and available()
+
+
+def read_bytes(path: str) -> bytes:
+    """Whole file contents, read through the calling thread's reusable buffer."""
+
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        buffer = _local.buffer = bytearray(BUFFER_SIZE)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = 0
+        while True:
+            count = os.readv(fd, [memoryview(buffer)[size:]])
+            if count == 0:
+                break
+            size += count
+            if size == len(buffer):
+                buffer.extend(bytes(len(buffer)))
+    finally:
+        os.close(fd)
+    return bytes(buffer[:size])
+
+
+def _parse_pid_stat(data: bytes) -> Tuple[str, int, int]:
+    """``(comm, utime + stime ticks, rss pages)`` from ``/proc/<pid>/stat``."""
+
+    # comm may itself contain spaces and parentheses, so split around the last ")".
+    head, _, rest = data.rpartition(b")")
+    comm = head.partition(b"(")[2].decode("utf-8", "replace")
+    fields = rest.split()
+    # fields[0] is field 3 (state): utime/stime are fields 14/15, rss is field 24.
+    return comm, int(fields[11]) + int(fields[12]), int(fields[21])
+
+
+def iter_pid_stats(proc: str = PROC) -> Iterator[Tuple[int, str, int, int]]:
+    """Yield ``(pid, comm, cpu_ticks, rss_pages)`` for every process still alive."""
+
+    with os.scandir(proc) as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                comm, ticks, rss = _parse_pid_stat(read_bytes(f"{proc}/{entry.name}/stat"))
+            except (OSError, ValueError, IndexError):
+                continue
+            yield int(entry.name), comm, ticks, rss
+
+
+def _process_name(pid: int, comm: str, proc: str) -> str:
+    if len(comm) < _COMM_LENGTH:
+        return comm
+    try:
+        argv0 = read_bytes(f"{proc}/{pid}/cmdline").split(b"\0", 1)[0].decode("utf-8", "replace")
+    except OSError:
+        return comm
+    name = os.path.basename(argv0)
+    return name if name.startswith(comm) else comm
+
+
+def _io_bytes(pid: int, proc: str) -> Tuple[int, int]:
+    counters = {}
+    for line in read_bytes(f"{proc}/{pid}/io").splitlines():
+        key, _, value = line.partition(b":")
+        counters[key] = int(value)
+    return counters.get(b"read_bytes", 0), counters.get(b"write_bytes", 0)
+
+
+def _open_fds(pid: int, proc: str) -> int:
+    with os.scandir(f"{proc}/{pid}/fd") as entries:
+        return sum(1 for _ in entries)
+
+
+def top_processes(
+    sort_by: str = "cpu",
+    limit: int = 20,
+    interval: float = 0.1,
+    sampled_cpu: Optional[Dict[int, Tuple[float, float]]] = None,
+    proc: str = PROC,
+) -> Table:
+    """Same result as :func:`process_engine.top_processes`, read straight from ``/proc``."""
+
+    # Imported here so process_engine can import this module for the backend switch.
+    from .process_engine import COLUMN_TYPECODES, SORT_KEYS, rank_key, table_columns, table_row
+
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+
+    previous: Optional[Dict[int, int]] = None
+    if sampled_cpu is None and interval > 0:
+        previous = {pid: ticks for pid, _, ticks, _ in iter_pid_stats(proc)}
+        started = time.monotonic()
+        time.sleep(interval)
+        elapsed = time.monotonic() - started
+
+    def measured() -> Iterator[tuple]:
+        for pid, comm, ticks, rss_pages in iter_pid_stats(proc):
+            if sampled_cpu is not None:
+                cpu = sampled_cpu.get(pid, (0.0, 0.0))[0]
+            elif previous is not None and pid in previous:
+                cpu = (ticks - previous[pid]) / _CLOCK_TICKS / elapsed * 100
+            else:
+                cpu = 0.0
+            rss = rss_pages * _PAGE_SIZE
+            io = fds = None
+            try:
+                if sort_by == "io":
+                    io = _io_bytes(pid, proc)
+                elif sort_by == "fds":
+                    fds = _open_fds(pid, proc)
+            except PermissionError:
+                # Another user's process: list it without the reading, as the psutil backend does.
+                pass
+            except (OSError, ValueError):
+                continue
+            yield rank_key(sort_by, cpu, rss, io, fds), pid, comm, cpu, rss, io, fds
+
+    selected = heapq.nlargest(limit, measured(), key=lambda row: (row[0], row[1]))
+
+    table = Table(table_columns(sort_by, sampled_cpu is not None), typecodes=COLUMN_TYPECODES)
+    for _, pid, comm, cpu, rss, io, fds in selected:
+        average = None if sampled_cpu is None else sampled_cpu.get(pid, (0.0, 0.0))[1]
+        table.append(table_row(pid, _process_name(pid, comm, proc), cpu, rss, io, fds, sort_by, average))
+    return table
+
+
+def meminfo(proc: str = PROC) -> Dict[str, int]:
+    """``/proc/meminfo`` in bytes, keyed by field name."""
+
+    values = {}
+    for line in read_bytes(f"{proc}/meminfo").splitlines():
+        key, _, rest = line.partition(b":")
+        parts = rest.split()
+        if parts:
+            values[key.decode()] = int(parts[0]) * (1024 if len(parts) > 1 else 1)
+    return values
+
+
+def virtual_memory(proc: str = PROC) -> Tuple[int, int, float]:
+    """``(total, used, percent)`` computed the way psutil does on Linux."""
+
+    info = meminfo(proc)
+    total, free = info["MemTotal"], info["MemFree"]
+    cached = info.get("Cached", 0) + info.get("SReclaimable", 0)
+    used = total - free - info.get("Buffers", 0) - cached
+    if used < 0:
+        used = total - free
+    available = info.get("MemAvailable", free + cached)
+    percent = (total - available) / total * 100 if total else 0.0
+    return total, used, percent
+
+
+def cpu_times(proc: str = PROC) -> Tuple[int, int]:
+    """``(busy, total)`` jiffies for all CPUs from the first line of ``/proc/stat``."""
+
+    line = read_bytes(f"{proc}/stat").split(b"\n", 1)[0]
+    values = [int(value) for value in line.split()[1:]]
+    # guest and guest_nice are already counted in user and nice.
+    total = sum(values[:8])
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    return total - idle, total
+
+
+def cpu_percent(interval: float = 0.1, proc: str = PROC) -> float:
+    busy_before, total_before = cpu_times(proc)
+    time.sleep(interval)
+    busy_after, total_after = cpu_times(proc)
+    elapsed = total_after - total_before
+    return round((busy_after - busy_before) / elapsed * 100, 1) if elapsed > 0 else 0.0
+
+
+def _read_celsius(path: str) -> Optional[float]:
+    try:
+        return int(read_bytes(path)) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
+def hwmon_readings(hwmon: str = HWMON) -> List[Tuple[str, str, float, Optional[float], Optional[float]]]:
+    """``(chip, label, current, high, critical)`` for every ``temp*_input`` under hwmon."""
+
+    readings = []
+    try:
+        chips = sorted(os.scandir(hwmon), key=lambda entry: entry.name)
+    except OSError:
+        return readings
+    for chip in chips:
+        try:
+            chip_name = read_bytes(f"{chip.path}/name").decode().strip()
+            inputs = sorted(entry.name for entry in os.scandir(chip.path) if entry.name.endswith("_input"))
+        except OSError:
+            continue
+        for name in inputs:
+            if not name.startswith("temp"):
+                continue
+            prefix = f"{chip.path}/{name[: -len('_input')]}"
+            current = _read_celsius(f"{prefix}_input")
+            if current is None:
+                continue
+            try:
+                label = read_bytes(f"{prefix}_label").decode().strip()
+            except OSError:
+                label = ""
+            readings.append((chip_name, label, current, _read_celsius(f"{prefix}_max"), _read_celsius(f"{prefix}_crit")))
+    return readings
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from ..config import Config
+from .base import BaseTool, ToolResult
+
+
+class RemoteDiagnosticsTool(BaseTool):
+    name = "run_remote_diagnostics"
+    description = (
+        "Run one read-only diagnostic tool on remote hosts running the diagnoser agent "
+        "and return every host's result side by side."
+    )
+    parameters_schema = {
+        "type": "object",
+        "properties": {
+            "tool": {"type": "string", "description": "Name of the read-only tool to run", "default": "get_system_overview"},
+            "arguments": {"type": "object", "description": "Arguments for the tool"},
+            "hosts": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Subset of the configured agents (host or host:port); all of them when omitted",
+            },
+        },
+        "required": [],
+    }
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._controller = None
+        self._addresses: Optional[List[str]] = None
+
+    @property
+    def addresses(self) -> List[str]:
+        """Configured agents as ``host:port``."""
+
+        if self._addresses is None:
+            from ..remote.protocol import parse_addresses
+
+            self._addresses = parse_addresses(",".join(self.config.remote_hosts))
+        return self._addresses
+
+    @property
+    def controller(self):
+        if self._controller is None:
+            from ..remote.controller import RemoteController
+
+            self._controller = RemoteController(
+                self.addresses,
+                token=self.config.remote_token,
+                call_timeout=self.config.remote_timeout,
+            )
+        return self._controller
+
+    def close(self) -> None:
+        controller, self._controller = self._controller, None
+        if controller is not None:
+            controller.close()
+
+    def run(
+        self,
+        tool: str = "get_system_overview",
+        arguments: Optional[Dict[str, Any]] = None,
+        hosts: Optional[List[str]] = None,
+    ) -> ToolResult:
+        from ..agent.tools_registry import FIX_TOOL_NAMES
+        from ..remote.protocol import parse_addresses
+
+        if not self.config.remote_hosts:
+            return ToolResult(success=False, data={}, error="No remote agents configured; set REMOTE_HOSTS")
+        if tool in FIX_TOOL_NAMES or tool == self.name:
+            return ToolResult(success=False, data={}, error=f"{tool} cannot run remotely")
+
+        targets = self.addresses
+        if hosts:
+            # Only configured agents are reachable; the model cannot pick arbitrary addresses.
+            targets = parse_addresses(",".join(hosts))
+            unknown = [address for address in targets if address not in self.addresses]
+            if unknown:
+                return ToolResult(success=False, data={}, error=f"Not configured in REMOTE_HOSTS: {', '.join(unknown)}")
+
+        data = self.controller.run(tool, arguments or {}, targets)
+        if not data["succeeded"]:
+            return ToolResult(success=False, data=data, error="No remote agent returned a result")
+        return ToolResult(success=True, data=data)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import psutil
+
+from ..utils.ring_buffer import RingBuffer
+
+
+SYSTEM_METRICS = (
+    "cpu_percent",
+    "memory_percent",
+    "disk_read_bytes_per_s",
+    "disk_write_bytes_per_s",
+    "net_sent_bytes_per_s",
+    "net_recv_bytes_per_s",
+)
+PROCESS_HISTORY = 30
+
+
+class Sampler(threading.Thread):
+    """Background thread that records system and per-process metrics into ring buffers.
+
+    Tools read the most recent sample (and windowed stats over recent samples)
+    instead of blocking on their own measurement interval.
+    """
+
+    def __init__(self, interval: float = 1.0, capacity: int = 300, sample_processes: bool = True):
+        super().__init__(name="diagnostics-sampler", daemon=True)
+        self.interval = interval
+        self.capacity = capacity
+        self.sample_processes = sample_processes
+        self._timestamps = RingBuffer(capacity)
+        self._series: Dict[str, RingBuffer] = {name: RingBuffer(capacity) for name in SYSTEM_METRICS}
+        self._process_cpu: Dict[int, RingBuffer] = {}
+        self._previous_io: Optional[Tuple[float, object, object]] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        # Prime psutil's CPU counters so the first recorded sample is meaningful.
+        psutil.cpu_percent(interval=None)
+        while not self._stopped.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:  # noqa: BLE001 - keep sampling through transient psutil errors
+                continue
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _io_rates(self, now: float) -> Dict[str, float]:
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        previous = self._previous_io
+        self._previous_io = (now, disk, net)
+        rates = {name: 0.0 for name in SYSTEM_METRICS[2:]}
+        if previous is None:
+            return rates
+
+        elapsed = max(now - previous[0], 1e-6)
+        previous_disk, previous_net = previous[1], previous[2]
+        if disk is not None and previous_disk is not None:
+            rates["disk_read_bytes_per_s"] = (disk.read_bytes - previous_disk.read_bytes) / elapsed
+            rates["disk_write_bytes_per_s"] = (disk.write_bytes - previous_disk.write_bytes) / elapsed
+        if net is not None and previous_net is not None:
+            rates["net_sent_bytes_per_s"] = (net.bytes_sent - previous_net.bytes_sent) / elapsed
+            rates["net_recv_bytes_per_s"] = (net.bytes_recv - previous_net.bytes_recv) / elapsed
+        return rates
+
+    def _sample_processes(self) -> Dict[int, float]:
+        cpu: Dict[int, float] = {}
+        for proc in psutil.process_iter():
+            try:
+                # psutil keeps Process objects between process_iter calls, so this
+                # is the CPU share since the previous sample rather than a cold 0.0.
+                cpu[proc.pid] = proc.cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return cpu
+
+    def sample(self) -> None:
+        now = time.time()
+        values = {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+        }
+        values.update(self._io_rates(now))
+        process_cpu = self._sample_processes() if self.sample_processes else {}
+
+        with self._lock:
+            self._timestamps.append(now)
+            for name, value in values.items():
+                self._series[name].append(value)
+
+            if self.sample_processes:
+                for pid in [pid for pid in self._process_cpu if pid not in process_cpu]:
+                    del self._process_cpu[pid]
+                for pid, value in process_cpu.items():
+                    buffer = self._process_cpu.get(pid)
+                    if buffer is None:
+                        buffer = self._process_cpu[pid] = RingBuffer(PROCESS_HISTORY)
+                    buffer.append(value)
+
+    def has_samples(self) -> bool:
+        with self._lock:
+            return len(self._timestamps) > 0
+
+    def latest(self, metric: str) -> Optional[float]:
+        with self._lock:
+            return self._series[metric].latest()
+
+    def _window_count(self, seconds: float) -> int:
+        cutoff = time.time() - seconds
+        count = 0
+        for timestamp in self._timestamps.newest_first():
+            if timestamp < cutoff:
+                break
+            count += 1
+        return count
+
+    def window_stats(self, metric: str, seconds: float) -> Optional[Dict[str, float]]:
+        """Average, minimum and maximum of ``metric`` over the last ``seconds``."""
+
+        with self._lock:
+            count = self._window_count(seconds)
+            if not count:
+                return None
+            values = [value for _, value in zip(range(count), self._series[metric].newest_first())]
+        return {
+            "avg": round(sum(values) / count, 2),
+            "min": round(min(values), 2),
+            "max": round(max(values), 2),
+            "samples": count,
+        }
+
+    def trends(self, seconds: float = 60.0) -> Dict[str, object]:
+        trends: Dict[str, object] = {"window_seconds": seconds}
+        for metric in SYSTEM_METRICS:
+            stats = self.window_stats(metric, seconds)
+            if stats is not None:
+                trends[metric] = stats
+        return trends
+
+    def process_cpu(self) -> Dict[int, Tuple[float, float]]:
+        """Map of pid to ``(latest, average)`` CPU percent over the buffered history."""
+
+        with self._lock:
+            return {
+                pid: (buffer.latest() or 0.0, sum(buffer.newest_first()) / len(buffer))
+                for pid, buffer in self._process_cpu.items()
+                if len(buffer)
+            }
+
+
+_sampler: Optional[Sampler] = None
+_sampler_lock = threading.Lock()
+
+
+def start_sampler(interval: float = 1.0, capacity: int = 300, sample_processes: bool = True) -> Sampler:
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None or not _sampler.is_alive():
+            _sampler = Sampler(interval=interval, capacity=capacity, sample_processes=sample_processes)
+            _sampler.start()
+        return _sampler
+
+
+def get_sampler() -> Optional[Sampler]:
+    """Return the running sampler if one was started and has recorded data."""
+
+    sampler = _sampler
+    if sampler is None or not sampler.is_alive() or not sampler.has_samples():
+        return None
+    return sampler
+
+
+def stop_sampler() -> None:
+    global _sampler
+    with _sampler_lock:
+        if _sampler is not None:
+            _sampler.stop()
+            _sampler = None
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+
+DEFAULT_TTL = 5.0
+DEFAULT_TTLS: Dict[str, float] = {
+    "disk_partitions": 60.0,
+    "disk_usage": 10.0,
+    "processes": 2.0,
+    "sensors": 5.0,
+    # SMART reads wake drives and can take seconds each; refresh rarely.
+    "smart": 600.0,
+}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+
+
+class SnapshotCache:
+    """Thread-safe TTL cache for expensive system snapshots, keyed by data source.
+
+    Every source has its own TTL. Concurrent callers asking for the same missing
+    entry wait for a single load instead of rescanning in parallel. A load that
+    was running when :meth:`invalidate` was called is returned to its caller but
+    not cached. Values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttls: Dict[str, float] = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: Dict[Tuple[str, Hashable], _Entry] = {}
+        self._load_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+        self._stats: Dict[str, CacheStats] = {}
+        # Bumped by invalidate() so loads started before it do not store stale values.
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def configure(self, ttls: Mapping[str, float]) -> None:
+        with self._lock:
+            self.ttls.update(ttls)
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttls.get(source, self.default_ttl)
+
+    def _lookup(self, cache_key: Tuple[str, Hashable]) -> Optional[_Entry]:
+        entry = self._entries.get(cache_key)
+        if entry is not None and entry.expires_at > self._clock():
+            return entry
+        return None
+
+    def get(self, source: str, loader: Callable[[], Any], key: Hashable = None) -> Any:
+        """Return the cached value for ``(source, key)``, calling ``loader`` when stale."""
+
+        cache_key = (source, key)
+        with self._lock:
+            stats = self._stats.setdefault(source, CacheStats())
+            entry = self._lookup(cache_key)
+            if entry is not None:
+                stats.hits += 1
+                return entry.value
+            load_lock = self._load_locks.setdefault(cache_key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._lookup(cache_key)
+                if entry is not None:
+                    stats.hits += 1
+                    return entry.value
+                stats.misses += 1
+                generation = self._generation
+
+            ttl = self.ttl_for(source)
+            loaded = False
+            try:
+                value = loader()
+                loaded = True
+            finally:
+                with self._lock:
+                    if loaded and ttl > 0 and generation == self._generation:
+                        self._entries[cache_key] = _Entry(value=value, expires_at=self._clock() + ttl)
+                    # Callers already waiting hold this lock object; later ones find the entry.
+                    if self._load_locks.get(cache_key) is load_lock:
+                        del self._load_locks[cache_key]
+            return value
+
+    def invalidate(self, source: Optional[str] = None) -> None:
+        """Drop cached entries for ``source``, or every entry when no source is given."""
+
+        with self._lock:
+            self._generation += 1
+            if source is None:
+                self._entries.clear()
+                return
+            for cache_key in [k for k in self._entries if k[0] == source]:
+                del self._entries[cache_key]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {source: {"hits": s.hits, "misses": s.misses} for source, s in self._stats.items()}
+
+
+snapshot_cache = SnapshotCache()
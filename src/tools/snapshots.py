@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
+
+from .snapshot_cache import snapshot_cache
+
+
+def disk_partitions() -> List[Any]:
+    """Mounted partitions, shared by every tool through the snapshot cache."""
+    return snapshot_cache.get("disk_partitions", lambda: psutil.disk_partitions(all=False))
+
+
+def _load_disk_usages() -> List[Tuple[Any, Optional[Any]]]:
+    usages = []
+    for part in disk_partitions():
+        try:
+            usage = psutil.disk_usage(part.mountpoint)
+        except (PermissionError, OSError):
+            usage = None
+        usages.append((part, usage))
+    return usages
+
+
+def disk_usages() -> List[Tuple[Any, Optional[Any]]]:
+    """``(partition, usage)`` pairs; usage is ``None`` for unreadable mountpoints."""
+    return snapshot_cache.get("disk_usage", _load_disk_usages)
+
+
+def sensors_temperatures() -> Dict[str, List[Any]]:
+    """Temperature sensors keyed by chip label; raises if the platform has no support."""
+    return snapshot_cache.get("sensors", psutil.sensors_temperatures)
@@ -2,33 +2,50 @@ from __future__ import annotations
 
 import platform
 import time
-from typing import List
+from typing import List, Optional, Tuple
 
 import psutil
 
+from . import procfs
 from .base import BaseTool, ToolResult
-from ..utils.shell_utils import run_command
+from .inventory import hardware_inventory
+from .sampler import get_sampler
+from .snapshots import disk_usages
+from ..config import Config
+
+
+TREND_WINDOW_SECONDS = 60.0
+CPU_SAMPLE_INTERVAL = 0.1
 
 
 def _bytes_to_gb(value: float) -> float:
     return round(value / (1024 ** 3), 2)
 
 
-def _get_gpu_info() -> List[dict]:
-    success, stdout, _ = run_command([
-        "nvidia-smi",
-        "--query-gpu=name,driver_version",
-        "--format=csv,noheader",
-    ])
-    if not success or not stdout:
+def _gpus(inventory: dict) -> List[dict]:
+    gpus = inventory.get("gpus")
+    if not isinstance(gpus, list) or not gpus:
         return [{"name": "unknown", "driver_version": "unknown"}]
+    return [{"name": gpu["name"], "driver_version": gpu["driver_version"]} for gpu in gpus]
+
 
-    gpus = []
-    for line in stdout.splitlines():
-        parts = [p.strip() for p in line.split(",")]
-        if len(parts) >= 2:
-            gpus.append({"name": parts[0], "driver_version": parts[1]})
-    return gpus or [{"name": "unknown", "driver_version": "unknown"}]
+def _memory() -> Tuple[int, int, float]:
+    if procfs.enabled():
+        try:
+            return procfs.virtual_memory()
+        except (OSError, KeyError, ValueError):
+            pass
+    memory = psutil.virtual_memory()
+    return memory.total, memory.used, memory.percent
+
+
+def _cpu_percent() -> float:
+    if procfs.enabled():
+        try:
+            return procfs.cpu_percent(CPU_SAMPLE_INTERVAL)
+        except (OSError, ValueError):
+            pass
+    return psutil.cpu_percent(interval=CPU_SAMPLE_INTERVAL)
 
 
 class SystemOverviewTool(BaseTool):
@@ -36,17 +53,26 @@ class SystemOverviewTool(BaseTool):
     description = "Get summary of OS, CPU, RAM, GPU, and disk usage."
     parameters_schema: dict = {"type": "object", "properties": {}, "required": []}
 
+    def __init__(self, config: Optional[Config] = None):
+        self.inventory_path = config.inventory_cache_path if config else None
+
     def run(self) -> ToolResult:
+        # Static facts come from the per-boot inventory; only the metrics below are sampled live.
+        inventory = hardware_inventory(self.inventory_path)
+        os_info = inventory.get("os") or {}
+        cpu_info = inventory.get("cpu") or {}
         boot_time = psutil.boot_time()
         uptime_seconds = int(time.time() - boot_time)
-        virtual_mem = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        memory_total, memory_used, memory_percent = _memory()
+        sampler = get_sampler()
+        if sampler is not None:
+            cpu_percent = sampler.latest("cpu_percent")
+        else:
+            cpu_percent = _cpu_percent()
 
         disks = []
-        for part in psutil.disk_partitions():
-            try:
-                usage = psutil.disk_usage(part.mountpoint)
-            except PermissionError:
+        for part, usage in disk_usages():
+            if usage is None:
                 continue
             disks.append(
                 {
@@ -58,23 +84,25 @@ class SystemOverviewTool(BaseTool):
             )
 
         result = {
-            "os": platform.system(),
-            "os_version": platform.version(),
+            "os": os_info.get("system") or platform.system(),
+            "os_version": os_info.get("version") or platform.version(),
             "hostname": platform.node(),
             "uptime_seconds": uptime_seconds,
             "cpu": {
-                "model": platform.processor() or "unknown",
-                "cores_physical": psutil.cpu_count(logical=False) or 0,
-                "cores_logical": psutil.cpu_count(logical=True) or 0,
+                "model": cpu_info.get("model") or "unknown",
+                "cores_physical": cpu_info.get("cores_physical") or 0,
+                "cores_logical": cpu_info.get("cores_logical") or 0,
                 "usage_percent": cpu_percent,
             },
             "ram": {
-                "total_gb": _bytes_to_gb(virtual_mem.total),
-                "used_gb": _bytes_to_gb(virtual_mem.used),
-                "usage_percent": round(virtual_mem.percent, 2),
+                "total_gb": _bytes_to_gb(memory_total),
+                "used_gb": _bytes_to_gb(memory_used),
+                "usage_percent": round(memory_percent, 2),
             },
-            "gpus": _get_gpu_info(),
+            "gpus": _gpus(inventory),
             "disks": disks,
         }
+        if sampler is not None:
+            result["trends"] = sampler.trends(TREND_WINDOW_SECONDS)
 
         return ToolResult(success=True, data=result)
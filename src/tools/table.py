@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+Column = Union[array, List[Any]]
+
+
+class Table:
+    """Column-oriented rows for tool results with many uniform records.
+
+    Numeric columns named in ``typecodes`` are stored in :class:`array.array`,
+    the rest in plain lists, so no per-row dict is allocated. The JSON form is a
+    header plus value rows: ``{"columns": [...], "rows": [[...], ...]}``.
+    """
+
+    __slots__ = ("columns", "_data")
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]] = (),
+        typecodes: Optional[Mapping[str, str]] = None,
+    ):
+        self.columns: Tuple[str, ...] = tuple(columns)
+        typecodes = typecodes or {}
+        self._data: List[Column] = [array(typecodes[name]) if name in typecodes else [] for name in self.columns]
+        for row in rows:
+            self.append(row)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]], columns: Optional[Sequence[str]] = None) -> "Table":
+        records = list(records)
+        if columns is None:
+            columns = list(dict.fromkeys(key for record in records for key in record))
+        return cls(columns, ([record.get(name) for name in columns] for record in records))
+
+    def _copy_with(self, data: List[Column]) -> "Table":
+        table = Table.__new__(Table)
+        table.columns = self.columns
+        table._data = data
+        return table
+
+    def append(self, row: Sequence[Any]) -> None:
+        if len(row) != len(self._data):
+            raise ValueError(f"Expected {len(self._data)} values, got {len(row)}")
+        for column, value in zip(self._data, row):
+            column.append(value)
+
+    def __len__(self) -> int:
+        return len(self._data[0]) if self._data else 0
+
+    def __repr__(self) -> str:
+        return f"Table(columns={list(self.columns)}, rows={len(self)})"
+
+    def column(self, name: str) -> List[Any]:
+        return list(self._data[self.columns.index(name)])
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        return zip(*self._data)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Rows as dicts, for consumers that want them one at a time."""
+        return (dict(zip(self.columns, row)) for row in self.rows())
+
+    def head(self, count: int) -> "Table":
+        return self._copy_with([column[:count] for column in self._data])
+
+    def rounded(self, digits: int) -> "Table":
+        data: List[Column] = []
+        for column in self._data:
+            if isinstance(column, array) and column.typecode in "fd":
+                data.append(array(column.typecode, (round(value, digits) for value in column)))
+            elif isinstance(column, array):
+                data.append(column)
+            else:
+                data.append([round(value, digits) if isinstance(value, float) else value for value in column])
+        return self._copy_with(data)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"columns": list(self.columns), "rows": [list(row) for row in self.rows()]}
+
+
+def json_default(value: Any) -> Any:
+    """``default=`` hook for ``json.dumps`` that encodes tables and stringifies the rest."""
+
+    if isinstance(value, Table):
+        return value.to_json()
+    return str(value)
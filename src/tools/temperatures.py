@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-import psutil
-
+from . import procfs
 from .base import BaseTool, ToolResult
+from .snapshot_cache import snapshot_cache
+from .snapshots import sensors_temperatures
+from .table import Table
+
+READING_COLUMNS = ("chip", "label", "current", "high", "critical")
 
 
 class TemperatureTool(BaseTool):
@@ -11,13 +15,21 @@ class TemperatureTool(BaseTool):
     parameters_schema: dict = {"type": "object", "properties": {}, "required": []}
 
     def run(self) -> ToolResult:
+        if procfs.enabled():
+            rows = snapshot_cache.get("sensors", procfs.hwmon_readings, key="hwmon")
+            if rows:
+                return ToolResult(success=True, data=Table(READING_COLUMNS, rows, typecodes={"current": "d"}))
+
         try:
-            temps = psutil.sensors_temperatures()
+            temps = sensors_temperatures()
         except (AttributeError, NotImplementedError):
             return ToolResult(success=False, data={}, error="Temperature readings not supported")
 
         if not temps:
             return ToolResult(success=False, data={}, error="No temperature sensors detected")
 
-        simplified = {label: [entry._asdict() for entry in entries] for label, entries in temps.items()}
-        return ToolResult(success=True, data=simplified)
+        readings = Table(READING_COLUMNS, typecodes={"current": "d"})
+        for chip, entries in temps.items():
+            for entry in entries:
+                readings.append((chip, entry.label, entry.current, entry.high, entry.critical))
+        return ToolResult(success=True, data=readings)
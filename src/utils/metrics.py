@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+SERVICE_NAME = "ai-system-diagnoser"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+MAX_SPANS = 2000
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _prometheus_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _otlp_attributes(items) -> List[dict]:
+    return [{"key": key, "value": {"stringValue": str(value)}} for key, value in items]
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+@dataclass
+class _HistogramSeries:
+    bucket_counts: List[int]
+    total: float = 0.0
+    count: int = 0
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.series: Dict[LabelKey, _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = _HistogramSeries(bucket_counts=[0] * (len(self.buckets) + 1))
+            series.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+            series.total += value
+            series.count += 1
+
+
+@dataclass
+class Span:
+    name: str
+    start_ns: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    end_ns: int = 0
+    status: str = "ok"
+    span_id: str = field(default_factory=lambda: os.urandom(8).hex())
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+class MetricsRegistry:
+    """In-process counters, histograms and recent spans with Prometheus and OTLP-style export.
+
+    ``span(name, **labels)`` times a block, keeps the span for export, counts it in
+    ``<name>_total`` by status and observes ``<name>_duration_seconds``; the labels
+    given when the span opens become the metric labels.
+    """
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.counters: Dict[str, Counter] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.trace_id = os.urandom(16).hex()
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        with self._lock:
+            if name not in self.counters:
+                self.counters[name] = Counter(name, help_text)
+            return self.counters[name]
+
+    def histogram(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram(name, help_text, buckets)
+            return self.histograms[name]
+
+    @contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[Span]:
+        span = Span(name=name, start_ns=time.time_ns(), attributes=dict(labels))
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            span.end_ns = span.start_ns + int(elapsed * 1e9)
+            self.spans.append(span)
+            self.histogram(f"{name}_duration_seconds", f"Duration of {name} spans").observe(elapsed, **labels)
+            self.counter(f"{name}_total", f"Completed {name} spans").inc(status=span.status, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.spans.clear()
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        for counter in list(self.counters.values()):
+            lines.append(f"# HELP {counter.name} {counter.help_text}")
+            lines.append(f"# TYPE {counter.name} counter")
+            for key, value in sorted(counter.values.items()):
+                lines.append(f"{counter.name}{_prometheus_labels(key)} {value:g}")
+        for histogram in list(self.histograms.values()):
+            lines.append(f"# HELP {histogram.name} {histogram.help_text}")
+            lines.append(f"# TYPE {histogram.name} histogram")
+            for key, series in sorted(histogram.series.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), series.bucket_counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{histogram.name}_bucket{_prometheus_labels(key, ('le', le))} {cumulative}")
+                lines.append(f"{histogram.name}_sum{_prometheus_labels(key)} {series.total:.6f}")
+                lines.append(f"{histogram.name}_count{_prometheus_labels(key)} {series.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Metrics and spans shaped like the OTLP/JSON export format."""
+
+        now_ns = time.time_ns()
+        metrics: List[dict] = []
+        for counter in list(self.counters.values()):
+            points = [
+                {"attributes": _otlp_attributes(key), "asDouble": value, "timeUnixNano": str(now_ns)}
+                for key, value in counter.values.items()
+            ]
+            metrics.append(
+                {
+                    "name": counter.name,
+                    "description": counter.help_text,
+                    "sum": {"dataPoints": points, "aggregationTemporality": 2, "isMonotonic": True},
+                }
+            )
+        for histogram in list(self.histograms.values()):
+            points = [
+                {
+                    "attributes": _otlp_attributes(key),
+                    "count": str(series.count),
+                    "sum": series.total,
+                    "bucketCounts": [str(count) for count in series.bucket_counts],
+                    "explicitBounds": list(histogram.buckets),
+                    "timeUnixNano": str(now_ns),
+                }
+                for key, series in histogram.series.items()
+            ]
+            metrics.append(
+                {
+                    "name": histogram.name,
+                    "description": histogram.help_text,
+                    "unit": "s",
+                    "histogram": {"dataPoints": points, "aggregationTemporality": 2},
+                }
+            )
+
+        spans = [
+            {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": _otlp_attributes(span.attributes.items()),
+                "status": {"code": 1 if span.status == "ok" else 2, "message": span.status},
+            }
+            for span in list(self.spans)
+        ]
+        resource = {"attributes": _otlp_attributes([("service.name", SERVICE_NAME)])}
+        scope = {"name": "ai_system_diagnoser"}
+        return {
+            "resourceMetrics": [{"resource": resource, "scopeMetrics": [{"scope": scope, "metrics": metrics}]}],
+            "resourceSpans": [{"resource": resource, "scopeSpans": [{"scope": scope, "spans": spans}]}],
+        }
+
+    def export(self, path: Path) -> None:
+        """Write ``.json`` paths as OTLP-style JSON and anything else as Prometheus text."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            text = json.dumps(self.to_otlp(), default=str)
+        else:
+            text = self.to_prometheus()
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, List, Optional
+
+
+class RingBuffer:
+    """Fixed-capacity numeric buffer backed by a preallocated ``array``.
+
+    Appending never allocates once the buffer is created; the oldest value is
+    overwritten when the buffer is full.
+    """
+
+    __slots__ = ("capacity", "_data", "_next", "_size")
+
+    def __init__(self, capacity: int, typecode: str = "d"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = array(typecode, [0]) * capacity
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float) -> None:
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def latest(self) -> Optional[float]:
+        if not self._size:
+            return None
+        return self._data[self._next - 1]
+
+    def newest_first(self) -> Iterator[float]:
+        index = self._next
+        for _ in range(self._size):
+            index = (index - 1) % self.capacity
+            yield self._data[index]
+
+    def values(self) -> List[float]:
+        """Return the buffered values from oldest to newest."""
+        values = list(self.newest_first())
+        values.reverse()
+        return values
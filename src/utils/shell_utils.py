@@ -1,17 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import locale
+import os
+import signal
 import subprocess
-from typing import List, Tuple
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple, TypeVar
 
+from .metrics import metrics
 
-def run_command(command: List[str], timeout: int = 30) -> Tuple[bool, str, str]:
-    """Run a command and return (success, stdout, stderr)."""
+DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+DEFAULT_MAX_CONCURRENT_COMMANDS = 4
+_READ_LIMIT = 64 * 1024
+# How long to wait for a killed process to exit and its pipes to drain.
+_KILL_GRACE = 1.0
+
+T = TypeVar("T")
+LineCallback = Callable[[str], Optional[bool]]
+
+
+@dataclass
+class CommandResult:
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    truncated: bool = False
+    stopped_early: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+
+class CommandSlots:
+    """Cap on running external commands, shared by every thread and event loop."""
+
+    def __init__(self, limit: int):
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    async def acquire(self) -> None:
+        # A threading semaphore bounds commands across all threads and loops;
+        # polling it keeps acquisition cancellable without parking a thread.
+        delay = 0.005
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+_slots = CommandSlots(DEFAULT_MAX_CONCURRENT_COMMANDS)
+
+
+def set_max_concurrent_commands(limit: int) -> None:
+    global _slots
+    _slots = CommandSlots(max(1, limit))
+
+
+class _OutputBuffer:
+    """Keeps the lines holding the most recent ``max_bytes`` of output, or all of it for ``None``."""
+
+    def __init__(self, max_bytes: Optional[int]):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.truncated = False
+        self._lines: Deque[Tuple[str, int]] = deque()
+
+    def append(self, line: str, size: int) -> None:
+        self._lines.append((line, size))
+        self.size += size
+        if self.max_bytes is None:
+            return
+        while self.size > self.max_bytes and len(self._lines) > 1:
+            self.size -= self._lines.popleft()[1]
+            self.truncated = True
+
+    def text(self) -> str:
+        return "".join(line for line, _ in self._lines)
+
+
+def _new_process_group_kwargs() -> dict:
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is not None:
+        return
+    try:
+        if os.name == "nt":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True, check=False
+            )
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _read_whole_line(stream: asyncio.StreamReader) -> bytes:
+    """``readline`` without the reader limit, for uncapped output such as one-line JSON."""
+
+    parts = []
+    while True:
+        try:
+            parts.append(await stream.readuntil(b"\n"))
+        except asyncio.IncompleteReadError as exc:
+            parts.append(exc.partial)
+        except asyncio.LimitOverrunError as exc:
+            parts.append(await stream.readexactly(exc.consumed))
+            continue
+        return b"".join(parts)
+
+
+async def _pump(
+    stream: asyncio.StreamReader,
+    buffer: _OutputBuffer,
+    encoding: str,
+    on_line: Optional[LineCallback],
+) -> bool:
+    """Copy ``stream`` into ``buffer`` line by line; return True if ``on_line`` asked to stop."""
+
+    while True:
+        try:
+            raw = await (stream.readline() if buffer.max_bytes is not None else _read_whole_line(stream))
+        except ValueError:
+            # Line longer than the reader limit; asyncio drops it from the buffer.
+            buffer.truncated = True
+            continue
+        if not raw:
+            return False
+        line = raw.decode(encoding, errors="replace")
+        buffer.append(line, len(raw))
+        if on_line is not None and on_line(line.rstrip("\r\n")):
+            return True
+
+
+async def run_command_async(
+    command: List[str],
+    timeout: float = 30,
+    max_output_bytes: Optional[int] = DEFAULT_MAX_OUTPUT_BYTES,
+    on_line: Optional[LineCallback] = None,
+    slots: Optional[CommandSlots] = None,
+) -> CommandResult:
+    """Run ``command`` without blocking the event loop.
+
+    Output is decoded and passed line by line to ``on_line`` as it arrives; returning
+    a truthy value from the callback stops the command early. Only the last
+    ``max_output_bytes`` of stdout and stderr are retained (``result.truncated``
+    says whether any were dropped); callers that parse the whole output, such as
+    JSON, pass ``None`` to keep all of it. On timeout or
+    cancellation the whole process group is killed. Commands wait for one of
+    ``slots``, by default the process-wide ``MAX_CONCURRENT_COMMANDS`` budget.
+    """
+
+    slots = slots or _slots
+    await slots.acquire()
+    try:
+        program = os.path.basename(command[0]) if command else ""
+        with metrics.span("subprocess", command=program) as span:
+            result = await _run_process(command, timeout, max_output_bytes, on_line)
+            if result.timed_out:
+                span.status = "timeout"
+            elif not result.success and not result.stopped_early:
+                span.status = "error"
+            return result
+    finally:
+        slots.release()
+
+
+async def _run_process(
+    command: List[str],
+    timeout: float,
+    max_output_bytes: Optional[int],
+    on_line: Optional[LineCallback],
+) -> CommandResult:
+    encoding = locale.getpreferredencoding(False)
+    stdout_buffer = _OutputBuffer(max_output_bytes)
+    stderr_buffer = _OutputBuffer(max_output_bytes)
     try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_READ_LIMIT,
+            **_new_process_group_kwargs(),
         )
-        return (result.returncode == 0, result.stdout.strip(), result.stderr.strip())
-    except (OSError, subprocess.TimeoutExpired) as exc:
-        return False, "", str(exc)
+    except OSError as exc:
+        return CommandResult(returncode=None, stdout="", stderr=str(exc))
+
+    stdout_task = asyncio.ensure_future(_pump(proc.stdout, stdout_buffer, encoding, on_line))
+    stderr_task = asyncio.ensure_future(_pump(proc.stderr, stderr_buffer, encoding, None))
+    timed_out = False
+    stopped_early = False
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        done, _ = await asyncio.wait({stdout_task}, timeout=timeout)
+        if not done:
+            timed_out = True
+        elif stdout_task.result():
+            stopped_early = True
+        if timed_out or stopped_early:
+            _kill_process_group(proc)
+            remaining = _KILL_GRACE
+        else:
+            # stdout closed, but the process may still be running: it gets what is left of the budget.
+            remaining = max(deadline - loop.time(), _KILL_GRACE)
+        await asyncio.wait_for(asyncio.gather(stderr_task, proc.wait()), timeout=remaining)
+    except asyncio.TimeoutError:
+        timed_out = True
+        _kill_process_group(proc)
+        await proc.wait()
+    except BaseException:
+        # Cancellation, or an ``on_line`` callback that raised: never leave the child running.
+        _kill_process_group(proc)
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(proc.wait(), _KILL_GRACE)
+        raise
+    finally:
+        for task in (stdout_task, stderr_task):
+            task.cancel()
+
+    stderr = stderr_buffer.text()
+    if timed_out:
+        stderr = (stderr + f"\nCommand timed out after {timeout:g}s").lstrip()
+    return CommandResult(
+        returncode=proc.returncode,
+        stdout=stdout_buffer.text(),
+        stderr=stderr,
+        timed_out=timed_out,
+        truncated=stdout_buffer.truncated or stderr_buffer.truncated,
+        stopped_early=stopped_early,
+    )
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code, even inside a running loop."""
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def run_command_streaming(
+    command: List[str],
+    on_line: LineCallback,
+    timeout: float = 30,
+    max_output_bytes: Optional[int] = DEFAULT_MAX_OUTPUT_BYTES,
+) -> CommandResult:
+    """Synchronous wrapper around :func:`run_command_async` for line-by-line consumers."""
+
+    return run_sync(
+        run_command_async(command, timeout=timeout, max_output_bytes=max_output_bytes, on_line=on_line)
+    )
+
+
+def run_command(
+    command: List[str], timeout: int = 30, max_output_bytes: Optional[int] = DEFAULT_MAX_OUTPUT_BYTES
+) -> Tuple[bool, str, str]:
+    """Run a command and return (success, stdout, stderr)."""
+    result = run_sync(run_command_async(command, timeout=timeout, max_output_bytes=max_output_bytes))
+    return (result.success, result.stdout.strip(), result.stderr.strip())
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.async_conversation import INTERRUPTED_NOTE, AsyncConversationRunner
+from src.agent.history import HistoryManager
+from src.agent.tool_executor import AsyncToolExecutor, ToolCall
+from src.agent.transport import AsyncModelTransport, ModelCallError
+from src.config import Config
+from src.tools.base import AsyncTool, BaseTool, ToolResult
+
+
+def _config(**overrides):
+    values = dict(openai_api_key="test", model_name="test", mode="diagnostic_only", confirm_fixes=True)
+    values.update(overrides)
+    return Config(**values)
+
+
+def _chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _tool_delta(index, call_id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncCompletions:
+    def __init__(self, rounds):
+        self.rounds = list(rounds)
+        self.streams = []
+
+    async def create(self, **kwargs):
+        outcome = self.rounds.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        self.streams.append(FakeStream(outcome))
+        return self.streams[-1]
+
+
+class CountingTool(BaseTool):
+    def __init__(self):
+        self.calls = []
+
+    def run(self, **kwargs) -> ToolResult:
+        self.calls.append(kwargs)
+        return ToolResult(success=True, data={"call": len(self.calls)})
+
+
+class HangingTool(AsyncTool):
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def arun(self, **kwargs) -> ToolResult:
+        self.started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return ToolResult(success=True, data={})
+
+
+def _runner(rounds):
+    runner = AsyncConversationRunner(_config())
+    completions = FakeAsyncCompletions(rounds)
+    runner.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return runner, completions
+
+
+def test_first_turn_starts_with_prefetched_results():
+    runner, completions = _runner(
+        [
+            [_chunk(tool_calls=[_tool_delta(0, "call_1", "get_process_snapshot", '{"limit": 3}')])],
+            [_chunk(content="Looks "), _chunk(content="fine.")],
+        ]
+    )
+    runner.config.prefetch_tools = ["get_system_overview", "restart_service"]
+    overview, processes = CountingTool(), CountingTool()
+    runner.tools_registry["get_system_overview"] = overview
+    runner.tools_registry["get_process_snapshot"] = processes
+
+    async def session():
+        prefetch = runner._start_prefetch()
+        history = HistoryManager("test")
+        history.start_turn("slow?")
+        await runner._arun_turn(history, prefetch.take())
+        assert prefetch.take() is None
+        return history.messages()
+
+    messages = asyncio.run(session())
+
+    assert overview.calls == [{}]
+    assert processes.calls == [{"limit": 3}]
+    assert [message["role"] for message in messages] == [
+        "system", "user", "assistant", "tool", "assistant", "tool", "assistant",
+    ]
+    assert messages[2]["tool_calls"][0]["id"] == messages[3]["tool_call_id"] == "prefetch_get_system_overview"
+    assert messages[-1] == {"role": "assistant", "content": "Looks fine."}
+    assert all(stream.closed for stream in completions.streams)
+
+
+def test_cancelled_turn_cancels_tools_and_keeps_history_consistent():
+    runner, _ = _runner([[_chunk(tool_calls=[_tool_delta(0, "call_1", "check_network_connectivity", "{}")])]])
+    tool = HangingTool()
+    runner.tools_registry["check_network_connectivity"] = tool
+    history = HistoryManager("test")
+    history.start_turn("is the network up?")
+
+    async def interrupt():
+        turn = asyncio.ensure_future(runner._interruptible_turn(history))
+        await asyncio.wait_for(tool.started.wait(), 5)
+        # Stands in for the SIGINT handler, which cancels the turn task.
+        [inner] = [task for task in asyncio.all_tasks() if task.get_coro().__name__ == "_arun_turn"]
+        inner.cancel()
+        await turn
+
+    asyncio.run(interrupt())
+
+    assert tool.cancelled
+    assert [message["role"] for message in history.messages()] == ["system", "user", "assistant"]
+    assert history.messages()[-1]["content"] == INTERRUPTED_NOTE
+
+
+def test_fix_tools_wait_for_async_confirmation():
+    confirmations = []
+
+    async def confirm(name, args):
+        confirmations.append((name, args))
+        return False
+
+    tool = CountingTool()
+    executor = AsyncToolExecutor({"restart_service": tool}, logging.getLogger("test"), confirm=confirm)
+    [(_, result)] = asyncio.run(executor.run_calls([ToolCall(id="1", name="restart_service", arguments='{"name": "nginx"}')]))
+
+    assert confirmations == [("restart_service", {"name": "nginx"})]
+    assert result.error == "User declined" and tool.calls == []
+
+
+def test_sync_and_async_tool_adapters():
+    class Echo(AsyncTool):
+        async def arun(self, **kwargs):
+            return ToolResult(success=True, data=kwargs)
+
+    assert Echo().run(value=1).data == {"value": 1}
+    assert asyncio.run(CountingTool().arun(limit=2)).data == {"call": 1}
+
+    executor = AsyncToolExecutor({"slow": HangingTool()}, logging.getLogger("test"), timeouts={"slow": 0.05})
+    started = time.monotonic()
+    [(_, result)] = asyncio.run(executor.run_calls([ToolCall(id="1", name="slow")]))
+    assert result.error == "Tool timed out after 0.05s"
+    assert time.monotonic() - started < 1
+
+
+def test_async_transport_retries_without_blocking():
+    class Unavailable(Exception):
+        status_code = 503
+        response = SimpleNamespace(headers={})
+
+    delays = []
+
+    async def sleep(seconds):
+        delays.append(seconds)
+
+    transport = AsyncModelTransport(_config(), sleep=sleep, jitter=lambda: 1.0)
+    completions = FakeAsyncCompletions([Unavailable(), [_chunk(content="ok")]])
+    transport.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    stream = asyncio.run(transport.create(model="m", messages=[]))
+    assert stream is completions.streams[0]
+    assert delays == [0.5]
+
+
+def test_async_stream_stalled_past_the_deadline_is_cut_off():
+    class StalledStream(FakeStream):
+        async def __anext__(self):
+            if self.chunks:
+                return self.chunks.pop(0)
+            await asyncio.sleep(60)
+
+    stream = StalledStream([_chunk(content="Par")])
+
+    async def create(**kwargs):
+        return stream
+
+    transport = AsyncModelTransport(_config(model_deadline=0.2))
+    transport.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    async def consume():
+        return [chunk async for chunk in transport.stream(model="m", messages=[])]
+
+    started = time.monotonic()
+    with pytest.raises(ModelCallError, match="deadline"):
+        asyncio.run(consume())
+    assert time.monotonic() - started < 2
+    assert stream.closed and transport.breaker._failures == 1
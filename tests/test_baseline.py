@@ -0,0 +1,134 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.collect import collect_report
+from src.config import Config, load_config
+from src.tools.baseline import BaselineStore, extract_metrics
+from src.tools.table import Table
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_diff_returns_only_deviating_metrics(tmp_path):
+    clock = FakeClock()
+    store = BaselineStore(tmp_path / "baseline.db", clock=clock)
+    for cpu in (10, 12, 11, 9, 10, 13, 11, 10):
+        assert store.record("web1", {"cpu.usage_percent": cpu, "ram.usage_percent": 40.0, "disk./.usage_percent": 70})
+        clock.now += 600
+    store.record("web2", {"cpu.usage_percent": 95.0})
+
+    diff = store.diff(
+        "web1",
+        {"cpu.usage_percent": 85.0, "ram.usage_percent": 41.0, "disk./.usage_percent": 95, "process.x.cpu_percent": 50},
+    )
+    assert [item["metric"] for item in diff["anomalies"]] == ["disk./.usage_percent", "cpu.usage_percent"]
+    assert diff["anomalies"][0]["z_score"] is None  # flat baseline, large relative change
+    assert diff["anomalies"][1]["baseline_mean"] == 10.75
+    assert diff["new_metrics"] == {"process.x.cpu_percent": 50}
+    assert diff["baseline_snapshots"] == 8
+
+    assert store.diff("web1", {"cpu.usage_percent": 11.5})["anomalies"] == []
+    # Too little history for web2 to judge anything.
+    assert store.diff("web2", {"cpu.usage_percent": 5.0}) == {
+        "baseline_snapshots": 1,
+        "anomalies": [],
+        "new_metrics": {},
+    }
+
+
+def test_record_is_throttled_and_old_samples_pruned(tmp_path):
+    clock = FakeClock()
+    store = BaselineStore(tmp_path / "baseline.db", clock=clock)
+    assert store.record("h", {"m": 1.0}, min_interval=300)
+    clock.now += 60
+    assert not store.record("h", {"m": 2.0}, min_interval=300)
+    clock.now += 40 * 86400
+    assert store.record("h", {"m": 3.0}, retention_days=30)
+
+    with sqlite3.connect(tmp_path / "baseline.db") as conn:
+        assert conn.execute("SELECT value FROM samples").fetchall() == [(3.0,)]
+        plan = " ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT AVG(value) FROM samples WHERE host = 'h' AND metric IN ('m') AND ts >= 0"
+        ))
+    assert "samples_host_metric_ts" in plan
+
+
+def test_extract_metrics_from_tool_results():
+    metrics = extract_metrics(
+        {
+            "get_system_overview": {"cpu": {"usage_percent": 5}, "ram": {"usage_percent": 30.5}, "disks": []},
+            "get_process_snapshot": Table(
+                ("pid", "name", "cpu_percent", "memory_mb"), [(1, "nginx", 2.0, 10.0), (2, "nginx", 3.0, 12.0)]
+            ),
+            "get_disk_health": {"drives": [{"device": "sda", "io": {"read_latency_ms": 4.5}}]},
+            "get_temperature_readings": {"ignored": 1},
+        }
+    )
+    assert metrics == {
+        "cpu.usage_percent": 5.0,
+        "ram.usage_percent": 30.5,
+        "process.nginx.cpu_percent": 5.0,
+        "process.nginx.memory_mb": 22.0,
+        "diskio.sda.read_latency_ms": 4.5,
+    }
+
+
+def test_collect_records_to_baseline_and_reports_anomalies(tmp_path):
+    config = Config(
+        openai_api_key=None,
+        model_name="test",
+        mode="diagnostic_only",
+        confirm_fixes=True,
+        baseline_db_path=tmp_path / "baseline.db",
+    )
+    report = collect_report(config, ["get_system_overview", "get_anomalies"])
+
+    assert set(report["tools"]) == {"get_system_overview"}
+    assert report["anomalies"]["metrics_compared"] >= 2
+    assert BaselineStore(config.baseline_db_path).last_recorded(report["host"]) is not None
+
+
+def test_baseline_store_defaults_to_the_user_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv("BASELINE_DB_PATH", raising=False)
+    assert load_config(tmp_path / "missing.env").baseline_db_path == tmp_path / "ai-system-diagnoser" / "baseline.sqlite3"
+
+    monkeypatch.setenv("BASELINE_DB_PATH", "")
+    assert load_config(tmp_path / "missing.env").baseline_db_path is None
+
+
+def test_process_metrics_need_most_snapshots_to_be_judged(tmp_path):
+    clock = FakeClock()
+    store = BaselineStore(tmp_path / "baseline.db", clock=clock)
+    for index in range(10):
+        metrics = {"cpu.usage_percent": 10.0, "process.steady.cpu_percent": 5.0 + index % 2}
+        if index % 2:
+            # Only in the top N while busy.
+            metrics["process.bursty.cpu_percent"] = 80.0 + index
+        store.record("web1", metrics)
+        clock.now += 600
+
+    diff = store.diff("web1", {"process.steady.cpu_percent": 60.0, "process.bursty.cpu_percent": 2.0})
+    assert [item["metric"] for item in diff["anomalies"]] == ["process.steady.cpu_percent"]
+
+
+def test_schema_is_created_once_per_database(tmp_path, monkeypatch):
+    path = tmp_path / "baseline.db"
+    BaselineStore(path)
+
+    def no_connections(self):
+        raise AssertionError("schema recreated")
+
+    monkeypatch.setattr(BaselineStore, "_connect", no_connections)
+    BaselineStore(path)
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from benchmarks.harness import percentile
+from benchmarks.run import bench_conversation, compare
+
+
+def test_percentile_interpolates():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert percentile([5.0], 0.99) == 5.0
+
+
+def test_compare_flags_only_real_regressions():
+    def report(p50):
+        return {"results": [{"name": "tool.x", "warm": {"p50_ms": p50}}]}
+
+    assert compare(report(20.0), report(10.0), tolerance=0.25)[0]["name"] == "tool.x"
+    assert compare(report(12.0), report(10.0), tolerance=0.25) == []
+
+
+def test_conversation_turn_against_fake_server():
+    results = bench_conversation(repeats=1)
+
+    assert [entry["name"] for entry in results] == ["conversation_turn.stream", "conversation_turn.blocking"]
+    assert all(entry["warm"]["p50_ms"] > 0 for entry in results)
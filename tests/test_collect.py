@@ -0,0 +1,23 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.collect import collect_report, write_report
+from src.config import Config
+
+
+def test_collect_report_skips_fix_tools_and_times_each_tool(tmp_path):
+    config = Config(openai_api_key=None, model_name="test", mode="allow_fixes", confirm_fixes=True)
+    report = collect_report(config, ["get_disk_health", "get_temperature_readings", "restart_service"])
+
+    assert set(report["tools"]) == {"get_disk_health", "get_temperature_readings"}
+    assert all(entry["duration_ms"] >= 0 for entry in report["tools"].values())
+
+    output = tmp_path / "report.ndjson"
+    write_report(report, "ndjson", output)
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line["type"] for line in lines] == ["report", "tool", "tool"]
@@ -0,0 +1,31 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.compaction import compact_tool_result, estimate_tokens
+from src.tools.base import ToolResult
+
+
+def test_small_results_are_cleaned_and_collapsed():
+    result = ToolResult(
+        success=True,
+        data={"sensors": [{"label": "core", "current": 41.236, "high": None}] * 3},
+    )
+
+    payload = json.loads(compact_tool_result(result))
+
+    assert payload == {"success": True, "data": {"sensors": [{"label": "core", "current": 41.2, "repeated": 3}]}}
+
+
+def test_large_results_fit_the_budget_and_keep_top_entries():
+    rows = [{"pid": pid, "name": f"worker-{pid}", "cpu_percent": 100 - pid * 0.01} for pid in range(2000)]
+    text = compact_tool_result(ToolResult(success=True, data=rows), token_budget=300)
+    payload = json.loads(text)
+
+    assert estimate_tokens(text) <= 300
+    assert payload["data"][0]["pid"] == 0
+    assert payload["data"][-1]["total_entries"] == 2000
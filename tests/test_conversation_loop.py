@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.conversation import ConversationRunner
+from src.agent.history import HistoryManager
+from src.agent.prefetch import Prefetch
+from src.agent.tool_executor import ToolCall
+from src.config import Config
+from src.tools.base import BaseTool, ToolResult
+
+
+def _chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _tool_delta(index, call_id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class FakeCompletions:
+    def __init__(self, rounds):
+        self.rounds = list(rounds)
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return iter(self.rounds.pop(0))
+
+
+class RecordingTool(BaseTool):
+    def __init__(self):
+        self.calls = []
+
+    def run(self, **kwargs) -> ToolResult:
+        self.calls.append(kwargs)
+        return ToolResult(success=True, data={"ok": True})
+
+
+def test_run_turn_loops_until_text_and_dispatches_streamed_calls():
+    config = Config(openai_api_key="test", model_name="test", mode="diagnostic_only", confirm_fixes=True)
+    runner = ConversationRunner(config)
+    tool = RecordingTool()
+    runner.tools_registry["get_process_snapshot"] = tool
+
+    completions = FakeCompletions(
+        [
+            [
+                _chunk(tool_calls=[_tool_delta(0, "call_1", "get_process_snapshot", '{"li')]),
+                _chunk(tool_calls=[_tool_delta(0, arguments='mit": 5}')]),
+            ],
+            [_chunk(tool_calls=[_tool_delta(0, "call_2", "get_process_snapshot", "{}")])],
+            [_chunk(content="All "), _chunk(content="good.")],
+        ]
+    )
+    runner.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    history = HistoryManager("test")
+    history.start_turn("slow?")
+    runner._run_turn(history)
+    messages = history.messages()
+
+    assert tool.calls == [{"limit": 5}, {}]
+    assert [message["role"] for message in messages] == [
+        "system", "user", "assistant", "tool", "assistant", "tool", "assistant",
+    ]
+    assert messages[-1] == {"role": "assistant", "content": "All good."}
+    assert all(request["stream"] for request in completions.requests)
+
+
+def test_prefetched_results_skip_the_first_round_trip():
+    config = Config(
+        openai_api_key="test",
+        model_name="test",
+        mode="diagnostic_only",
+        confirm_fixes=True,
+        prefetch_tools=["get_system_overview", "get_process_snapshot"],
+    )
+    runner = ConversationRunner(config)
+    overview, processes = RecordingTool(), RecordingTool()
+    runner.tools_registry["get_system_overview"] = overview
+    runner.tools_registry["get_process_snapshot"] = processes
+    completions = FakeCompletions([[_chunk(content="Nothing unusual.")]])
+    runner.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    prefetch = runner._start_prefetch()
+    history = HistoryManager("test")
+    history.start_turn("anything wrong?")
+    runner._run_turn(history, prefetch.take())
+
+    assert overview.calls == [{}] and processes.calls == [{}]
+    [request] = completions.requests
+    assert [message["role"] for message in request["messages"]] == ["system", "user", "assistant", "tool", "tool"]
+    assert [call["function"]["name"] for call in request["messages"][2]["tool_calls"]] == [
+        "get_system_overview", "get_process_snapshot",
+    ]
+    assert history.messages()[-1] == {"role": "assistant", "content": "Nothing unusual."}
+
+
+def test_stale_prefetch_is_collected_again():
+    config = Config(openai_api_key="test", model_name="test", mode="diagnostic_only", confirm_fixes=True)
+    runner = ConversationRunner(config)
+    tool = RecordingTool()
+    runner.tools_registry["get_system_overview"] = tool
+    now = [0.0]
+    prefetch = Prefetch(runner.executor, [ToolCall(id="prefetch_overview", name="get_system_overview")],
+                        max_age=60, clock=lambda: now[0])
+    prefetch.start()
+    prefetch._batch.results()
+    now[0] = 61.0
+
+    [(_, result)] = prefetch.take().results()
+    assert result.success and tool.calls == [{}, {}]
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.history import HistoryManager, message_tokens
+
+
+def _tool_turn(history, index, payload="x" * 2000):
+    history.start_turn(f"question {index}")
+    history.append(
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [{"id": f"c{index}", "type": "function", "function": {"name": "get_system_overview", "arguments": "{}"}}],
+        }
+    )
+    history.append({"role": "tool", "name": "get_system_overview", "tool_call_id": f"c{index}", "content": payload})
+    history.append({"role": "assistant", "content": f"answer {index}"})
+
+
+def test_old_turns_are_summarized_and_stale_tool_output_digested():
+    history = HistoryManager("system", max_turns=2, token_limit=100000, tool_result_turns=1)
+    for index in range(4):
+        _tool_turn(history, index)
+
+    messages = history.messages()
+    summary = messages[1]["content"]
+
+    assert "question 0" in summary and "get_system_overview" in summary and "answer 1" in summary
+    assert [m["content"] for m in messages if m["role"] == "user"] == ["question 2", "question 3"]
+    tool_contents = [m["content"] for m in messages if m["role"] == "tool"]
+    assert tool_contents[0].startswith("[earlier result")
+    assert tool_contents[1] == "x" * 2000
+
+
+def test_token_ceiling_is_enforced():
+    history = HistoryManager("system", max_turns=10, token_limit=800)
+    for index in range(6):
+        _tool_turn(history, index)
+
+    messages = history.messages()
+    assert sum(message_tokens(m) for m in messages) <= 800
+    assert messages[-1]["content"] == "answer 5"
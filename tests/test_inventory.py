@@ -0,0 +1,109 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+import pytest
+
+from src.config import Config, load_config
+from src.tools import inventory
+from src.tools.system_overview import SystemOverviewTool
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    calls = []
+
+    def probe(section):
+        def run():
+            calls.append(section)
+            return {"section": section}
+
+        return run
+
+    monkeypatch.setattr(inventory, "PROBES", {name: probe(name) for name in ("cpu", "gpus", "memory")})
+    monkeypatch.setattr(inventory, "boot_id", lambda: "boot-1")
+    inventory.reset_inventory()
+    yield calls
+    inventory.reset_inventory()
+
+
+def test_inventory_is_cached_per_boot(tmp_path, probes, monkeypatch):
+    cache_path = tmp_path / "inventory.json"
+    first = inventory.hardware_inventory(cache_path)
+    assert first["cpu"] == {"section": "cpu"}
+    assert first["boot_id"] == "boot-1"
+    assert sorted(probes) == ["cpu", "gpus", "memory"]
+    assert json.loads(cache_path.read_text())["inventory"] == first
+
+    # Same process, then a new process on the same boot: no probing either way.
+    assert inventory.hardware_inventory(cache_path) is first
+    inventory.reset_inventory()
+    assert inventory.hardware_inventory(cache_path) == first
+    assert len(probes) == 3
+
+    inventory.reset_inventory()
+    monkeypatch.setattr(inventory, "boot_id", lambda: "boot-2")
+    assert inventory.hardware_inventory(cache_path)["boot_id"] == "boot-2"
+    assert len(probes) == 6
+
+    inventory.hardware_inventory(cache_path, refresh=True)
+    assert len(probes) == 9
+
+
+def test_failing_probe_does_not_lose_the_rest(probes, monkeypatch):
+    def broken():
+        raise OSError("no access")
+
+    monkeypatch.setitem(inventory.PROBES, "gpus", broken)
+    result = inventory.collect_inventory()
+    assert result["gpus"] == {"error": "OSError: no access"}
+    assert result["cpu"] == {"section": "cpu"}
+
+
+def test_parse_dmidecode_skips_empty_slots():
+    output = (
+        "Handle 0x0011, DMI type 17, 40 bytes\nMemory Device\n\tSize: 16 GB\n\tLocator: DIMM_A1\n"
+        "\tType: DDR4\n\tSpeed: 3200 MT/s\n\tManufacturer: Samsung\n\n"
+        "Handle 0x0012, DMI type 17, 40 bytes\nMemory Device\n\tSize: No Module Installed\n\tLocator: DIMM_A2\n"
+    )
+    assert inventory._parse_dmidecode(output) == [
+        {"locator": "DIMM_A1", "size": "16 GB", "type": "DDR4", "speed": "3200 MT/s", "manufacturer": "Samsung"}
+    ]
+
+
+def test_repeated_overview_calls_start_no_subprocesses(tmp_path, monkeypatch):
+    commands = []
+    monkeypatch.setattr(inventory, "run_command", lambda command, **kwargs: commands.append(command) or (False, "", ""))
+    inventory.reset_inventory()
+    config = Config(
+        openai_api_key=None,
+        model_name="test",
+        mode="diagnostic_only",
+        confirm_fixes=True,
+        inventory_cache_path=tmp_path / "inventory.json",
+    )
+    tool = SystemOverviewTool(config)
+    try:
+        first = tool.run()
+        probed = len(commands)
+        second = tool.run()
+    finally:
+        inventory.reset_inventory()
+
+    assert first.success and second.success
+    assert len(commands) == probed
+    assert second.data["cpu"]["model"] == first.data["cpu"]["model"]
+    assert (tmp_path / "inventory.json").exists()
+
+
+def test_inventory_cache_defaults_to_the_user_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv("INVENTORY_CACHE_PATH", raising=False)
+    assert load_config(tmp_path / "missing.env").inventory_cache_path == tmp_path / "ai-system-diagnoser" / "inventory.json"
+
+    monkeypatch.setenv("INVENTORY_CACHE_PATH", "")
+    assert load_config(tmp_path / "missing.env").inventory_cache_path is None
@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.tools import disk_health
+from src.tools.disk_health import DiskHealthTool
+from src.tools.linux_disks import block_devices, device_info, io_deltas, parse_smartctl, read_diskstats
+from src.tools.snapshot_cache import snapshot_cache
+
+
+def _fake_sys_block(root: Path) -> Path:
+    sys_block = root / "block"
+    for name, model, rotational in (("sda", "WDC WD40", "1"), ("nvme0n1", None, "0"), ("loop0", None, "0")):
+        (sys_block / name / "queue").mkdir(parents=True)
+        (sys_block / name / "size").write_text("7814037168\n")
+        (sys_block / name / "queue" / "rotational").write_text(rotational)
+        if model:
+            (sys_block / name / "device").mkdir()
+            (sys_block / name / "device" / "model").write_text(model + "\n")
+        (sys_block / name / "stat").write_text("100 0 800 50 10 0 80 20 1 60 70 0 0 0 0\n")
+    return sys_block
+
+
+def test_devices_and_stats_from_sysfs_and_diskstats(tmp_path):
+    sys_block = _fake_sys_block(tmp_path)
+    assert block_devices(sys_block) == ["nvme0n1", "sda"]
+
+    info = device_info("sda", sys_block)
+    assert info == {
+        "device": "sda",
+        "model": "WDC WD40",
+        "size_gb": 3726.02,
+        "rotational": True,
+        "physical": True,
+    }
+
+    # Without /proc/diskstats the per-device stat files are used.
+    stats = read_diskstats(["sda"], proc_path=tmp_path / "missing", sys_block=sys_block)
+    assert stats["sda"].reads == 100 and stats["sda"].weighted_ms == 70
+
+    diskstats = tmp_path / "diskstats"
+    diskstats.write_text(
+        "   8       0 sda 200 0 1600 150 30 0 240 60 2 560 1070 0 0 0 0\n"
+        "   8       1 sda1 200 0 1600 150 30 0 240 60 2 560 1070 0 0 0 0\n"
+    )
+    later = read_diskstats(["sda"], proc_path=diskstats, sys_block=sys_block)
+    assert list(later) == ["sda"]
+
+    deltas = io_deltas(stats["sda"], later["sda"], elapsed=1.0)
+    assert deltas["read_iops"] == 100.0
+    assert deltas["read_latency_ms"] == 1.0
+    assert deltas["write_latency_ms"] == 2.0
+    assert deltas["read_mb_s"] == 0.41
+    assert deltas["util_percent"] == 50.0
+    assert deltas["avg_queue_depth"] == 1.0
+    assert deltas["in_flight"] == 2
+
+
+def test_parse_smartctl_ata_and_nvme():
+    ata = parse_smartctl(
+        {
+            "serial_number": "WD-1",
+            "smart_status": {"passed": True},
+            "temperature": {"current": 38},
+            "ata_smart_attributes": {
+                "table": [
+                    {"id": 5, "name": "Reallocated_Sector_Ct", "raw": {"value": 8}},
+                    {"id": 197, "name": "Current_Pending_Sector", "raw": {"value": 0}},
+                    {"id": 9, "name": "Power_On_Hours", "raw": {"value": 1234}},
+                ]
+            },
+        }
+    )
+    assert ata["status"] == "Warning"
+    assert ata["reallocated_sectors"] == 8 and ata["pending_sectors"] == 0
+    assert ata["warnings"] == ["reallocated_sectors=8"]
+    assert ata["temperature_c"] == 38
+
+    nvme = parse_smartctl(
+        {
+            "smart_status": {"passed": False},
+            "nvme_smart_health_information_log": {"percentage_used": 95, "media_errors": 0, "critical_warning": 0},
+        }
+    )
+    assert nvme["status"] == "Failing"
+    assert nvme["warnings"] == ["percentage_used=95"]
+    assert parse_smartctl({})["status"] == "Unknown"
+
+
+def test_smart_failures_are_not_cached(monkeypatch):
+    outcomes = [{"error": "smartctl timed out"}, {"status": "OK"}]
+    monkeypatch.setattr(disk_health, "read_smart", lambda device: outcomes.pop(0))
+    snapshot_cache.invalidate()
+
+    tool = DiskHealthTool()
+    assert tool._smart(["sda"]) == {"sda": {"error": "smartctl timed out"}}
+    assert tool._smart(["sda"]) == {"sda": {"status": "OK"}}
+    assert tool._smart(["sda"]) == {"sda": {"status": "OK"}}
@@ -0,0 +1,115 @@
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.tools import event_logs, linux_logs
+from src.tools.event_logs import EventLogsTool
+from src.tools.linux_logs import PRIORITIES, read_journal, read_syslog
+from src.utils.shell_utils import CommandResult
+
+
+def _line(when: datetime, text: str) -> str:
+    return f"{when.isoformat()} host {text}\n"
+
+
+def test_read_syslog_filters_and_resumes_from_cursor(tmp_path):
+    now = datetime.now().astimezone()
+    log = tmp_path / "syslog"
+    log.write_text(
+        _line(now - timedelta(days=3), "kernel: old error on sda")
+        + _line(now - timedelta(minutes=5), "CRON[1]: job started")
+        + _line(now - timedelta(minutes=4), "sshd[2]: Failed password for root")
+        + _line(now - timedelta(minutes=3), "kernel: I/O error, dev sda")
+    )
+    since = now - timedelta(hours=1)
+
+    events, cursor = read_syslog(str(log), 10, PRIORITIES["err"], since)
+    assert [event["source"] for event in events] == ["kernel", "sshd"]
+
+    with log.open("a") as handle:
+        handle.write(_line(now, "systemd[1]: foo.service failed"))
+    events, _ = read_syslog(str(log), 10, PRIORITIES["err"], since, cursor=cursor)
+    assert [event["source"] for event in events] == ["systemd"]
+
+
+def test_quiet_journal_is_not_a_failure(monkeypatch):
+    since = datetime.now().astimezone() - timedelta(hours=1)
+
+    monkeypatch.setattr(linux_logs, "run_command_streaming", lambda command, on_line, timeout: CommandResult(0, "", ""))
+    assert read_journal(10, PRIORITIES["err"], since) == ([], None, "")
+
+    monkeypatch.setattr(
+        linux_logs, "run_command_streaming", lambda command, on_line, timeout: CommandResult(None, "", "not found")
+    )
+    assert read_journal(10, PRIORITIES["err"], since) == (None, None, "not found")
+
+
+def test_only_new_reports_events_beyond_the_limit(tmp_path, monkeypatch):
+    now = datetime.now().astimezone()
+    log = tmp_path / "syslog"
+    log.write_text(_line(now - timedelta(minutes=10), "kernel: I/O error, dev sda"))
+    monkeypatch.setattr(event_logs, "is_linux", lambda: True)
+    monkeypatch.setattr(event_logs, "is_windows", lambda: False)
+    monkeypatch.setattr(event_logs, "read_journal", lambda *args, **kwargs: (None, None, "not found"))
+    monkeypatch.setattr(event_logs, "find_syslog", lambda: str(log))
+    tool = EventLogsTool()
+
+    first = tool.run(limit=2, only_new=True)
+    assert first.data["truncated"] is False and len(first.data["events"]) == 1
+
+    with log.open("a") as handle:
+        for minute in (3, 2, 1):
+            handle.write(_line(now - timedelta(minutes=minute), f"app[{minute}]: request failed"))
+    second = tool.run(limit=2, only_new=True)
+    assert second.data["truncated"] is True
+    assert len(second.data["events"]) == 2
+
+
+def test_journal_cursor_reads_forward_from_the_last_entry(monkeypatch):
+    now = datetime.now().astimezone()
+    entries = [
+        {"__CURSOR": f"c{index}", "PRIORITY": "3", "MESSAGE": f"error {index}", "SYSLOG_IDENTIFIER": "app",
+         "__REALTIME_TIMESTAMP": str(int((now + timedelta(seconds=index)).timestamp() * 1_000_000))}
+        for index in range(1, 5)
+    ]
+    commands = []
+
+    def fake_streaming(command, on_line, timeout):
+        commands.append(command)
+        for entry in entries:
+            if on_line(json.dumps(entry)):
+                return CommandResult(None, "", "", stopped_early=True)
+        return CommandResult(0, "", "")
+
+    monkeypatch.setattr(linux_logs, "run_command_streaming", fake_streaming)
+    events, cursor, _ = read_journal(2, PRIORITIES["err"], now - timedelta(hours=1), cursor="c0")
+
+    assert "--after-cursor=c0" in commands[0] and "--reverse" not in commands[0]
+    assert [event["message"] for event in events] == ["error 4", "error 3"]
+    assert cursor == "c4"
+
+    read_journal(2, PRIORITIES["err"], now - timedelta(hours=1))
+    assert "--reverse" in commands[1] and not any(arg.startswith("--after-cursor") for arg in commands[1])
+
+
+def test_cursor_follows_the_log_into_its_rotation(tmp_path):
+    now = datetime.now().astimezone()
+    log = tmp_path / "syslog"
+    log.write_text(_line(now - timedelta(minutes=10), "kernel: I/O error, dev sda"))
+    since = now - timedelta(hours=1)
+    events, cursor = read_syslog(str(log), 10, PRIORITIES["err"], since)
+    assert len(events) == 1
+
+    with log.open("a") as handle:
+        handle.write(_line(now - timedelta(minutes=5), "sshd[2]: Failed password for root"))
+    log.rename(tmp_path / "syslog.1")
+    log.write_text(_line(now - timedelta(minutes=1), "systemd[1]: foo.service failed"))
+
+    events, cursor = read_syslog(str(log), 10, PRIORITIES["err"], since, cursor=cursor)
+    assert [event["source"] for event in events] == ["systemd", "sshd"]
+    assert read_syslog(str(log), 10, PRIORITIES["err"], since, cursor=cursor)[0] == []
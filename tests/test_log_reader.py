@@ -0,0 +1,43 @@
+import gzip
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.tools.log_reader import StopReading, reverse_lines, rotated_logs, tail_matching
+
+
+def test_reverse_lines_yields_newest_first(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("one\ntwo\nthree\n")
+
+    assert list(reverse_lines(log)) == ["three", "two", "one"]
+    assert list(reverse_lines(log, start=4)) == ["three", "two"]
+
+
+def test_tail_matching_spans_gzip_rotations(tmp_path):
+    log = tmp_path / "syslog"
+    log.write_text("error 5\ninfo 6\n")
+    (tmp_path / "syslog.1").write_text("error 3\nerror 4\n")
+    with gzip.open(tmp_path / "syslog.2.gz", "wt") as handle:
+        handle.write("error 1\nerror 2\ninfo x\n")
+
+    def errors(line):
+        return line if line.startswith("error") else None
+
+    assert [p.name for p in rotated_logs(log)] == ["syslog", "syslog.1", "syslog.2.gz"]
+    assert tail_matching(log, errors, 4) == ["error 5", "error 4", "error 3", "error 2"]
+
+
+def test_tail_matching_stops_at_window_edge(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("0 error\n5 error\n9 error\n")
+
+    def recent(line):
+        if int(line.split()[0]) < 5:
+            raise StopReading
+        return line
+
+    assert tail_matching(log, recent, 10) == ["9 error", "5 error"]
@@ -0,0 +1,71 @@
+import json
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.tool_executor import ToolCall, ToolExecutor
+from src.tools.base import BaseTool, ToolResult
+from src.utils.metrics import MetricsRegistry, metrics
+from src.utils.shell_utils import run_command
+
+
+class FailingTool(BaseTool):
+    name = "failing"
+
+    def run(self, **kwargs):
+        return ToolResult(success=False, data={}, error="nope")
+
+
+def test_span_records_histogram_counter_and_span():
+    registry = MetricsRegistry()
+    with registry.span("tool_run", tool="a") as span:
+        span.set(rows=3)
+    try:
+        with registry.span("tool_run", tool="a"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    counts = registry.counters["tool_run_total"].values
+    assert counts[(("status", "ok"), ("tool", "a"))] == 1
+    assert counts[(("status", "error"), ("tool", "a"))] == 1
+    assert registry.histograms["tool_run_duration_seconds"].series[(("tool", "a"),)].count == 2
+    assert [span.status for span in registry.spans] == ["ok", "error"]
+    assert registry.spans[0].attributes == {"tool": "a", "rows": 3}
+
+
+def test_prometheus_and_otlp_export(tmp_path):
+    registry = MetricsRegistry()
+    registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)).observe(0.5, tool='q"x')
+    registry.counter("tokens_total", "Tokens").inc(7, kind="prompt")
+
+    text = registry.to_prometheus()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{tool="q\\"x",le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{tool="q\\"x",le="+Inf"} 1' in text
+    assert 'tokens_total{kind="prompt"} 7' in text
+
+    path = tmp_path / "metrics.json"
+    registry.export(path)
+    payload = json.loads(path.read_text())
+    names = [m["name"] for m in payload["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]]
+    assert names == ["tokens_total", "latency_seconds"]
+
+    registry.export(tmp_path / "metrics.prom")
+    assert (tmp_path / "metrics.prom").read_text() == text
+
+
+def test_tool_runs_and_subprocesses_are_instrumented():
+    metrics.reset()
+    executor = ToolExecutor({"failing": FailingTool()}, logging.getLogger("test"))
+    executor.run_calls([ToolCall(id="1", name="failing")])
+    executor.shutdown()
+    run_command([sys.executable, "-c", "pass"])
+
+    assert metrics.counters["tool_run_total"].values[(("status", "error"), ("tool", "failing"))] == 1
+    program = Path(sys.executable).name
+    assert metrics.counters["subprocess_total"].values[(("command", program), ("status", "ok"))] == 1
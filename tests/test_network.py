@@ -0,0 +1,143 @@
+import asyncio
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.tools import net_probes, network
+from src.tools.net_probes import latency_stats, parse_ping, ping_command, tcp_connect
+from src.tools.network import NetworkDiagnosticsTool
+from src.utils import shell_utils
+
+
+class Listener:
+    """Accepts and immediately closes connections on a free localhost port."""
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+def _closed_port() -> int:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_probes_many_targets_and_ports_concurrently():
+    listeners = [Listener() for _ in range(3)]
+    closed = _closed_port()
+    try:
+        started = time.perf_counter()
+        result = NetworkDiagnosticsTool().run(
+            targets=["127.0.0.1", "localhost", "does-not-exist.invalid"],
+            ports=[listener.port for listener in listeners] + [closed],
+            count=3,
+            timeout=2.0,
+            ping=False,
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        for listener in listeners:
+            listener.close()
+
+    assert result.success
+    by_target = {entry["target"]: entry for entry in result.data["targets"]}
+    local = by_target["127.0.0.1"]
+    assert local["dns"]["addresses"] == ["127.0.0.1"]
+    open_checks = [check for check in local["tcp"] if check["port"] != closed]
+    assert all(check["success"] and check["connected"] == 3 for check in open_checks)
+    assert set(open_checks[0]["latency_ms"]) == {"min", "p50", "p90", "max", "jitter"}
+    refused = next(check for check in local["tcp"] if check["port"] == closed)
+    assert not refused["success"] and refused["connected"] == 0
+
+    assert by_target["localhost"]["dns"]["success"]
+    missing = by_target["does-not-exist.invalid"]
+    assert not missing["dns"]["success"]
+    assert all(check["error"] == "DNS lookup failed" for check in missing["tcp"])
+    assert "ping" not in local
+    assert elapsed < 2.0
+
+
+def test_parse_ping_and_latency_stats():
+    output = (
+        "64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=1.0 ms\n"
+        "64 bytes from 10.0.0.1: icmp_seq=2 ttl=64 time=3.0 ms\n"
+        "64 bytes from 10.0.0.1: icmp_seq=4 ttl=64 time=2.0 ms\n"
+        "4 packets transmitted, 3 received, 25% packet loss, time 602ms\n"
+    )
+    parsed = parse_ping(output, 4)
+    assert parsed["received"] == 3 and parsed["packet_loss_percent"] == 25.0
+    assert parsed["latency_ms"] == {"min": 1.0, "p50": 2.0, "p90": 2.8, "max": 3.0, "jitter": 1.5}
+
+    windows = parse_ping("Reply from 10.0.0.1: bytes=32 time<1ms TTL=128\nLost = 1 (50% loss),", 2)
+    assert windows["received"] == 1 and windows["packet_loss_percent"] == 50.0
+    assert latency_stats([]) is None
+
+
+def test_tcp_connect_falls_back_to_the_next_address():
+    listener = Listener()
+    try:
+        # The listener is bound to 127.0.0.1 only, so 127.0.0.2 refuses like an unreachable first record.
+        result = asyncio.run(tcp_connect(["127.0.0.2", "127.0.0.1"], listener.port, 2, 1.0))
+    finally:
+        listener.close()
+
+    assert result["success"] and result["connected"] == 2
+    assert result["address"] == "127.0.0.1"
+
+
+def test_ping_wait_uses_the_platform_unit(monkeypatch):
+    monkeypatch.setattr(net_probes, "is_windows", lambda: False)
+    monkeypatch.setattr(net_probes, "is_mac", lambda: False)
+    monkeypatch.setattr(net_probes.sys, "platform", "linux")
+    assert ping_command("host", 3, 2.0)[-3:-1] == ["-W", "2"]
+
+    monkeypatch.setattr(net_probes, "is_mac", lambda: True)
+    assert ping_command("host", 3, 2.0)[-3:-1] == ["-W", "2000"]
+
+
+def test_pings_do_not_queue_behind_the_command_budget(monkeypatch):
+    monkeypatch.setattr(shell_utils, "_slots", shell_utils.CommandSlots(1))
+    monkeypatch.setattr(net_probes, "ping_command", lambda host, count, timeout: ["sh", "-c", "sleep 0.5"])
+
+    started = time.perf_counter()
+    results = asyncio.run(net_probes.probe_targets(["a", "b", "c", "d"], [], 1, 1.0, True))
+
+    assert all(not result["ping"]["success"] for result in results)
+    assert time.perf_counter() - started < 1.5
+
+
+def test_probe_count_is_clamped(monkeypatch):
+    counts = []
+
+    async def fake_probe_targets(targets, ports, count, timeout, with_ping):
+        counts.append(count)
+        return []
+
+    monkeypatch.setattr(network, "probe_targets", fake_probe_targets)
+    NetworkDiagnosticsTool().run(count=10000)
+    NetworkDiagnosticsTool().run(count=0)
+    assert counts == [network.MAX_COUNT, 1]
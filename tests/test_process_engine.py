@@ -0,0 +1,75 @@
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+import psutil
+
+from src.tools import process_engine
+from src.tools.process_engine import top_processes
+from src.tools.processes import ProcessSnapshotTool
+
+
+def test_top_processes_ranked_by_memory():
+    rows = top_processes(sort_by="memory", limit=5, interval=0.01)
+
+    assert 0 < len(rows) <= 5
+    assert rows.columns == ("pid", "name", "cpu_percent", "memory_mb")
+    memory = rows.column("memory_mb")
+    assert memory == sorted(memory, reverse=True)
+
+
+def test_process_tool_rejects_unknown_sort_key():
+    result = ProcessSnapshotTool().run(sort_by="threads")
+    assert not result.success
+
+
+class FakeProcess:
+    def __init__(self, pid, name, denied=()):
+        self.pid = pid
+        self.info = {"name": name}
+        self.denied = denied
+
+    def oneshot(self):
+        return nullcontext()
+
+    def _read(self, what, value):
+        if what in self.denied:
+            raise psutil.AccessDenied(self.pid)
+        return value
+
+    def cpu_percent(self, interval=None):
+        return self._read("cpu", 1.0)
+
+    def memory_info(self):
+        return self._read("memory", SimpleNamespace(rss=self.pid * 1024 ** 2))
+
+    def io_counters(self):
+        return self._read("io", SimpleNamespace(read_bytes=self.pid * 1024 ** 2, write_bytes=0))
+
+    def num_fds(self):
+        return self._read("fds", self.pid)
+
+
+def test_denied_readings_keep_the_process_listed(monkeypatch):
+    processes = [
+        FakeProcess(1, "init", denied=("io", "fds")),
+        FakeProcess(2, "mine"),
+        FakeProcess(3, "sshd", denied=("cpu", "memory")),
+    ]
+    monkeypatch.setattr(process_engine.procfs, "enabled", lambda: False)
+    monkeypatch.setattr(process_engine.psutil, "process_iter", lambda attrs: processes)
+
+    io = top_processes(sort_by="io", limit=5, interval=0)
+    assert list(io.rows()) == [
+        (3, "sshd", None, None, 3.0, 0.0),
+        (2, "mine", 1.0, 2.0, 2.0, 0.0),
+        (1, "init", 1.0, 1.0, None, None),
+    ]
+
+    memory = top_processes(sort_by="memory", limit=5, interval=0)
+    assert memory.column("pid") == [2, 1, 3]
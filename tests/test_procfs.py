@@ -0,0 +1,127 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+import psutil
+import pytest
+
+from src.tools import procfs, temperatures
+from src.tools.process_engine import top_processes
+from src.tools.snapshot_cache import snapshot_cache
+from src.tools.temperatures import TemperatureTool
+
+
+def _stat_line(pid, comm, utime, stime, rss_pages):
+    fields = ["S", "1"] + ["0"] * 9 + [str(utime), str(stime)] + ["0"] * 8 + [str(rss_pages)] + ["0"] * 20
+    return f"{pid} ({comm}) {' '.join(fields)}\n"
+
+
+@pytest.fixture
+def fake_proc(tmp_path):
+    proc = tmp_path / "proc"
+    for pid, comm, rss in ((1, "init", 100), (42, "my (odd) name", 5000), (7, "kworker/0:1-events", 10)):
+        (proc / str(pid)).mkdir(parents=True)
+        (proc / str(pid) / "stat").write_text(_stat_line(pid, comm, 10, 5, rss))
+    (proc / "7" / "cmdline").write_bytes(b"")
+    (proc / "self").mkdir()
+    (proc / "meminfo").write_text(
+        "MemTotal:       8000000 kB\nMemFree:        1000000 kB\nMemAvailable:   6000000 kB\n"
+        "Buffers:         500000 kB\nCached:         2500000 kB\nSReclaimable:    500000 kB\nHugePages_Total: 0\n"
+    )
+    (proc / "stat").write_text("cpu  100 0 50 800 50 0 0 0 0 0\ncpu0 100 0 50 800 50 0 0 0 0 0\n")
+    return proc
+
+
+def test_top_processes_from_fake_proc(fake_proc):
+    table = procfs.top_processes(sort_by="memory", limit=2, interval=0, proc=str(fake_proc))
+    assert table.columns == ("pid", "name", "cpu_percent", "memory_mb")
+    assert table.column("pid") == [42, 1]
+    assert table.column("name") == ["my (odd) name", "init"]
+    assert table.column("memory_mb")[0] == round(5000 * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2, 2)
+
+    sampled = procfs.top_processes(sampled_cpu={7: (55.0, 20.0)}, limit=1, proc=str(fake_proc))
+    assert list(sampled.records()) == [
+        {"pid": 7, "name": "kworker/0:1-events", "cpu_percent": 55.0, "memory_mb": sampled.column("memory_mb")[0],
+         "cpu_avg_percent": 20.0}
+    ]
+
+
+def test_denied_io_keeps_the_process_listed(fake_proc, monkeypatch):
+    def io_bytes(pid, proc):
+        if pid == 1:
+            raise PermissionError(pid)
+        if pid == 7:
+            raise FileNotFoundError(pid)  # exited between listing and reading
+        return 1024 ** 2, 0
+
+    monkeypatch.setattr(procfs, "_io_bytes", io_bytes)
+    table = procfs.top_processes(sort_by="io", interval=0, proc=str(fake_proc))
+    assert table.column("pid") == [42, 1]
+    assert table.column("io_read_mb") == [1.0, None]
+
+
+def test_memory_and_cpu_from_fake_proc(fake_proc):
+    total, used, percent = procfs.virtual_memory(str(fake_proc))
+    assert total == 8000000 * 1024
+    assert used == (8000000 - 1000000 - 500000 - 3000000) * 1024
+    assert percent == 25.0
+    assert procfs.cpu_times(str(fake_proc)) == (150, 1000)
+
+
+def test_hwmon_readings(tmp_path):
+    chip = tmp_path / "hwmon0"
+    chip.mkdir()
+    (chip / "name").write_text("coretemp\n")
+    (chip / "temp1_input").write_text("45000\n")
+    (chip / "temp1_label").write_text("Package id 0\n")
+    (chip / "temp1_crit").write_text("100000\n")
+    (chip / "temp2_input").write_text("41500\n")
+    (chip / "fan1_input").write_text("1200\n")
+    assert procfs.hwmon_readings(str(tmp_path)) == [
+        ("coretemp", "Package id 0", 45.0, None, 100.0),
+        ("coretemp", "", 41.5, None, None),
+    ]
+
+
+def test_read_bytes_grows_buffer_for_large_files(tmp_path):
+    path = tmp_path / "big"
+    path.write_bytes(b"x" * (procfs.BUFFER_SIZE * 3 + 5))
+    assert procfs.read_bytes(str(path)) == path.read_bytes()
+
+
+@pytest.mark.skipif(not procfs.available(), reason="needs /proc")
+def test_procfs_backend_matches_psutil(monkeypatch):
+    monkeypatch.setattr(procfs, "_backend", "procfs")
+    assert procfs.enabled()
+    table = top_processes(sort_by="memory", limit=5, interval=0.01)
+    assert 0 < len(table) <= 5
+    for pid, memory_mb in zip(table.column("pid"), table.column("memory_mb")):
+        try:
+            rss = psutil.Process(pid).memory_info().rss / 1024 ** 2
+        except psutil.NoSuchProcess:
+            continue
+        assert abs(rss - memory_mb) < max(1.0, memory_mb * 0.1)
+
+
+def test_temperature_tool_uses_hwmon_and_falls_back(monkeypatch):
+    monkeypatch.setattr(procfs, "enabled", lambda: True)
+    monkeypatch.setattr(procfs, "hwmon_readings", lambda: [("acpitz", "", 27.8, None, 105.0)])
+    monkeypatch.setattr(temperatures, "sensors_temperatures", lambda: {})
+    snapshot_cache.invalidate()
+    result = TemperatureTool().run()
+    assert result.success
+    assert result.data.to_json()["rows"] == [["acpitz", "", 27.8, None, 105.0]]
+
+    monkeypatch.setattr(procfs, "hwmon_readings", lambda: [])
+    snapshot_cache.invalidate()
+    result = TemperatureTool().run()
+    assert result.error == "No temperature sensors detected"
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        procfs.set_collector_backend("wmi")
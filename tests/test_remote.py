@@ -0,0 +1,202 @@
+import asyncio
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+import pytest
+
+from src.agent.conversation import ConversationRunner
+from src.config import Config
+from src.remote.agent import AgentServer
+from src.remote.controller import AgentPool, RemoteController
+from src.remote.protocol import MAX_FRAME_BYTES, HEADER, ProtocolError, parse_addresses, read_frame
+from src.tools.base import BaseTool, ToolResult
+from src.tools.remote import RemoteDiagnosticsTool
+
+TOKEN = "s3cret"
+
+
+def _config(**overrides):
+    values = dict(openai_api_key=None, model_name="test", mode="diagnostic_only", confirm_fixes=True)
+    values.update(overrides)
+    return Config(**values)
+
+
+class FakeOverview(BaseTool):
+    name = "get_system_overview"
+
+    def __init__(self, label, delay=0.0):
+        self.label = label
+        self.delay = delay
+
+    def run(self, **kwargs):
+        time.sleep(self.delay)
+        return ToolResult(success=True, data={"label": self.label, "arguments": kwargs})
+
+
+@pytest.fixture
+def agents():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=RemoteController._run_loop, args=(loop,), daemon=True)
+    thread.start()
+    servers = []
+
+    def start(count=3, delay=0.0, token=TOKEN, **options):
+        started = []
+        for index in range(count):
+            server = AgentServer(_config(), "127.0.0.1", 0, token=token, **options)
+            server.executor.tools_registry["get_system_overview"] = FakeOverview(f"agent{index}", delay)
+            asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+            started.append(server)
+        servers.extend(started)
+        return [f"127.0.0.1:{server.port}" for server in started], started
+
+    start.loop = loop
+    yield start
+    for server in servers:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+def test_fan_out_runs_agents_concurrently_over_pooled_connections(agents):
+    addresses, _ = agents(count=3, delay=0.3)
+    controller = RemoteController(addresses, token=TOKEN)
+    try:
+        started = time.perf_counter()
+        data = controller.run("get_system_overview", {"verbose": True})
+        elapsed = time.perf_counter() - started
+        connections = dict(controller.pool._connections)
+        again = controller.run("get_system_overview")
+    finally:
+        controller.close()
+
+    assert elapsed < 0.8  # three 0.3 s tools, not run back to back
+    assert data["succeeded"] == 3 and data["failed"] == []
+    assert [entry["data"]["label"] for entry in data["hosts"]] == ["agent0", "agent1", "agent2"]
+    assert data["hosts"][0]["data"]["arguments"] == {"verbose": True}
+    assert data["hosts"][0]["address"] == addresses[0]
+    assert again["succeeded"] == 3
+    assert controller.pool._connections == {} and len(connections) == 3
+
+
+def test_failures_are_reported_per_host(agents):
+    addresses, _ = agents(count=2)
+    (wrong_token,), _ = agents(count=1, token="other")
+    controller = RemoteController([*addresses, wrong_token, "127.0.0.1:1"], token=TOKEN, call_timeout=5)
+    try:
+        data = controller.run("get_system_overview")
+        fix = controller.run("restart_service", {"name": "nginx"}, addresses[:1])
+    finally:
+        controller.close()
+
+    assert data["succeeded"] == 2
+    assert data["failed"] == [wrong_token, "127.0.0.1:1"]
+    assert "Invalid token" in data["hosts"][2]["error"]
+    assert data["hosts"][3]["error"].startswith("ConnectionRefusedError")
+    assert fix["hosts"][0]["error"] == "Tool not served by this agent: restart_service"
+
+
+def test_dropped_connection_is_reopened(agents):
+    addresses, servers = agents(count=1)
+    controller = RemoteController(addresses, token=TOKEN)
+    try:
+        assert controller.run("get_system_overview")["succeeded"] == 1
+        for handler in list(servers[0]._handlers):
+            agents.loop.call_soon_threadsafe(handler.cancel)
+        time.sleep(0.1)
+        assert controller.run("get_system_overview")["succeeded"] == 1
+    finally:
+        controller.close()
+
+
+def test_remote_tool_only_targets_configured_agents(agents):
+    addresses, _ = agents(count=2)
+    tool = RemoteDiagnosticsTool(_config(remote_hosts=addresses, remote_token=TOKEN))
+    try:
+        result = tool.run(hosts=[addresses[1]])
+        assert result.success
+        assert [entry["data"]["label"] for entry in result.data["hosts"]] == ["agent1"]
+
+        assert "Not configured" in tool.run(hosts=["10.0.0.9:8765"]).error
+        assert not tool.run(tool="disable_startup_item").success
+    finally:
+        tool.controller.close()
+    assert "REMOTE_HOSTS" in RemoteDiagnosticsTool(_config()).run().error
+
+
+def test_agent_requires_token_beyond_loopback():
+    with pytest.raises(ValueError):
+        AgentServer(_config(), "0.0.0.0", 0)
+
+
+def test_addresses_and_oversized_frames():
+    assert parse_addresses(" web1, web2:9000 ,[::1]:7000") == ["web1:8765", "web2:9000", "[::1]:7000"]
+
+    async def read_oversized():
+        reader = asyncio.StreamReader()
+        reader.feed_data(HEADER.pack(MAX_FRAME_BYTES + 1))
+        await read_frame(reader)
+
+    with pytest.raises(ProtocolError):
+        asyncio.run(read_oversized())
+
+
+def test_session_end_closes_the_controller_and_fan_outs_get_the_remote_budget(agents):
+    addresses, _ = agents(count=1)
+    runner = ConversationRunner(_config(openai_api_key="test", remote_hosts=addresses, remote_token=TOKEN, remote_timeout=50))
+    assert runner.executor.timeout_for("run_remote_diagnostics") == 2 * (5 + 50)
+
+    tool = runner.tools_registry["run_remote_diagnostics"]
+    assert tool.run().success
+    loop = tool.controller._loop
+    runner._close()
+
+    assert tool._controller is None
+    for _ in range(50):
+        if loop.is_closed():
+            break
+        time.sleep(0.01)
+    assert loop.is_closed()
+
+
+def test_agent_limits_calls_in_flight_per_connection(agents):
+    [address], _ = agents(count=1, delay=0.2, max_calls=1)
+    pool = AgentPool(TOKEN)
+
+    async def three_calls():
+        try:
+            return await asyncio.gather(*(pool.call(address, "get_system_overview") for _ in range(3)))
+        finally:
+            await pool.close()
+
+    started = time.perf_counter()
+    entries = asyncio.run_coroutine_threadsafe(three_calls(), agents.loop).result(10)
+    assert all(entry["success"] for entry in entries)
+    assert time.perf_counter() - started >= 0.6
+
+
+def test_silent_agent_reports_a_connect_timeout(agents):
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    pool = AgentPool(TOKEN, connect_timeout=0.2, call_timeout=30)
+
+    async def call():
+        try:
+            return await pool.call(f"127.0.0.1:{listener.getsockname()[1]}", "get_system_overview")
+        finally:
+            await pool.close()
+
+    try:
+        entry = asyncio.run_coroutine_threadsafe(call(), agents.loop).result(10)
+    finally:
+        listener.close()
+    assert not entry["success"]
+    assert "No handshake within 0.2s" in entry["error"] and "30" not in entry["error"]
@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.conversation import ConversationRunner
+from src.agent.response_cache import ResponseCache
+from src.config import Config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _request(cpu_percent, call_id="call_1"):
+    return {
+        "model": "m",
+        "tools": [],
+        "messages": [
+            {"role": "user", "content": "why is this machine slow?"},
+            {"role": "assistant", "content": "", "tool_calls": [{"id": call_id, "type": "function"}]},
+            {
+                "role": "tool",
+                "tool_call_id": call_id,
+                "content": json.dumps({"cpu_percent": cpu_percent, "uptime_seconds": cpu_percent * 1000}),
+            },
+        ],
+    }
+
+
+def test_normalized_tool_payloads_share_a_key(tmp_path):
+    cache = ResponseCache(tmp_path)
+    assert cache.key(_request(12.2, "call_a")) == cache.key(_request(11.8, "call_b"))
+    assert cache.key(_request(12.2)) != cache.key(_request(40.0))
+    assert ResponseCache(tmp_path, normalizer=None).key(_request(12.2)) != cache.key(_request(11.8))
+
+
+def test_entries_expire_and_lru_evicts_past_size_cap(tmp_path):
+    clock = FakeClock()
+    cache = ResponseCache(tmp_path, ttl=60, max_bytes=10_000, clock=clock)
+    message = {"role": "assistant", "content": "x" * 3000}
+
+    for key in ("a", "b", "c"):
+        cache.put(key, message)
+        clock.now += 1
+    assert cache.get("a") == message  # bumps "a" so "b" is now least recently used
+    clock.now += 1
+    cache.put("d", message)
+
+    assert sorted(path.stem for path in tmp_path.glob("*.json")) == ["a", "c", "d"]
+    clock.now += 120
+    assert cache.get("a") is None
+    assert not (tmp_path / "a.json").exists()
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_runner_replays_cached_responses_without_calling_the_model(tmp_path):
+    config = Config(
+        openai_api_key="test",
+        model_name="test",
+        mode="diagnostic_only",
+        confirm_fixes=True,
+        stream_responses=False,
+        response_cache_dir=tmp_path,
+    )
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        message = SimpleNamespace(content="Looks fine.", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    history = [{"role": "system", "content": "s"}, {"role": "user", "content": "hi"}]
+    texts = []
+    first = ConversationRunner(config)
+    first.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    assert first._call_model(history)["content"] == "Looks fine."
+
+    second = ConversationRunner(config)
+    second.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    assert second._call_model(history, on_text=texts.append)["content"] == "Looks fine."
+
+    assert len(requests) == 1
+    assert texts == ["Looks fine."]
+    assert len(os.listdir(tmp_path)) == 1
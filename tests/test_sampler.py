@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.tools.sampler import Sampler
+from src.utils.ring_buffer import RingBuffer
+
+
+def test_ring_buffer_overwrites_oldest_values():
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.append(value)
+
+    assert len(buffer) == 3
+    assert buffer.values() == [2.0, 3.0, 4.0]
+    assert buffer.latest() == 4.0
+
+
+def test_sampler_reports_window_stats_and_process_cpu():
+    sampler = Sampler(interval=0.01, capacity=10)
+    for _ in range(3):
+        sampler.sample()
+
+    stats = sampler.window_stats("cpu_percent", 60)
+    assert stats["samples"] == 3
+    assert stats["min"] <= stats["avg"] <= stats["max"]
+    assert "memory_percent" in sampler.trends(60)
+    assert sampler.process_cpu()
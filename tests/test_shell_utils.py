@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.utils.shell_utils import run_command, run_command_streaming
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="uses POSIX shell commands")
+
+
+def test_timeout_kills_whole_process_group():
+    started = time.monotonic()
+    success, _, stderr = run_command(["sh", "-c", "sleep 5 & sleep 5"], timeout=0.5)
+
+    assert not success
+    assert "timed out" in stderr
+    assert time.monotonic() - started < 3
+
+
+def test_streaming_stops_early_and_caps_output():
+    lines = []
+    result = run_command_streaming(
+        ["sh", "-c", "seq 1 100000"],
+        on_line=lambda line: lines.append(line) or len(lines) >= 3,
+        max_output_bytes=16,
+    )
+
+    assert result.stopped_early
+    assert lines == ["1", "2", "3"]
+    assert len(result.stdout) <= 16
+
+
+def test_failing_line_callback_kills_the_command():
+    def on_line(line):
+        raise ValueError(line)
+
+    started = time.monotonic()
+    with pytest.raises(ValueError):
+        run_command_streaming(["sh", "-c", "echo ready; exec sleep 5"], on_line=on_line)
+    assert time.monotonic() - started < 3
+
+
+def test_closed_stdout_does_not_extend_the_timeout():
+    started = time.monotonic()
+    result = run_command_streaming(["sh", "-c", "exec sleep 5 >&-"], on_line=lambda line: False, timeout=0.5)
+
+    assert result.timed_out
+    assert time.monotonic() - started < 2.5
+
+
+def test_output_cap_counts_bytes_and_can_be_disabled():
+    script = "for i in 1 2 3 4; do printf 'é%.0s' $(seq 1 10); echo; done"
+    capped = run_command_streaming(["sh", "-c", script], on_line=lambda line: False, max_output_bytes=30)
+    assert capped.truncated and capped.stdout.count("\n") == 1
+
+    success, stdout, _ = run_command([sys.executable, "-c", "print('x' * 200000)"], max_output_bytes=None)
+    assert success and stdout == "x" * 200000
@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.tools.snapshot_cache import SnapshotCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_per_source_and_count_hits():
+    clock = FakeClock()
+    cache = SnapshotCache(ttls={"fast": 1.0, "slow": 10.0}, clock=clock)
+    loads = []
+
+    def loader(name):
+        def load():
+            loads.append(name)
+            return name
+        return load
+
+    assert cache.get("fast", loader("fast")) == "fast"
+    assert cache.get("slow", loader("slow")) == "slow"
+    clock.now = 2.0
+    cache.get("fast", loader("fast"))
+    cache.get("slow", loader("slow"))
+
+    assert loads == ["fast", "slow", "fast"]
+    assert cache.stats() == {"fast": {"hits": 0, "misses": 2}, "slow": {"hits": 1, "misses": 1}}
+
+
+def test_invalidate_forces_reload():
+    cache = SnapshotCache(clock=FakeClock())
+    loads = []
+    cache.get("processes", lambda: loads.append(1))
+    cache.invalidate()
+    cache.get("processes", lambda: loads.append(2))
+
+    assert loads == [1, 2]
+
+
+def test_invalidate_during_a_load_keeps_its_result_out_of_the_cache():
+    cache = SnapshotCache(clock=FakeClock())
+
+    def stale_load():
+        # A fix tool finishes and invalidates while this scan is still running.
+        cache.invalidate("processes")
+        return "before fix"
+
+    assert cache.get("processes", stale_load) == "before fix"
+    assert cache.get("processes", lambda: "after fix") == "after fix"
+    assert cache.get("processes", lambda: "unused") == "after fix"
+
+
+def test_load_locks_are_dropped_after_each_load():
+    cache = SnapshotCache(clock=FakeClock())
+    for pid in range(100):
+        cache.get("process", lambda: pid, key=pid)
+
+    assert cache._load_locks == {}
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.tools_registry import get_tools_registry
+from src.config import Config
+
+# Generous ceiling so slow CI hosts pass; importing openai alone used to take ~0.5 s.
+STARTUP_BUDGET_SECONDS = 0.4
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import src.main
+from src.agent.conversation import ConversationRunner
+from src.config import Config
+ConversationRunner(Config(openai_api_key="x", model_name="m", mode="diagnostic_only", confirm_fixes=True))
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "heavy": [m for m in ("openai", "psutil", "src.remote.protocol") if m in sys.modules]}))
+"""
+
+
+def test_cli_startup_defers_heavy_imports():
+    best = None
+    for _ in range(3):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        probe = json.loads(output.splitlines()[-1])
+        assert probe["heavy"] == []
+        best = probe["seconds"] if best is None else min(best, probe["seconds"])
+
+    assert best < STARTUP_BUDGET_SECONDS
+
+
+def test_registry_builds_tools_on_first_use():
+    registry = get_tools_registry(Config(openai_api_key=None, model_name="m", mode="diagnostic_only", confirm_fixes=True))
+
+    assert "get_disk_health" in registry
+    assert registry._instances == {}
+    assert registry["get_disk_health"] is registry["get_disk_health"]
+    assert list(registry._instances) == ["get_disk_health"]
@@ -0,0 +1,64 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.compaction import compact_tool_result
+from src.tools.base import ToolResult
+from src.tools.table import Table
+
+
+def _processes(count):
+    table = Table(("pid", "name", "cpu_percent", "memory_mb"), typecodes={"pid": "q", "cpu_percent": "d"})
+    for pid in range(count):
+        table.append((pid, f"worker-{pid}", 100.0 / (pid + 1), 12.345))
+    return table
+
+
+def test_table_columns_rows_and_records():
+    table = _processes(3)
+    assert len(table) == 3
+    assert table.column("pid") == [0, 1, 2]
+    assert next(table.records()) == {"pid": 0, "name": "worker-0", "cpu_percent": 100.0, "memory_mb": 12.345}
+    assert table.head(1).to_json() == {
+        "columns": ["pid", "name", "cpu_percent", "memory_mb"],
+        "rows": [[0, "worker-0", 100.0, 12.345]],
+    }
+    assert Table.from_records([{"a": 1}, {"a": 2, "b": 3}]).to_json() == {
+        "columns": ["a", "b"],
+        "rows": [[1, None], [2, 3]],
+    }
+
+
+def test_compaction_encodes_tables_natively_and_trims_rows():
+    table = _processes(200)
+    payload = json.loads(compact_tool_result(ToolResult(success=True, data=table), token_budget=100_000))
+    assert payload["data"]["columns"] == ["pid", "name", "cpu_percent", "memory_mb"]
+    assert payload["data"]["rows"][1] == [1, "worker-1", 50.0, 12.3]
+
+    as_dicts = compact_tool_result(ToolResult(success=True, data=list(table.records())), token_budget=100_000)
+    as_table = compact_tool_result(ToolResult(success=True, data=table), token_budget=100_000)
+    assert len(as_table) * 2 < len(as_dicts)
+
+    small = json.loads(compact_tool_result(ToolResult(success=True, data=table), token_budget=150))
+    assert small["data"]["total_rows"] == 200
+    assert len(small["data"]["rows"]) + small["data"]["omitted_rows"] == 200
+
+
+def test_temperature_tool_returns_one_table(monkeypatch):
+    from collections import namedtuple
+
+    from src.tools import temperatures
+
+    shwtemp = namedtuple("shwtemp", "label current high critical")
+    sensors = {"coretemp": [shwtemp("Core 0", 55.0, 80.0, 100.0), shwtemp("Core 1", 57.0, None, None)]}
+    monkeypatch.setattr(temperatures, "sensors_temperatures", lambda: sensors)
+
+    result = temperatures.TemperatureTool().run()
+    assert result.data.to_json() == {
+        "columns": ["chip", "label", "current", "high", "critical"],
+        "rows": [["coretemp", "Core 0", 55.0, 80.0, 100.0], ["coretemp", "Core 1", 57.0, None, None]],
+    }
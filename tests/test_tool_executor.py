@@ -0,0 +1,62 @@
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from src.agent.tool_executor import ToolCall, ToolExecutor
+from src.tools.base import BaseTool, ToolResult
+
+
+class SleepTool(BaseTool):
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+
+    def run(self) -> ToolResult:
+        time.sleep(self.delay)
+        return ToolResult(success=True, data={"tool": self.name})
+
+
+def test_read_only_tools_run_concurrently_in_call_order():
+    registry = {
+        "slow": SleepTool("slow", 0.3),
+        "medium": SleepTool("medium", 0.2),
+        "fast": SleepTool("fast", 0.1),
+    }
+    executor = ToolExecutor(registry, logging.getLogger("test"))
+    calls = [ToolCall(id=f"call_{name}", name=name) for name in ["slow", "medium", "fast"]]
+
+    started = time.monotonic()
+    results = executor.run_calls(calls)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.5
+    assert [call.id for call, _ in results] == ["call_slow", "call_medium", "call_fast"]
+    assert [result.data["tool"] for _, result in results] == ["slow", "medium", "fast"]
+
+
+def test_timeouts_and_unknown_tools_produce_error_results():
+    registry = {"slow": SleepTool("slow", 0.5)}
+    executor = ToolExecutor(registry, logging.getLogger("test"), timeouts={"slow": 0.05})
+
+    results = executor.run_calls([ToolCall(id="1", name="slow"), ToolCall(id="2", name="missing")])
+
+    assert not results[0][1].success and "timed out" in results[0][1].error
+    assert not results[1][1].success and "Unknown tool" in results[1][1].error
+
+
+def test_stuck_tools_do_not_starve_the_next_batch():
+    registry = {"hung": SleepTool("hung", 1.0), "fast": SleepTool("fast", 0.0)}
+    executor = ToolExecutor(registry, logging.getLogger("test"), max_workers=1, timeouts={"hung": 0.05})
+
+    [(_, hung)] = executor.run_calls([ToolCall(id="1", name="hung")])
+    assert "still running in the background" in hung.error
+
+    started = time.monotonic()
+    [(_, fast)] = executor.run_calls([ToolCall(id="2", name="fast")])
+    assert fast.success and time.monotonic() - started < 0.5
+    executor.shutdown()
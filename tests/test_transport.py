@@ -0,0 +1,169 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if ROOT.as_posix() not in sys.path:
+    sys.path.insert(0, ROOT.as_posix())
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from src.agent.conversation import ConversationRunner
+from src.agent.transport import CircuitBreaker, CircuitOpenError, ModelCallError, ModelTransport
+from src.config import Config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class ScriptedCompletions:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _config(**overrides):
+    values = dict(openai_api_key="test", model_name="test", mode="diagnostic_only", confirm_fixes=True)
+    values.update(overrides)
+    return Config(**values)
+
+
+def _transport(outcomes, **overrides):
+    clock = FakeClock()
+    transport = ModelTransport(_config(**overrides), sleep=clock.sleep, clock=clock, jitter=lambda: 1.0)
+    completions = ScriptedCompletions(outcomes)
+    transport.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return transport, completions, clock
+
+
+def test_retries_429_and_5xx_with_backoff_then_succeeds():
+    transport, completions, clock = _transport([StatusError(429, retry_after=2), StatusError(502), "ok"])
+    assert transport.create(model="m", messages=[]) == "ok"
+    assert len(completions.calls) == 3
+    assert clock.now == 2 + 1.0  # Retry-After, then 0.5 * 2**1 with full jitter at 1.0
+    assert transport.breaker.state == "closed"
+
+
+def test_client_errors_are_not_retried():
+    transport, completions, _ = _transport([StatusError(400), "ok"])
+    with pytest.raises(ModelCallError) as raised:
+        transport.create(model="m", messages=[])
+    assert isinstance(raised.value.__cause__, StatusError)
+    assert len(completions.calls) == 1
+
+
+def test_each_attempt_keeps_the_connect_timeout_within_the_deadline():
+    transport, completions, clock = _transport(
+        [StatusError(503), "ok"], model_timeout=60, model_connect_timeout=5, model_deadline=20
+    )
+    assert transport.create(model="m", messages=[]) == "ok"
+    first, second = (call["timeout"] for call in completions.calls)
+    assert (first.read, first.connect) == (20, 5)
+    assert second.read == 20 - clock.now and second.connect == 5
+
+
+def test_stream_failures_surface_as_model_call_errors():
+    from openai import APITimeoutError
+
+    def broken_stream():
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Par", tool_calls=None))])
+        raise APITimeoutError(request=None)
+
+    runner = ConversationRunner(_config())
+    runner.client = SimpleNamespace(chat=SimpleNamespace(completions=ScriptedCompletions([broken_stream()])))
+    with pytest.raises(ModelCallError, match="stream failed"):
+        runner._call_model([{"role": "user", "content": "hi"}])
+    runner.executor.shutdown()
+
+
+def test_gives_up_after_max_retries_or_deadline():
+    transport, completions, _ = _transport([StatusError(503)] * 5, model_max_retries=2)
+    with pytest.raises(ModelCallError):
+        transport.create(model="m", messages=[])
+    assert len(completions.calls) == 3
+
+    transport, completions, _ = _transport([StatusError(503, retry_after=30)] * 5, model_deadline=10)
+    with pytest.raises(ModelCallError):
+        transport.create(model="m", messages=[])
+    assert len(completions.calls) == 1
+
+
+def test_circuit_breaker_opens_then_half_opens_after_cooldown():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, cooldown=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial call while half open
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_open_circuit_fails_fast():
+    transport, completions, _ = _transport([StatusError(500)] * 3, circuit_breaker_threshold=2, model_max_retries=5)
+    with pytest.raises(CircuitOpenError):
+        transport.create(model="m", messages=[])
+    assert len(completions.calls) == 2
+
+
+def test_runner_uses_local_base_url_without_api_key_and_retries_server_errors():
+    with FakeOpenAIServer(tool_names=[], answer="Healthy.", fail_first=1) as server:
+        config = _config(openai_api_key=None, openai_base_url=server.base_url, stream_responses=False)
+        runner = ConversationRunner(config)
+        runner.transport._jitter = lambda: 0.0
+        message = runner._call_model([{"role": "user", "content": "hi"}])
+        runner.executor.shutdown()
+
+    assert message["content"] == "Healthy."
+    assert len(server.requests) == 2
+
+
+def test_stream_read_failures_and_deadline_count_against_the_breaker():
+    from openai import APITimeoutError
+
+    transport, completions, clock = _transport([], circuit_breaker_threshold=2, model_deadline=10)
+
+    def broken_stream():
+        yield "Par"
+        raise APITimeoutError(request=None)
+
+    def slow_stream():
+        for chunk in range(5):
+            clock.now += 4
+            yield chunk
+
+    completions.outcomes = [broken_stream(), slow_stream()]
+    with pytest.raises(ModelCallError, match="stream failed"):
+        list(transport.stream(model="m", messages=[]))
+    with pytest.raises(ModelCallError, match="deadline"):
+        list(transport.stream(model="m", messages=[]))
+    assert completions.calls[0]["stream"] is True
+    assert transport.breaker.state == "open"